@@ -0,0 +1,291 @@
+# src/benchmark.py
+
+import argparse
+import itertools
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .conversions import CryptoConverter, HAS_NUMPY
+
+DEFAULT_SIZES = [64, 1024, 64 * 1024, 1024 * 1024, 16 * 1024 * 1024, 100 * 1024 * 1024]
+
+def make_payload(size: int, tag: str = '') -> str:
+    """
+    Build a deterministic JSON document of exactly ``size`` bytes, hex encoded.
+    
+    Args:
+        size (int): Payload size in bytes (at least 12)
+        tag (str): ASCII text the data starts with, to tell payloads of one size apart
+        
+    Returns:
+        str: Hex string of the UTF-8 JSON document
+    """
+    prefix, suffix = '{"data":"', '"}'
+    filler = max(size - len(prefix) - len(suffix), 0)
+    body = (tag.encode('ascii') + b'0123456789abcdef' * (filler // 16 + 1))[:filler].decode('ascii')
+    return (prefix + body + suffix).encode('utf-8').hex()
+
+def measure(func: Callable[[], Any], min_time: float = 0.2) -> float:
+    """
+    Time a call, repeating until ``min_time`` has elapsed.
+    
+    Returns:
+        float: Best observed seconds per call
+    """
+    best = float('inf')
+    elapsed = 0.0
+    while elapsed < min_time or best == float('inf'):
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+        best = min(best, duration)
+        elapsed += duration
+    return best
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Peak Python heap allocation of one call, measured in a separate untimed pass."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def _record(name: str, size: int, seconds: float, memory: int, entries: int = 1) -> Dict[str, Any]:
+    return {
+        'name': name,
+        'size': size,
+        'seconds': seconds,
+        'mb_per_s': (size * entries / 1e6) / seconds if seconds else 0.0,
+        'entries_per_s': entries / seconds if seconds else 0.0,
+        'peak_memory_bytes': memory
+    }
+
+def bench_converter(sizes: List[int], engine: str = 'table', min_time: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Benchmark the converter hot paths across a payload size sweep.
+    
+    Args:
+        sizes (List[int]): Payload sizes in bytes
+        engine (str): Converter engine
+        min_time (float): Minimum timing window per measurement
+        
+    Returns:
+        List[Dict[str, Any]]: One record per (operation, size)
+    """
+    converter = CryptoConverter(engine=engine)
+    records = []
+    for size in sizes:
+        hex_str = make_payload(size)
+        unknown_str = converter.hex_to_unknown(hex_str)
+        cases = {
+            'hex_to_unknown': lambda h=hex_str: converter.hex_to_unknown(h),
+            'unknown_to_hex': lambda u=unknown_str: converter.unknown_to_hex(u),
+            'hex_to_ascii': lambda h=hex_str: converter.hex_to_ascii(h),
+            'validate_conversion_pair': lambda h=hex_str, u=unknown_str: converter.validate_conversion_pair(u, h),
+        }
+        for name, func in cases.items():
+            records.append(_record(name, size, measure(func, min_time), peak_memory(func)))
+    return records
+
+def bench_processor(entries: int, size: int, engine: str = 'table', workdir: Optional[Path] = None,
+                    **processor_options) -> Dict[str, Any]:
+    """
+    Benchmark an end-to-end CryptoProcessor.process_all_data run.
+    
+    Args:
+        entries (int): Number of synthetic entries
+        size (int): Payload size per entry in bytes
+        engine (str): Converter engine
+        workdir (Optional[Path]): Directory for input and output files (temporary if None)
+        **processor_options: Extra CryptoProcessor keyword arguments
+        
+    Returns:
+        Dict[str, Any]: Benchmark record for the run
+    """
+    from .main import CryptoProcessor
+    
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        input_file = _write_input(Path(tmp), entries, size, engine)
+            
+        def run():
+            CryptoProcessor(str(input_file), str(Path(tmp) / 'output'), engine=engine,
+                            **processor_options).process_all_data()
+            
+        with _quiet_processor():
+            seconds, memory = _time_run(run)
+            
+    return _record('process_all_data', size, seconds, memory, entries=entries)
+
+def bench_cache(entries: int, size: int, engine: str = 'table', workdir: Optional[Path] = None,
+                **processor_options) -> List[Dict[str, Any]]:
+    """
+    Benchmark end-to-end runs with a conversion cache, empty (cold) and filled by an earlier run (warm).
+    
+    Compare against bench_processor over the same entries: a warm run should beat a run
+    without the cache.
+    
+    Args:
+        entries (int): Number of synthetic entries
+        size (int): Payload size per entry in bytes
+        engine (str): Converter engine
+        workdir (Optional[Path]): Directory for input, output and cache files (temporary if None)
+        **processor_options: Extra CryptoProcessor keyword arguments
+        
+    Returns:
+        List[Dict[str, Any]]: Records for the cold and the warm run
+    """
+    from .main import CryptoProcessor
+    
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        input_file = _write_input(Path(tmp), entries, size, engine)
+        fresh_caches = (Path(tmp) / f'cold_{i}.sqlite' for i in itertools.count())
+        
+        def run(cache_path):
+            processor = CryptoProcessor(str(input_file), str(Path(tmp) / 'output'), engine=engine,
+                                        cache_path=str(cache_path), **processor_options)
+            try:
+                processor.process_all_data()
+            finally:
+                processor.close()
+                
+        warm_cache = Path(tmp) / 'warm.sqlite'
+        with _quiet_processor():
+            cold = _time_run(lambda: run(next(fresh_caches)))
+            run(warm_cache)
+            warm = _time_run(lambda: run(warm_cache))
+            
+    return [
+        _record('process_all_data_cache_cold', size, *cold, entries=entries),
+        _record('process_all_data_cache_warm', size, *warm, entries=entries),
+    ]
+
+def _write_input(directory: Path, entries: int, size: int, engine: str) -> Path:
+    """Write a synthetic input file of ``entries`` entries with ``size``-byte payloads."""
+    converter = CryptoConverter(engine=engine)
+    input_file = directory / 'bench.json'
+    with open(input_file, 'w') as f:
+        f.write('{')
+        for i in range(entries):
+            hex_str = make_payload(size, f'{i}:')
+            entry = {'hex': hex_str, 'unknown': converter.hex_to_unknown(hex_str), 'ascii_text': {}}
+            f.write(('' if i == 0 else ',') + json.dumps(f'entry_{i}') + ':' + json.dumps(entry))
+        f.write('}')
+    return input_file
+
+def _time_run(run: Callable[[], Any]) -> Tuple[float, int]:
+    """Seconds of one timed call and peak memory of a second, untimed one."""
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start, peak_memory(run)
+
+@contextmanager
+def _quiet_processor():
+    """Silence the processor's per-run info logging."""
+    processor_logger = logging.getLogger('src.main')
+    previous_level = processor_logger.level
+    processor_logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        processor_logger.setLevel(previous_level)
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+            tolerance: float = 0.2) -> List[str]:
+    """
+    Compare throughput against a baseline.
+    
+    Args:
+        results (List[Dict[str, Any]]): Current benchmark records
+        baseline (List[Dict[str, Any]]): Baseline benchmark records
+        tolerance (float): Allowed relative throughput drop
+        
+    Returns:
+        List[str]: Human-readable regressions (empty if none)
+    """
+    reference = {(r['name'], r['size']): r for r in baseline}
+    regressions = []
+    for record in results:
+        base = reference.get((record['name'], record['size']))
+        if base is None or not base['mb_per_s']:
+            continue
+        ratio = record['mb_per_s'] / base['mb_per_s']
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{record['name']} @ {record['size']} B: {record['mb_per_s']:.2f} MB/s "
+                f"vs baseline {base['mb_per_s']:.2f} MB/s ({(1 - ratio) * 100:.1f}% slower)"
+            )
+    return regressions
+
+def main(argv=None) -> int:
+    """Benchmark CLI entry point."""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.benchmark',
+        description='Benchmark converter and processor hot paths',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Payload sizes in bytes')
+    parser.add_argument('--max-size', type=int, help='Skip sizes above this many bytes')
+    parser.add_argument('--engine', choices=CryptoConverter.ENGINES, default='table',
+                        help='Codec engine to benchmark')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='Minimum timing window per measurement in seconds')
+    parser.add_argument('--e2e-entries', type=int, default=1000,
+                        help='Entries in the end-to-end run (0 skips it)')
+    parser.add_argument('--e2e-size', type=int, default=1024,
+                        help='Payload size per entry in the end-to-end run')
+    parser.add_argument('--e2e-cache', action='store_true',
+                        help='Also time end-to-end runs with a cold and a warm conversion cache')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Baseline results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative throughput drop before failing')
+    args = parser.parse_args(argv)
+    
+    sizes = [size for size in args.sizes if args.max_size is None or size <= args.max_size]
+    results = bench_converter(sizes, engine=args.engine, min_time=args.min_time)
+    if args.e2e_entries:
+        results.append(bench_processor(args.e2e_entries, args.e2e_size, engine=args.engine))
+        if args.e2e_cache:
+            results.extend(bench_cache(args.e2e_entries, args.e2e_size, engine=args.engine))
+        
+    for record in results:
+        print(f"{record['name']:<26} {record['size']:>11} B  {record['mb_per_s']:>10.2f} MB/s  "
+              f"{record['entries_per_s']:>12.1f} entries/s  "
+              f"{record['peak_memory_bytes'] / 1e6:>9.2f} MB peak")
+        
+    report = {
+        'meta': {
+            'timestamp': time.strftime("%Y%m%d_%H%M%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'engine': args.engine,
+            'numpy': HAS_NUMPY
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+            
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
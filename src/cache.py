@@ -0,0 +1,311 @@
+# src/cache.py
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .conversions import BLOCK_SIZE, CryptoConverter, EntryContext, HexInput, as_context
+from .results import RESULT_VERSION
+
+def _digest(payload: str) -> str:
+    """SHA-256 of a payload."""
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ConversionCache:
+    """
+    Persistent content-addressed store for conversion results, backed by SQLite.
+    
+    Keys combine the converter parameters (HEADER, XOR_KEY) with a hash of the
+    input, so results are reused across runs but never across codec profiles.
+    There are two key families, prefixed so they cannot collide: ``entry_key``
+    addresses the whole processing result of a (hex, unknown) entry, which is
+    what runs and the server's ``/process`` reuse; ``key`` addresses a single
+    operation on one payload, for callers that only ever see one side of an
+    entry (``CachedConverter``, behind the server's ``/encode`` and ``/decode``).
+    Entries are evicted least-recently-used first once the
+    store exceeds ``max_bytes`` and unconditionally once older than ``max_age``.
+    Access times of hits are only written on ``flush``, once per key.
+    """
+    
+    COMMIT_EVERY = 1000  # Pending writes buffered before a commit
+    LOOKUP_BATCH = 500  # Keys per SELECT in get_many (below SQLite's bound-parameter limit)
+    ENTRY_VERSION = RESULT_VERSION  # Part of entry keys, so results of an older layout miss
+    
+    def __init__(self, path: str, header: str, xor_key: int,
+                 max_bytes: Optional[int] = None, max_age: Optional[float] = None):
+        """
+        Args:
+            path (str): SQLite database file
+            header (str): Converter header the cached results were produced with
+            xor_key (int): Converter XOR key the cached results were produced with
+            max_bytes (Optional[int]): Size limit for stored values, LRU-evicted beyond it
+            max_age (Optional[float]): Seconds since last access after which entries expire
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._params = self.params_for(header, xor_key)
+        self._pending_puts: Dict[str, Tuple[str, Optional[str], int, float, float]] = {}
+        self._pending_touches: Dict[str, float] = {}
+        # Serializes the shared connection and buffers for threaded callers (pipeline, serve)
+        self._lock = threading.RLock()
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Worker processes share the file; pipelined runs and the server use it from several threads
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversions ("
+            " key TEXT PRIMARY KEY, value TEXT, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS conversions_accessed ON conversions (accessed)")
+        self._conn.commit()
+
+    @staticmethod
+    def params_for(header: str, xor_key: int, offset_mod: int = BLOCK_SIZE) -> str:
+        """Key component identifying a set of converter parameters."""
+        # The default modulus is left out so keys from before it was configurable stay valid
+        params = f"{header}:{xor_key:02x}" + (f":{offset_mod}" if offset_mod != BLOCK_SIZE else '')
+        return hashlib.sha256(params.encode('ascii')).hexdigest()[:16]
+
+    def key(self, operation: str, payload: str, params: Optional[str] = None) -> str:
+        """Content address for an operation applied to a payload (default parameters unless given)."""
+        return f"{operation}:{params or self._params}:{_digest(payload)}"
+
+    @classmethod
+    def entry_key(cls, params: str, profile: Optional[str], hex_str: str, unknown_str: str) -> str:
+        """Content address for the whole processing result of a (hex, unknown) entry."""
+        digest = hashlib.sha256(hex_str.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(unknown_str.encode('utf-8'))
+        return f"entry:v{cls.ENTRY_VERSION}:{params}:{profile or ''}:{digest.hexdigest()}"
+
+    def get(self, operation: str, payload: str, params: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a cached result.
+        
+        Returns:
+            Tuple[bool, Optional[str]]: (hit, value); value may be None for cached failures
+        """
+        key = self.key(operation, payload, params)
+        with self._lock:
+            pending = self._pending_puts.get(key)
+            if pending is not None:
+                self.hits += 1
+                return True, pending[1]
+            row = self._conn.execute("SELECT value FROM conversions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._pending_touches[key] = time.time()
+            return True, row[0]
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Optional[str]]:
+        """
+        Look up many cached results by key, a few hundred keys per query.
+        
+        Returns:
+            Dict[str, Optional[str]]: Values of the keys that were hit
+        """
+        found: Dict[str, Optional[str]] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                pending = self._pending_puts.get(key)
+                if pending is not None:
+                    found[key] = pending[1]
+                else:
+                    missing.append(key)
+            for start in range(0, len(missing), self.LOOKUP_BATCH):
+                batch = missing[start:start + self.LOOKUP_BATCH]
+                found.update(self._conn.execute(
+                    f"SELECT key, value FROM conversions WHERE key IN ({','.join('?' * len(batch))})", batch
+                ))
+            now = time.time()
+            for key in missing:
+                if key in found:
+                    self._pending_touches[key] = now
+            hits = sum(key in found for key in keys)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def put(self, operation: str, payload: str, value: Optional[str],
+            params: Optional[str] = None) -> None:
+        """Store a result (None records a conversion that yields no output)."""
+        now = time.time()
+        size = len(value) if value is not None else 0
+        key = self.key(operation, payload, params)
+        with self._lock:
+            self._pending_puts[key] = (key, value, size, now, now)
+            self._maybe_commit()
+
+    def put_many(self, items: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """Store (key, value) results under keys built by ``key`` or ``entry_key``."""
+        now = time.time()
+        with self._lock:
+            for key, value in items:
+                self._pending_puts[key] = (key, value, len(value) if value is not None else 0, now, now)
+            self._maybe_commit()
+
+    def _maybe_commit(self) -> None:
+        if len(self._pending_puts) >= self.COMMIT_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered results and access times to disk."""
+        with self._lock:
+            if self._pending_puts:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO conversions (key, value, size, created, accessed)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    list(self._pending_puts.values())
+                )
+            if self._pending_touches:
+                self._conn.executemany(
+                    "UPDATE conversions SET accessed = ? WHERE key = ?",
+                    [(accessed, key) for key, accessed in self._pending_touches.items()]
+                )
+            self._pending_puts = {}
+            self._pending_touches = {}
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """
+        Apply age and size limits.
+        
+        Returns:
+            int: Number of evicted entries
+        """
+        with self._lock:
+            return self._evict()
+
+    def _evict(self) -> int:
+        self.flush()
+        evicted = 0
+        if self.max_age is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM conversions WHERE accessed < ?", (time.time() - self.max_age,)
+            )
+            evicted += cursor.rowcount
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM conversions").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                doomed = []
+                for key, size in self._conn.execute(
+                        "SELECT key, size FROM conversions ORDER BY accessed"):
+                    doomed.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                self._conn.executemany("DELETE FROM conversions WHERE key = ?", doomed)
+                evicted += len(doomed)
+        self._conn.commit()
+        return evicted
+
+    def take_stats(self) -> Dict[str, int]:
+        """Return and reset the hit/miss counters (used to ship worker counts to the parent)."""
+        with self._lock:
+            stats = {'hits': self.hits, 'misses': self.misses}
+            self.hits = 0
+            self.misses = 0
+            return stats
+
+    def add_stats(self, stats: Dict[str, int]) -> None:
+        """Fold hit/miss counters collected elsewhere into this cache's counters."""
+        with self._lock:
+            self.hits += stats.get('hits', 0)
+            self.misses += stats.get('misses', 0)
+
+    def close(self) -> None:
+        """Flush, apply eviction limits and close the database."""
+        self.evict()
+        self._conn.close()
+
+class CachedConverter:
+    """
+    CryptoConverter front end that serves hex_to_ascii, hex_to_unknown and
+    unknown_to_hex (including the batch variants) from a ConversionCache.
+    
+    Everything else is delegated to the wrapped converter. Results are keyed by
+    the wrapped converter's own header and XOR key, so converters for several
+    codec profiles can share one cache.
+
+    This is the per-operation counterpart of the processor's per-entry results:
+    a bare hex or unknown string has no partner to build an ``entry_key`` from,
+    and a hit skips the transform itself, so single-sided conversions such as
+    the server's ``/encode`` and ``/decode`` batches are cached per payload.
+    """
+    
+    def __init__(self, converter: CryptoConverter, cache: ConversionCache):
+        self._converter = converter
+        self.cache = cache
+        self._params = cache.params_for(converter.HEADER, converter.XOR_KEY, converter.OFFSET_MOD)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._converter, name)
+
+    def hex_to_ascii(self, hex_string: HexInput) -> str:
+        ctx = as_context(hex_string)
+        if not isinstance(ctx.hex, str):
+            return self._converter.hex_to_ascii(ctx)
+        hit, value = self.cache.get('hex_to_ascii', ctx.hex, self._params)
+        if hit:
+            return value
+        # Failures raise and are not cached, so they are re-reported on every run
+        value = self._converter.hex_to_ascii(ctx)
+        self.cache.put('hex_to_ascii', ctx.hex, value, self._params)
+        return value
+
+    def hex_to_unknown(self, hex_string: HexInput) -> Optional[str]:
+        payload = hex_string.hex if isinstance(hex_string, EntryContext) else hex_string
+        return self._cached('hex_to_unknown', payload, self._converter.hex_to_unknown, hex_string)
+
+    def unknown_to_hex(self, unknown_string: str) -> Optional[str]:
+        return self._cached('unknown_to_hex', unknown_string, self._converter.unknown_to_hex, unknown_string)
+
+    def encode_many(self, hex_strings: Sequence[HexInput]) -> List[Optional[str]]:
+        payloads = [h.hex if isinstance(h, EntryContext) else h for h in hex_strings]
+        return self._cached_many('hex_to_unknown', payloads, hex_strings, self._converter.encode_many)
+
+    def decode_many(self, unknown_strings: Sequence[str]) -> List[Optional[str]]:
+        return self._cached_many('unknown_to_hex', unknown_strings, unknown_strings,
+                                 self._converter.decode_many)
+
+    def _cached(self, operation: str, payload: Any, compute, argument) -> Optional[str]:
+        if not isinstance(payload, str):
+            return compute(argument)
+        hit, value = self.cache.get(operation, payload, self._params)
+        if hit:
+            return value
+        value = compute(argument)
+        self.cache.put(operation, payload, value, self._params)
+        return value
+
+    def _cached_many(self, operation: str, payloads: Sequence[Any], arguments: Sequence[Any],
+                     compute_many) -> List[Optional[str]]:
+        results: List[Optional[str]] = [None] * len(payloads)
+        missing = []
+        for index, payload in enumerate(payloads):
+            if isinstance(payload, str):
+                hit, value = self.cache.get(operation, payload, self._params)
+                if hit:
+                    results[index] = value
+                    continue
+            missing.append(index)
+            
+        if missing:
+            computed = compute_many([arguments[index] for index in missing])
+            for index, value in zip(missing, computed):
+                results[index] = value
+                if isinstance(payloads[index], str):
+                    self.cache.put(operation, payloads[index], value, self._params)
+        return results
@@ -0,0 +1,139 @@
+# src/checkpoint.py
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from . import json_backend
+from .results import RESULT_VERSION
+
+class CheckpointManifest:
+    """
+    Per-entry checkpoint of processing results for resumable, incremental runs.
+    
+    Each processed entry's result is appended to a per-run results file and a
+    manifest line records the entry ID, a fingerprint of the entry and the
+    converter parameters, and the result's file and byte range. Both files are
+    append-only while a run is in progress, so everything flushed before a crash
+    can be reused. ``compact`` rewrites the manifest at the end of a run and
+    deletes results files that are no longer referenced.
+    """
+    
+    MANIFEST_NAME = 'checkpoint_manifest.ndjson'
+    RESULTS_PREFIX = 'checkpoint_results_'
+    VERSION = RESULT_VERSION  # Invalidates old checkpoints when the result layout changes
+    
+    def __init__(self, output_dir: Path, header: str, xor_key: int):
+        """
+        Args:
+            output_dir (Path): Directory holding the manifest and results files
+            header (str): Converter header, part of every fingerprint
+            xor_key (int): Converter XOR key, part of every fingerprint
+        """
+        self.output_dir = Path(output_dir)
+        self.manifest_path = self.output_dir / self.MANIFEST_NAME
+        self._salt = f"{self.VERSION}:{header}:{xor_key:02x}:".encode('utf-8')
+        self.records = self._load_records()
+        self.seen: Dict[str, Dict[str, Any]] = {}
+        self._results_file = None
+        self._manifest_file = None
+        self._results_name = None
+
+    def _load_records(self) -> Dict[str, Dict[str, Any]]:
+        """Read the manifest; later lines override earlier ones, torn lines are skipped."""
+        records = {}
+        if not self.manifest_path.exists():
+            return records
+        with open(self.manifest_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    records[record['id']] = record
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return records
+
+    def fingerprint(self, entry: Dict[str, Any]) -> str:
+        """Stable fingerprint of an entry's content and the converter parameters."""
+        # Always the stdlib encoder: fingerprints must not depend on the JSON backend
+        canonical = json.dumps(entry, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(self._salt + canonical.encode('utf-8')).hexdigest()
+
+    def load_result(self, key: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a checkpointed result if the entry is unchanged since it was stored.
+        
+        Returns:
+            Optional[Dict[str, Any]]: The stored result, or None if it must be recomputed
+        """
+        record = self.records.get(key)
+        if record is None or record['fp'] != fingerprint:
+            return None
+        try:
+            with open(self.output_dir / record['file'], 'rb') as f:
+                f.seek(record['offset'])
+                result = json_backend.loads(f.read(record['length']))
+        except (OSError, ValueError):
+            return None
+        self.seen[key] = record
+        return result
+
+    def open_run(self, timestamp: str) -> None:
+        """Start appending results and manifest lines for a new run."""
+        self._results_name = f"{self.RESULTS_PREFIX}{timestamp}.ndjson"
+        self._results_file = open(self.output_dir / self._results_name, 'ab')
+        self._manifest_file = open(self.manifest_path, 'a')
+
+    def record(self, key: str, fingerprint: str, result: Dict[str, Any]) -> None:
+        """Append a freshly computed result and its manifest line."""
+        payload = json_backend.dumpb(result)
+        offset = self._results_file.tell()
+        self._results_file.write(payload + b'\n')
+        record = {
+            'id': key,
+            'fp': fingerprint,
+            'file': self._results_name,
+            'offset': offset,
+            'length': len(payload)
+        }
+        self._manifest_file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.seen[key] = record
+
+    def flush(self) -> None:
+        """Persist results before the manifest lines that point at them."""
+        if self._results_file is not None:
+            self._results_file.flush()
+            self._manifest_file.flush()
+
+    def close(self) -> None:
+        """Stop appending, keeping everything written so far."""
+        if self._results_file is not None:
+            self.flush()
+            self._results_file.close()
+            self._manifest_file.close()
+            self._results_file = None
+            self._manifest_file = None
+
+    def compact(self) -> None:
+        """
+        Rewrite the manifest with only the entries seen in this run and delete
+        results files nobody references any more.
+        """
+        self.close()
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            for record in self.seen.values():
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.manifest_path)
+        
+        referenced = {record['file'] for record in self.seen.values()}
+        for path in self._results_files():
+            if path.name not in referenced:
+                path.unlink()
+        self.records = dict(self.seen)
+        self.seen = {}
+
+    def _results_files(self) -> Iterable[Path]:
+        return self.output_dir.glob(f"{self.RESULTS_PREFIX}*.ndjson")
@@ -0,0 +1,134 @@
+# src/client.py
+#
+# Standard-library only, so the client starts fast: it never imports the
+# converter, NumPy or the processor.
+
+import argparse
+import http.client
+import json
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection speaking to a server on a Unix socket."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+class ServerError(Exception):
+    """Error response from the conversion server."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+class ConversionClient:
+    """
+    Client for a ``python -m src.main serve`` server.
+
+    Keeps one keep-alive connection open, so repeated calls skip the TCP
+    (or Unix socket) handshake. Not thread-safe; use one client per thread.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 socket_path: Optional[str] = None, timeout: Optional[float] = 60):
+        """
+        Args:
+            host (str): Server address (ignored with ``socket_path``)
+            port (int): Server TCP port
+            socket_path (Optional[str]): Connect to this Unix socket instead of TCP
+            timeout (Optional[float]): Socket timeout in seconds
+        """
+        if socket_path:
+            self.connection = UnixHTTPConnection(socket_path, timeout=timeout)
+        else:
+            self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def process(self, entries: Dict[str, Any]) -> Dict[str, Any]:
+        """Process entries in the input file format; returns results and summary."""
+        return self._request('POST', '/process', entries)
+
+    def encode(self, hex_strings: List[str]) -> List[Optional[str]]:
+        """Convert hex strings to the unknown format."""
+        return self._request('POST', '/encode', {'hex': hex_strings})['unknown']
+
+    def decode(self, unknown_strings: List[str]) -> List[Optional[str]]:
+        """Convert unknown-format strings back to hex."""
+        return self._request('POST', '/decode', {'unknown': unknown_strings})['hex']
+
+    def health(self) -> Dict[str, Any]:
+        """Server status, settings and metrics."""
+        return self._request('GET', '/health')
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'ConversionClient':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _request(self, method: str, path: str, payload: Any = None) -> Dict[str, Any]:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        data = json.loads(response.read())
+        if response.status != 200:
+            raise ServerError(response.status, data.get('error', response.reason))
+        return data
+
+def main(argv=None) -> int:
+    """Send one request to a running server and print the JSON response."""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.client',
+        description='Client for the resident conversion server (python -m src.main serve)'
+    )
+    parser.add_argument('command', choices=['process', 'encode', 'decode', 'health'])
+    parser.add_argument(
+        'values', nargs='*',
+        help="process: input JSON file ('-' or none for stdin); encode/decode: strings to convert"
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Server address')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Server TCP port')
+    parser.add_argument('--socket', help='Connect to this Unix socket instead of TCP')
+    args = parser.parse_args(argv)
+
+    try:
+        with ConversionClient(args.host, args.port, socket_path=args.socket) as client:
+            if args.command == 'process':
+                path = args.values[0] if args.values else '-'
+                if path == '-':
+                    entries = json.load(sys.stdin)
+                else:
+                    with open(path, 'r') as f:
+                        entries = json.load(f)
+                response = client.process(entries)
+            elif args.command == 'encode':
+                response = client.encode(args.values)
+            elif args.command == 'decode':
+                response = client.decode(args.values)
+            else:
+                response = client.health()
+    except (OSError, ValueError, ServerError) as e:
+        print(f"Request failed: {e}", file=sys.stderr)
+        return 1
+
+    json.dump(response, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
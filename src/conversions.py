@@ -1,10 +1,145 @@
 # src/conversions.py
 
 import json
-import base64
-import binascii
-from typing import Dict, Any
-from .utils import ValidationError, validate_json, safe_json_loads
+import mmap
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, NamedTuple, Optional, Sequence, Tuple, Union
+from . import json_backend
+from .utils import ValidationError
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; batch APIs fall back to per-entry conversion
+    np = None
+
+HAS_NUMPY = np is not None
+
+BLOCK_SIZE = 256  # Default position offset modulus (and the largest supported)
+LINEAR_SCAN_SIZE = 64  # Mismatch bisection switches to a byte scan below this span
+# The table engine costs two translate calls per block column, which only pays off once
+# payloads span this many OFFSET_MOD blocks; shorter ones use the per-byte loop
+TABLE_MIN_BLOCKS = 2
+
+
+@lru_cache(maxsize=None)
+def _build_tables(xor_key: int) -> Tuple[List[bytes], List[bytes], List[bytes], List[bytes]]:
+    """
+    Precompute per-position translation tables for the nibble transform.
+
+    Since the position offset wraps every ``OFFSET_MOD`` (at most BLOCK_SIZE) bytes,
+    a payload can be viewed as rows of blocks where every byte in column ``j``
+    receives the same offset. One table per column turns the transform into a
+    single ``bytes.translate`` call per column, independent of payload size.
+
+    Args:
+        xor_key (int): XOR key applied to each nibble
+
+    Returns:
+        Tuple of four lists indexed by offset: encode high, encode low,
+        decode high (pre-shifted into the high nibble) and decode low.
+    """
+    enc_high, enc_low, dec_high, dec_low = [], [], [], []
+    for offset in range(BLOCK_SIZE):
+        enc_high.append(bytes((((b >> 4) ^ xor_key) + offset) % 256 for b in range(256)))
+        enc_low.append(bytes((((b & 0x0F) ^ xor_key) + offset) % 256 for b in range(256)))
+        dec_high.append(bytes(((((b - offset) ^ xor_key) & 0x0F) << 4) for b in range(256)))
+        dec_low.append(bytes((((b - offset) ^ xor_key) & 0x0F) for b in range(256)))
+    return enc_high, enc_low, dec_high, dec_low
+
+class EntryContext:
+    """
+    Decode-once view of a single hex payload.
+
+    The raw bytes, the UTF-8 text and the parsed JSON are computed lazily on
+    first access and cached, so every conversion and validation of an entry
+    shares one ``bytes.fromhex`` and at most one JSON parse. Failures are cached
+    too and re-raised on later access.
+    """
+
+    __slots__ = ('hex', '_data', '_text', '_parsed')
+    _UNSET = object()
+
+    def __init__(self, hex_string: str):
+        self.hex = hex_string
+        self._data = self._UNSET
+        self._text = self._UNSET
+        self._parsed = self._UNSET
+
+    @staticmethod
+    def _resolve(value):
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    @property
+    def data(self) -> bytes:
+        """Raw payload bytes."""
+        if self._data is self._UNSET:
+            try:
+                self._data = bytes.fromhex(self.hex)
+            except Exception as e:
+                self._data = e
+        return self._resolve(self._data)
+
+    @property
+    def text(self) -> str:
+        """Payload decoded as UTF-8."""
+        if self._text is self._UNSET:
+            try:
+                self._text = self.data.decode('utf-8')
+            except Exception as e:
+                self._text = e
+        return self._resolve(self._text)
+
+    @property
+    def parsed(self) -> Any:
+        """Payload text parsed as JSON."""
+        if self._parsed is self._UNSET:
+            try:
+                self._parsed = json_backend.loads(self.text)
+            except Exception as e:
+                self._parsed = e
+        return self._resolve(self._parsed)
+
+
+HexInput = Union[str, EntryContext]
+
+
+class PairVerification(NamedTuple):
+    """
+    Outcome of verifying an (unknown, hex) pair.
+
+    For a transform mismatch ``offset`` is the first bad hex byte position,
+    ``original`` the hex byte there, ``reconstructed`` the byte decoded from
+    ``unknown_pair`` (the two unknown bytes at that position).
+    """
+
+    valid: bool
+    reason: str = ''
+    offset: Optional[int] = None
+    original: Optional[int] = None
+    reconstructed: Optional[int] = None
+    unknown_pair: Optional[bytes] = None
+
+
+class CodecProfile(NamedTuple):
+    """
+    Parameters of one producer's unknown format: its 32-hex-character header, XOR
+    key and position offset modulus (byte ``i`` is shifted by ``i % offset_mod``).
+    """
+
+    name: str
+    header: str
+    xor_key: int
+    offset_mod: int = BLOCK_SIZE
+
+def as_context(value: HexInput) -> EntryContext:
+    """Wrap a hex string in an EntryContext, passing existing contexts through."""
+    return value if isinstance(value, EntryContext) else EntryContext(value)
+
 
 class CryptoConverter:
     """
@@ -14,36 +149,59 @@ class CryptoConverter:
     CHUNK_SIZE = 32  # Size for JSON string chunking
     HEADER = "d8ab19d5c7a0f27c10fa57540506ac68"
     XOR_KEY = 0xD8
-    OFFSET_MOD = 16  # Based on 32-character chunk hint (32 chars = 16 bytes)
+    OFFSET_MOD = BLOCK_SIZE  # Byte i is shifted by i % OFFSET_MOD (1..BLOCK_SIZE)
+    ENGINES = ('loop', 'table')
     
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, engine='table', profile: Optional[CodecProfile] = None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {self.ENGINES}")
         self._debug = debug
+        self.engine = engine
+        if profile is not None:
+            # Instance attributes shadow the class defaults used throughout
+            self.HEADER = profile.header.lower()
+            self.XOR_KEY = profile.xor_key
+            self.OFFSET_MOD = profile.offset_mod
+        self.profile_name = profile.name if profile is not None else 'default'
 
     def analyze_pattern(self, hex_str: str, unknown_str: str):
-        """Utility method to analyze transformation patterns."""
-        hex_bytes = bytes.fromhex(hex_str)
-        unknown_bytes = bytes.fromhex(unknown_str)
-        
-        print("Pattern Analysis:")
-        for i in range(min(self.CHUNK_SIZE, len(hex_bytes))):
-            h = hex_bytes[i]
-            u = unknown_bytes[i]
-            diff = u ^ h  # XOR difference
-            print(f"Position {i:2d}: Hex={h:02x} Unknown={u:02x} XOR_diff={diff:02x}")
+        """
+        Print the codec parameters inferred from a single pair.
+
+        See ``src.inference.infer_profile`` (or ``python -m src.main infer``) to
+        solve across many pairs at once. Without NumPy, prints the per-position
+        XOR differences of the leading bytes instead and returns None.
+        """
+        if not HAS_NUMPY:
+            hex_bytes = bytes.fromhex(hex_str)
+            unknown_bytes = bytes.fromhex(unknown_str)
+
+            print("Pattern Analysis:")
+            for i in range(min(self.CHUNK_SIZE, len(hex_bytes), len(unknown_bytes))):
+                h = hex_bytes[i]
+                u = unknown_bytes[i]
+                diff = u ^ h  # XOR difference
+                print(f"Position {i:2d}: Hex={h:02x} Unknown={u:02x} XOR_diff={diff:02x}")
+            return None
+
+        from .inference import infer_profile
+        result = infer_profile([(hex_str, unknown_str)])
+        print(json.dumps(result.to_dict(), indent=2))
+        return result
 
     
-    def hex_to_ascii(self, hex_string: str) -> str:
+    def hex_to_ascii(self, hex_string: HexInput) -> str:
         """
         Convert hex to ASCII (JSON string).
+        
+        Accepts an EntryContext to reuse bytes and parsed JSON cached for the entry.
         """
         try:
-            # Convert hex to bytes then to ASCII
-            bytes_data = bytes.fromhex(hex_string)
-            ascii_str = bytes_data.decode('utf-8')
-            
-            # Validate it's proper JSON
-            json.loads(ascii_str)
-            return ascii_str
+            ctx = as_context(hex_string)
+            # Validate it's proper JSON with a full parse (neither backend has a
+            # validate-only mode); the parse stays cached on the context
+            ctx.parsed
+            return ctx.text
         except Exception as e:
             raise ValueError(f"Invalid hex to ASCII conversion: {str(e)}")
 
@@ -51,31 +209,123 @@ class CryptoConverter:
         """
         Process JSON string into dictionary with validation.
         """
-        if not validate_json(json_string):
+        try:
+            return json_backend.loads(json_string)
+        except (TypeError, ValueError):
             raise ValidationError("Invalid JSON string")
-            
-        return safe_json_loads(json_string)
 
-    def hex_to_unknown(self, hex_string: str) -> str:
-        """Convert hex to unknown format with header and transformed bytes."""
-        try:
-            # Process full hex string (don't skip header-length bytes)
-            input_bytes = bytes.fromhex(hex_string)
-            processed = bytearray()
+    def encode_bytes(self, data: bytes, position: int = 0) -> bytes:
+        """
+        Apply the nibble transform to raw bytes using the selected engine.
+
+        Args:
+            data (bytes): Raw input bytes
+            position (int): Byte position of ``data[0]`` within the whole payload
+
+        Returns:
+            bytes: Transformed bytes, two per input byte
+        """
+        if self.engine == 'table' and len(data) >= TABLE_MIN_BLOCKS * self.OFFSET_MOD:
+            return self._encode_table(data, position)
+        return self._encode_loop(data, position)
+
+    def decode_bytes(self, data: bytes, position: int = 0) -> bytes:
+        """
+        Reverse the nibble transform on raw bytes using the selected engine.
+
+        Args:
+            data (bytes): Transformed bytes (header already stripped)
+            position (int): Byte position of the first reconstructed byte
+
+        Returns:
+            bytes: Reconstructed bytes, one per input byte pair
+        """
+        if self.engine == 'table' and len(data) >= 2 * TABLE_MIN_BLOCKS * self.OFFSET_MOD:
+            return self._decode_table(data, position)
+        return self._decode_loop(data, position)
+
+    def _encode_loop(self, data: bytes, position: int = 0) -> bytes:
+        """Reference per-byte implementation of the nibble transform."""
+        processed = bytearray()
+
+        for i, byte in enumerate(data, position):
+            # Split byte into two nibbles (4 bits each)
+            high_nibble = (byte >> 4) & 0x0F
+            low_nibble = byte & 0x0F
+
+            # Transform each nibble into full bytes
+            offset = i % self.OFFSET_MOD
+            transformed_high = ((high_nibble ^ self.XOR_KEY) + offset) % 256
+            transformed_low = ((low_nibble ^ self.XOR_KEY) + offset) % 256
 
-            for i, byte in enumerate(input_bytes):
-                # Split byte into two nibbles (4 bits each)
-                high_nibble = (byte >> 4) & 0x0F
-                low_nibble = byte & 0x0F
+            processed.append(transformed_high)
+            processed.append(transformed_low)
 
-                # Transform each nibble into full bytes
-                transformed_high = ((high_nibble ^ self.XOR_KEY) + i) % 256
-                transformed_low = ((low_nibble ^ self.XOR_KEY) + i) % 256
+        return bytes(processed)
 
-                processed.append(transformed_high)
-                processed.append(transformed_low)
+    def _decode_loop(self, data: bytes, position: int = 0) -> bytes:
+        """Reference per-byte implementation of the reverse transform."""
+        processed = bytearray()
 
-            return self.HEADER + processed.hex()
+        for i in range(0, len(data), 2):
+            # Process byte pairs to reconstruct original byte
+            high_byte = data[i]
+            low_byte = data[i+1] if i+1 < len(data) else 0
+            offset = (position + i//2) % self.OFFSET_MOD
+
+            # Reverse transformations
+            high_nibble = ((high_byte - offset) ^ self.XOR_KEY) & 0x0F
+            low_nibble = ((low_byte - offset) ^ self.XOR_KEY) & 0x0F
+
+            reconstructed = (high_nibble << 4) | low_nibble
+            processed.append(reconstructed)
+
+        return bytes(processed)
+
+    def _encode_table(self, data: bytes, position: int = 0) -> bytes:
+        """Table-driven transform: one translate call per OFFSET_MOD-byte block column."""
+        enc_high, enc_low, _, _ = _build_tables(self.XOR_KEY)
+        size = len(data)
+        processed = bytearray(2 * size)
+        block = self.OFFSET_MOD
+        step = 2 * block
+
+        for col in range(min(block, size)):
+            offset = (position + col) % block
+            column = data[col::block]
+            processed[2*col::step] = column.translate(enc_high[offset])
+            processed[2*col + 1::step] = column.translate(enc_low[offset])
+
+        return bytes(processed)
+
+    def _decode_table(self, data: bytes, position: int = 0) -> bytes:
+        """Table-driven reverse transform: one translate call per block column."""
+        _, _, dec_high, dec_low = _build_tables(self.XOR_KEY)
+        if len(data) % 2:
+            # A trailing high byte pairs with an implicit zero low byte
+            data = bytes(data) + b'\x00'
+        highs = data[0::2]
+        lows = data[1::2]
+        size = len(highs)
+        high_out = bytearray(size)
+        low_out = bytearray(size)
+
+        block = self.OFFSET_MOD
+        for col in range(min(block, size)):
+            offset = (position + col) % block
+            high_out[col::block] = highs[col::block].translate(dec_high[offset])
+            low_out[col::block] = lows[col::block].translate(dec_low[offset])
+
+        # Nibbles occupy disjoint bits, so a single big-int OR merges them
+        merged = int.from_bytes(high_out, 'big') | int.from_bytes(low_out, 'big')
+        return merged.to_bytes(size, 'big')
+
+    def hex_to_unknown(self, hex_string: HexInput) -> str:
+        """Convert hex to unknown format with header and transformed bytes."""
+        try:
+            # Process full hex string (don't skip header-length bytes)
+            input_bytes = as_context(hex_string).data
+            return self.HEADER + self.encode_bytes(input_bytes).hex()
 
         except Exception as e:
             if self._debug:
@@ -90,55 +340,440 @@ class CryptoConverter:
 
             data_part = unknown_string[len(self.HEADER):]
             input_bytes = bytes.fromhex(data_part)
-            processed = bytearray()
-
-            for i in range(0, len(input_bytes), 2):
-                # Process byte pairs to reconstruct original byte
-                high_byte = input_bytes[i]
-                low_byte = input_bytes[i+1] if i+1 < len(input_bytes) else 0
-
-                # Reverse transformations
-                high_nibble = ((high_byte - i//2) ^ self.XOR_KEY) & 0x0F
-                low_nibble = ((low_byte - i//2) ^ self.XOR_KEY) & 0x0F
-
-                reconstructed = (high_nibble << 4) | low_nibble
-                processed.append(reconstructed)
-
-            return processed.hex()
+            return self.decode_bytes(input_bytes).hex()
 
         except Exception as e:
             if self._debug:
                 print(f"❌ unknown_to_hex error: {str(e)}")
             return None
 
-    def validate_conversion_pair(self, unknown_str, hex_str):
+    def encode_many(self, hex_strings: Sequence[HexInput]) -> List[Optional[str]]:
+        """
+        Convert many hex payloads to unknown format in one vectorized pass.
+
+        All payloads are packed into one ragged uint8 array so the nibble split,
+        XOR and position offset run as whole-array NumPy operations. Falls back
+        to per-entry ``hex_to_unknown`` when NumPy is not installed.
+
+        Args:
+            hex_strings (Sequence[HexInput]): Hex payloads or their EntryContexts
+
+        Returns:
+            List[Optional[str]]: Unknown strings, None where the input was invalid
+        """
+        if np is None:
+            return [self.hex_to_unknown(hex_str) for hex_str in hex_strings]
+
+        payloads = self._fromhex_many(hex_strings)
+        flat, starts, lengths = self._pack(payloads)
+        if flat.size:
+            positions = self._positions(starts, lengths, self.OFFSET_MOD)
+            processed = np.empty(2 * flat.size, dtype=np.uint8)
+            processed[0::2] = ((flat >> 4) ^ self.XOR_KEY) + positions
+            processed[1::2] = ((flat & 0x0F) ^ self.XOR_KEY) + positions
+        else:
+            processed = flat
+
+        results = []
+        for payload, start, length in zip(payloads, starts, lengths):
+            if payload is None:
+                results.append(None)
+            else:
+                results.append(self.HEADER + processed[2*start:2*(start + length)].tobytes().hex())
+        return results
+
+    def decode_many(self, unknown_strings: Sequence[str]) -> List[Optional[str]]:
+        """
+        Convert many unknown payloads back to hex in one vectorized pass.
+
+        Args:
+            unknown_strings (Sequence[str]): Unknown payloads including header
+
+        Returns:
+            List[Optional[str]]: Hex strings, None where the input was invalid
+        """
+        if np is None:
+            return [self.unknown_to_hex(unknown_str) for unknown_str in unknown_strings]
+
+        header_len = len(self.HEADER)
+        data_parts = []
+        for unknown_str in unknown_strings:
+            if isinstance(unknown_str, str) and unknown_str.startswith(self.HEADER):
+                data_parts.append(unknown_str[header_len:])
+            else:
+                data_parts.append(None)
+
+        payloads = self._fromhex_many(data_parts)
+        # A trailing high byte pairs with an implicit zero low byte
+        payloads = [p + b'\x00' if p is not None and len(p) % 2 else p for p in payloads]
+        flat, starts, lengths = self._pack(payloads)
+        starts, lengths = starts // 2, lengths // 2
+        if flat.size:
+            positions = self._positions(starts, lengths, self.OFFSET_MOD)
+            high_nibbles = ((flat[0::2] - positions) ^ self.XOR_KEY) & 0x0F
+            low_nibbles = ((flat[1::2] - positions) ^ self.XOR_KEY) & 0x0F
+            processed = (high_nibbles << 4) | low_nibbles
+        else:
+            processed = flat
+
+        results = []
+        for payload, start, length in zip(payloads, starts, lengths):
+            if payload is None:
+                results.append(None)
+            else:
+                results.append(processed[start:start + length].tobytes().hex())
+        return results
+
+    def _fromhex_many(self, hex_strings: Sequence[Optional[HexInput]]) -> List[Optional[bytes]]:
+        """Parse hex strings to bytes, mapping invalid entries to None."""
+        payloads = []
+        for hex_str in hex_strings:
+            try:
+                if isinstance(hex_str, EntryContext):
+                    payloads.append(hex_str.data)
+                else:
+                    payloads.append(bytes.fromhex(hex_str))
+            except Exception as e:
+                if self._debug and hex_str is not None:
+                    print(f"❌ batch fromhex error: {str(e)}")
+                payloads.append(None)
+        return payloads
+
+    @staticmethod
+    def _pack(payloads: Sequence[Optional[bytes]]):
+        """Pack payloads into one flat uint8 array with per-entry starts and lengths."""
+        lengths = np.fromiter((len(p) if p is not None else 0 for p in payloads),
+                              dtype=np.int64, count=len(payloads))
+        starts = np.zeros(len(payloads), dtype=np.int64)
+        if len(payloads) > 1:
+            np.cumsum(lengths[:-1], out=starts[1:])
+        flat = np.frombuffer(b''.join(p for p in payloads if p is not None), dtype=np.uint8)
+        return flat, starts, lengths
+
+    @staticmethod
+    def _positions(starts, lengths, offset_mod: int = BLOCK_SIZE):
+        """Per-byte position offset within its own entry, wrapped to uint8."""
+        total = int(lengths.sum())
+        positions = np.arange(total, dtype=np.int64) - np.repeat(starts, lengths)
+        if offset_mod != BLOCK_SIZE:
+            positions %= offset_mod
+        return positions.astype(np.uint8)
+
+    def validate_conversion_pair(self, unknown_str, hex_str) -> bool:
         """Validate conversion using the nibble transformation pattern."""
-        if len(unknown_str) < len(self.HEADER):
-            return False
+        return self.verify_conversion_pair(unknown_str, hex_str).valid
+
+    def verify_conversion_pair(self, unknown_str: str, hex_str: HexInput,
+                               expected_unknown: Optional[str] = None) -> PairVerification:
+        """
+        Verify an (unknown, hex) pair in bulk and locate the first mismatch.
+
+        The expected encoding is produced with the selected engine and compared
+        as a whole, so a valid pair costs one encode and one memcmp. On mismatch
+        the first bad byte is found by bisecting over blocks.
+
+        Args:
+            unknown_str (str): Unknown payload including header
+            hex_str (HexInput): Hex payload or its EntryContext
+            expected_unknown (Optional[str]): Already computed hex_to_unknown
+                output, used as a fast path when it matches verbatim
+
+        Returns:
+            PairVerification: Validity plus mismatch location and bytes
+        """
+        if not isinstance(unknown_str, str) or len(unknown_str) < len(self.HEADER):
+            return PairVerification(False, "Unknown string too short")
             
         # Header validation
         if unknown_str[:len(self.HEADER)] != self.HEADER:
-            return False
+            return PairVerification(False, "Header mismatch")
+
+        if expected_unknown is not None and expected_unknown == unknown_str:
+            return PairVerification(True)
 
-        unknown_data = unknown_str[len(self.HEADER):]
-        hex_bytes = bytes.fromhex(hex_str)
-        unknown_bytes = bytes.fromhex(unknown_data)
+        try:
+            hex_bytes = as_context(hex_str).data
+            unknown_bytes = bytes.fromhex(unknown_str[len(self.HEADER):])
+        except Exception as e:
+            return PairVerification(False, f"Invalid hex data: {str(e)}")
 
         # Validate length relationship: 2 unknown bytes per 1 hex byte
         if len(unknown_bytes) != 2 * len(hex_bytes):
-            return False
+            return PairVerification(
+                False,
+                f"Length mismatch: {len(hex_bytes)} hex bytes, {len(unknown_bytes)} unknown bytes"
+            )
 
-        # Validate transformation pattern
-        for i, hex_byte in enumerate(hex_bytes):
-            high_nibble = (hex_byte >> 4) & 0x0F
-            low_nibble = hex_byte & 0x0F
-            
-            expected_high = ((high_nibble ^ self.XOR_KEY) + i) % 256
-            expected_low = ((low_nibble ^ self.XOR_KEY) + i) % 256
+        expected = self.encode_bytes(hex_bytes)
+        if expected == unknown_bytes:
+            return PairVerification(True)
+
+        index = self._first_mismatch(expected, unknown_bytes)
+        offset = index // 2
+        unknown_pair = unknown_bytes[2*offset:2*offset + 2]
+        return PairVerification(
+            False,
+            "Transform mismatch",
+            offset=offset,
+            original=hex_bytes[offset],
+            reconstructed=self.decode_bytes(unknown_pair, offset)[0],
+            unknown_pair=unknown_pair
+        )
+
+    @staticmethod
+    def _first_mismatch(left: bytes, right: bytes) -> int:
+        """Index of the first differing byte of two equal-length, unequal byte strings."""
+        low, high = 0, len(left)
+        # Invariant: left[:low] == right[:low] and the spans differ within [low, high)
+        while high - low > LINEAR_SCAN_SIZE:
+            mid = (low + high) // 2
+            if left[low:mid] == right[low:mid]:
+                low = mid
+            else:
+                high = mid
+        for index in range(low, high):
+            if left[index] != right[index]:
+                return index
+        return high
+
+
+class UnknownIncrementalEncoder:
+    """
+    Stateful hex-to-unknown encoder for payloads fed in chunks.
+
+    Works like ``codecs.IncrementalEncoder``: each ``feed`` call returns the
+    unknown-format output available so far, carrying the running byte position
+    and any split hex digit across calls. The header is emitted with the first
+    output.
+    """
+
+    def __init__(self, converter: Optional[CryptoConverter] = None):
+        self.converter = converter or CryptoConverter()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the encoder to its initial state."""
+        self.position = 0
+        self._pending = ''
+        self._header_emitted = False
+
+    def feed(self, chunk: str, final: bool = False) -> str:
+        """
+        Encode the next chunk of a hex payload.
+
+        Args:
+            chunk (str): Next piece of the hex input (whitespace is ignored)
+            final (bool): True if this is the last chunk
+
+        Returns:
+            str: Unknown-format output for the bytes completed so far
+
+        Raises:
+            ValueError: If the chunk is not hex or the payload ends mid-byte
+        """
+        text = self._pending + ''.join(chunk.split())
+        usable = len(text) - len(text) % 2
+        if final and usable < len(text):
+            raise ValueError("Hex payload ends with an incomplete byte")
+
+        # Convert before touching any state, so a rejected chunk leaves the encoder as it was
+        data = bytes.fromhex(text[:usable])
+        output = self.converter.encode_bytes(data, self.position).hex()
+        self._pending = text[usable:]
+        self.position += len(data)
+
+        if not self._header_emitted and (output or final):
+            self._header_emitted = True
+            output = self.converter.HEADER + output
+        return output
+
+    def flush(self) -> str:
+        """Finish encoding and return any remaining output."""
+        return self.feed('', final=True)
+
+
+class UnknownIncrementalDecoder:
+    """
+    Stateful unknown-to-hex decoder for payloads fed in chunks.
+
+    Carries the header-stripping state, a split hex digit, an unpaired high
+    byte and the running byte position across ``feed`` calls.
+    """
+
+    def __init__(self, converter: Optional[CryptoConverter] = None):
+        self.converter = converter or CryptoConverter()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the decoder to its initial state."""
+        self.position = 0
+        self._pending = ''
+        self._pending_byte = b''
+        self._header_done = False
+
+    def feed(self, chunk: str, final: bool = False) -> str:
+        """
+        Decode the next chunk of an unknown-format payload.
+
+        Args:
+            chunk (str): Next piece of the unknown input, header included in the first chunks
+            final (bool): True if this is the last chunk
+
+        Returns:
+            str: Hex output for the byte pairs completed so far
+
+        Raises:
+            ValueError: If the header does not match, the chunk is not hex,
+                or the payload ends mid-byte
+        """
+        text = self._pending + ''.join(chunk.split())
+        header = self.converter.HEADER
+
+        header_done = self._header_done
+        if not header_done:
+            if len(text) < len(header):
+                if final:
+                    raise ValueError("Payload ends before the header is complete")
+                if not header.startswith(text):
+                    raise ValueError("Header mismatch")
+                self._pending = text
+                return ''
+            if not text.startswith(header):
+                raise ValueError("Header mismatch")
+            text = text[len(header):]
+            header_done = True
+
+        usable = len(text) - len(text) % 2
+        if final and usable < len(text):
+            raise ValueError("Unknown payload ends with an incomplete byte")
+
+        # Convert before touching any state, so a rejected chunk leaves the decoder as it was
+        data = self._pending_byte + bytes.fromhex(text[:usable])
+        pairs = len(data) if final else len(data) - len(data) % 2
+        output = self.converter.decode_bytes(data[:pairs], self.position)
 
-            if unknown_bytes[2*i] != expected_high:
-                return False
-            if (2*i + 1) < len(unknown_bytes) and unknown_bytes[2*i + 1] != expected_low:
-                return False
+        self._header_done = header_done
+        self._pending = text[usable:]
+        self._pending_byte = data[pairs:]
+        self.position += len(output)
+        return output.hex()
+
+    def flush(self) -> str:
+        """Finish decoding and return any remaining output."""
+        return self.feed('', final=True)
+
+
+def transform_stream(source, destination, decode: bool = False,
+                     converter: Optional[CryptoConverter] = None,
+                     chunk_size: int = 1 << 20) -> int:
+    """
+    Stream a hex or unknown payload between text file objects in constant memory.
+
+    Args:
+        source: Readable text file object
+        destination: Writable text file object
+        decode (bool): Decode unknown to hex instead of encoding hex to unknown
+        converter (Optional[CryptoConverter]): Converter providing the transform
+        chunk_size (int): Characters read per chunk
+
+    Returns:
+        int: Number of payload bytes processed
+    """
+    coder_cls = UnknownIncrementalDecoder if decode else UnknownIncrementalEncoder
+    coder = coder_cls(converter)
+
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        destination.write(coder.feed(chunk))
+    destination.write(coder.flush())
+    return coder.position
+
+
+def _new_file_mode() -> int:
+    """Permission bits of a newly created regular file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def transform_file(input_path, output_path, decode: bool = False,
+                   converter: Optional[CryptoConverter] = None, header: bool = True,
+                   block_size: int = 1 << 20) -> int:
+    """
+    Encode or decode a raw binary file through memory maps, without hex expansion.
+
+    The input is mapped read-only and the output is preallocated to its final
+    size and mapped for writing, so only one block at a time is materialized on
+    the Python heap. Encoded files carry the binary form of HEADER followed by
+    the transformed bytes.
+
+    Args:
+        input_path: Raw input file (plain data to encode, or encoded data to decode)
+        output_path: Destination file, created or replaced once the output is complete
+        decode (bool): Decode instead of encode
+        converter (Optional[CryptoConverter]): Converter providing the transform
+        header (bool): Write (encode) or require and strip (decode) the binary header
+        block_size (int): Input bytes processed per step (rounded down to an even number)
+
+    Returns:
+        int: Number of bytes written
+
+    Raises:
+        ValueError: If decoding input does not start with the header
+    """
+    converter = converter or CryptoConverter()
+    header_bytes = bytes.fromhex(converter.HEADER) if header else b''
+    block_size = max(block_size - block_size % 2, 2)
+
+    with open(input_path, 'rb') as src:
+        input_size = os.fstat(src.fileno()).st_size
+        # Validate before the output is touched, so a bad input never clobbers it
+        if decode:
+            if input_size < len(header_bytes):
+                raise ValueError("Input is shorter than the header")
+            if src.read(len(header_bytes)) != header_bytes:
+                raise ValueError("Header mismatch")
+            data_size = input_size - len(header_bytes)
+            output_size = (data_size + 1) // 2
+        else:
+            data_size = input_size
+            output_size = len(header_bytes) + 2 * data_size
+
+        # Written to a uniquely named file next to the destination and renamed over it once
+        # complete, so concurrent transforms to the same destination never share a temp file
+        output_path = Path(output_path)
+        with tempfile.NamedTemporaryFile(dir=output_path.parent, prefix=output_path.name + '.',
+                                         suffix='.tmp', delete=False) as dst:
+            tmp_path = Path(dst.name)
+        try:
+            # Temp files are private (0600); give the output the mode open() would have
+            os.chmod(tmp_path, _new_file_mode())
+            with open(tmp_path, 'r+b') as dst:
+                if data_size == 0:
+                    # Nothing to map: only the header is written
+                    if not decode:
+                        dst.write(header_bytes)
+                else:
+                    dst.truncate(output_size)
+                    with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as in_map, \
+                            mmap.mmap(dst.fileno(), output_size) as out_map:
+                        if decode:
+                            data_start = len(header_bytes)
+                            for start in range(0, data_size, block_size):
+                                block = in_map[data_start + start:data_start + start + block_size]
+                                decoded = converter.decode_bytes(block, start // 2)
+                                out_map[start // 2:start // 2 + len(decoded)] = decoded
+                        else:
+                            out_map[:len(header_bytes)] = header_bytes
+                            for start in range(0, data_size, block_size):
+                                block = in_map[start:start + block_size]
+                                offset = len(header_bytes) + 2 * start
+                                out_map[offset:offset + 2 * len(block)] = converter.encode_bytes(block, start)
+                        out_map.flush()
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
-        return True
+    return output_size
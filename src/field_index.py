@@ -0,0 +1,189 @@
+# src/field_index.py
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_FIELDS = ('hash', 'searchHash', 'url', 'expireTime')
+OPERATORS = ('=', '!=', '<', '<=', '>', '>=')
+_CONDITION = re.compile(r'^\s*([^<>=!\s]+)\s*(<=|>=|!=|=|<|>)\s*(.*?)\s*$')
+
+Condition = Tuple[str, str, Any]
+
+def _sqlite_number(value: Any) -> Any:
+    """A number SQLite can bind: ints beyond 64 bits become floats (infinite beyond float range)."""
+    if isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
+        try:
+            return float(value)
+        except OverflowError:
+            return float('inf') if value > 0 else float('-inf')
+    return value
+
+def extract_fields(parsed: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Pick the indexable fields out of a decoded payload.
+
+    Args:
+        parsed: Decoded JSON payload (only dicts carry fields)
+        fields (Sequence[str]): Field names to keep
+
+    Returns:
+        Dict[str, Any]: Present fields with scalar values
+    """
+    if not isinstance(parsed, dict):
+        return {}
+    return {
+        field: parsed[field] for field in fields
+        if field in parsed and isinstance(parsed[field], (str, int, float))
+    }
+
+def parse_condition(text: str) -> Condition:
+    """
+    Parse a ``field<op>value`` query condition such as ``expireTime<1735637240851``.
+
+    The value is read as JSON when possible (numbers, quoted strings), else as a
+    bare string.
+
+    Raises:
+        ValueError: If the condition has no valid operator
+    """
+    match = _CONDITION.match(text)
+    if match is None:
+        raise ValueError(f"Invalid condition (expected field{'|'.join(OPERATORS)}value): {text}")
+    field, operator, raw = match.groups()
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    if not isinstance(value, (str, int, float)):
+        raise ValueError(f"Condition value must be a number or string: {text}")
+    return field, operator, value
+
+class FieldIndex:
+    """
+    Persistent secondary index from decoded payload fields to entry ids, backed by SQLite.
+
+    Numbers and strings are stored in separate columns with their own B-tree
+    indexes, so equality and range conditions are answered by index seeks and
+    compare numerically or lexicographically as appropriate. Each run rebuilds
+    the index inside one transaction; readers keep seeing the previous run's
+    index until it commits.
+    """
+
+    def __init__(self, path: str, fields: Sequence[str] = DEFAULT_FIELDS):
+        """
+        Args:
+            path (str): SQLite database file
+            fields (Sequence[str]): Decoded payload fields to index
+        """
+        self.path = Path(path)
+        self.fields = tuple(fields)
+        self._rows: List[Tuple[str, Optional[float], Optional[str], str]] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Pipelined runs write from the I/O helper thread
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS field_values ("
+            " field TEXT NOT NULL, num REAL, text TEXT, entry_id TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS field_values_num ON field_values (field, num)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS field_values_text ON field_values (field, text)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+    def begin(self, input_file: str) -> None:
+        """Start rebuilding the index for a run over ``input_file``."""
+        self._rows = []
+        self._conn.execute("DELETE FROM field_values")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('input_file', ?), ('fields', ?)",
+            (input_file, json.dumps(self.fields))
+        )
+
+    def add(self, entry_id: str, values: Dict[str, Any]) -> None:
+        """Buffer the indexed field values of one entry."""
+        for field, value in values.items():
+            if isinstance(value, str):
+                self._rows.append((field, None, value, entry_id))
+            elif not isinstance(value, bool):
+                self._rows.append((field, _sqlite_number(value), None, entry_id))
+
+    def flush(self) -> None:
+        """Write buffered rows (still uncommitted until ``commit``)."""
+        if self._rows:
+            self._conn.executemany(
+                "INSERT INTO field_values (field, num, text, entry_id) VALUES (?, ?, ?, ?)", self._rows
+            )
+            self._rows = []
+
+    def commit(self) -> None:
+        """Publish the rebuilt index."""
+        self.flush()
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        """Discard a partial rebuild, keeping the previous index."""
+        self._rows = []
+        self._conn.rollback()
+
+    def absorb(self, path: str) -> int:
+        """
+        Add every row of another index file to the rebuild in progress.
+
+        Args:
+            path (str): Index file built over the same fields, e.g. by one shard
+
+        Returns:
+            int: Number of rows added
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If it indexes different fields
+        """
+        if not Path(path).is_file():
+            raise FileNotFoundError(f"Index not found: {path}")
+        self.flush()
+        source = sqlite3.connect(str(path), timeout=30)
+        try:
+            row = source.execute("SELECT value FROM meta WHERE key = 'fields'").fetchone()
+            fields = tuple(json.loads(row[0])) if row else ()
+            if fields != self.fields:
+                raise ValueError(f"Index {path} covers fields {list(fields)}, expected {list(self.fields)}")
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT INTO field_values (field, num, text, entry_id) VALUES (?, ?, ?, ?)",
+                source.execute("SELECT field, num, text, entry_id FROM field_values")
+            )
+            return self._conn.total_changes - before
+        finally:
+            source.close()
+
+    def query(self, conditions: Iterable[Condition]) -> List[str]:
+        """
+        Entry ids matching all conditions, sorted.
+
+        Args:
+            conditions: (field, operator, value) triples, e.g. from parse_condition
+
+        Returns:
+            List[str]: Matching entry ids
+        """
+        clauses, params = [], []
+        for field, operator, value in conditions:
+            if operator not in OPERATORS:
+                raise ValueError(f"Unsupported operator: {operator}")
+            column = 'text' if isinstance(value, str) else 'num'
+            clauses.append(f"SELECT entry_id FROM field_values WHERE field = ? AND {column} {operator} ?")
+            params += [field, value if isinstance(value, str) else _sqlite_number(value)]
+        if not clauses:
+            return []
+        rows = self._conn.execute(" INTERSECT ".join(clauses) + " ORDER BY entry_id", params)
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """Commit pending rows and close the database."""
+        self.commit()
+        self._conn.close()
@@ -0,0 +1,157 @@
+# src/inference.py
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .conversions import BLOCK_SIZE, CodecProfile, np
+from .profiles import HEADER_LENGTH
+
+SOLVE_POSITIONS = 4 * BLOCK_SIZE  # Leading byte positions used to solve key and schedule
+
+class InferenceResult(NamedTuple):
+    """
+    Codec parameters recovered from known (hex, unknown) pairs.
+
+    ``confidence`` is the fraction of observed unknown payload bytes that the
+    inferred profile reproduces exactly; bytes of pairs with a different header
+    count as not reproduced. When every payload is shorter than the modulus,
+    any larger modulus explains the data equally well; ``modulus_ambiguous`` is
+    set and ``offset_mod`` falls back to the default.
+    """
+
+    profile: CodecProfile
+    confidence: float
+    pairs: int
+    matched_pairs: int
+    skipped_pairs: int
+    header_agreement: float
+    modulus_ambiguous: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'profile': {**self.profile._asdict(), 'xor_key': f"0x{self.profile.xor_key:02x}"},
+            'confidence': round(self.confidence, 6),
+            'pairs': self.pairs,
+            'matched_pairs': self.matched_pairs,
+            'skipped_pairs': self.skipped_pairs,
+            'header_agreement': round(self.header_agreement, 6),
+            'modulus_ambiguous': self.modulus_ambiguous,
+        }
+
+def _split_pair(hex_str: Any, unknown_str: Any) -> Optional[Tuple[str, bytes, bytes]]:
+    """(header, payload bytes, unknown payload bytes) of a well-formed pair, else None."""
+    if not isinstance(hex_str, str) or not isinstance(unknown_str, str):
+        return None
+    if len(unknown_str) - 2 * len(hex_str) != HEADER_LENGTH:
+        return None
+    try:
+        return (unknown_str[:HEADER_LENGTH].lower(), bytes.fromhex(hex_str),
+                bytes.fromhex(unknown_str[HEADER_LENGTH:]))
+    except ValueError:
+        return None
+
+def infer_profile(pairs: Iterable[Tuple[str, str]], name: str = 'inferred') -> InferenceResult:
+    """
+    Recover header, XOR key and offset modulus from known (hex, unknown) pairs.
+
+    All pairs are solved at once: payload nibbles and unknown bytes are packed
+    into flat arrays, and for each of the 16 candidate low key nibbles the
+    residual ``unknown - (nibble ^ key)`` is histogrammed per byte position. The
+    right key leaves one residual per position (the offset schedule). The high
+    key nibble only shifts every residual by a constant, so it is recovered
+    together with the modulus by fitting ``position % m`` to the schedule for
+    every candidate ``m``.
+
+    Args:
+        pairs: (hex, unknown) strings; malformed pairs are skipped
+        name (str): Name of the inferred profile
+
+    Returns:
+        InferenceResult: Inferred profile and how well it explains the pairs
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+        ValueError: If no pair is usable
+    """
+    if np is None:
+        raise RuntimeError("Parameter inference requires numpy")
+
+    parsed: List[Tuple[str, bytes, bytes]] = []
+    skipped = 0
+    for hex_str, unknown_str in pairs:
+        pair = _split_pair(hex_str, unknown_str)
+        if pair is None:
+            skipped += 1
+        else:
+            parsed.append(pair)
+    if not parsed:
+        raise ValueError("No usable (hex, unknown) pairs to infer parameters from")
+
+    header, header_count = Counter(pair[0] for pair in parsed).most_common(1)[0]
+    selected = [pair for pair in parsed if pair[0] == header]
+    other_bytes = sum(len(pair[2]) for pair in parsed if pair[0] != header)
+
+    # Flat arrays with one element per unknown byte: source nibble, unknown byte, byte position
+    data = np.frombuffer(b''.join(pair[1] for pair in selected), dtype=np.uint8)
+    unknown = np.frombuffer(b''.join(pair[2] for pair in selected), dtype=np.uint8)
+    lengths = np.fromiter((len(pair[1]) for pair in selected), dtype=np.int64, count=len(selected))
+    starts = np.zeros(len(selected), dtype=np.int64)
+    if len(selected) > 1:
+        np.cumsum(lengths[:-1], out=starts[1:])
+    nibbles = np.empty(2 * data.size, dtype=np.uint8)
+    nibbles[0::2] = data >> 4
+    nibbles[1::2] = data & 0x0F
+    positions = np.repeat(np.arange(data.size, dtype=np.int64) - np.repeat(starts, lengths), 2)
+
+    key, offset_mod, ambiguous = _solve(nibbles, unknown, positions)
+
+    expected = ((nibbles ^ key) + (positions % offset_mod)).astype(np.uint8)
+    mismatches = np.bincount(
+        np.repeat(np.arange(len(selected)), 2 * lengths), weights=expected != unknown,
+        minlength=len(selected)
+    )
+    matched_bytes = int(unknown.size - mismatches.sum())
+    total_bytes = unknown.size + other_bytes
+    return InferenceResult(
+        profile=CodecProfile(name, header, key, offset_mod),
+        confidence=matched_bytes / total_bytes if total_bytes else float(header_count == len(parsed)),
+        pairs=len(parsed),
+        matched_pairs=int((mismatches == 0).sum()),
+        skipped_pairs=skipped,
+        header_agreement=header_count / len(parsed),
+        modulus_ambiguous=ambiguous,
+    )
+
+def _solve(nibbles, unknown, positions) -> Tuple[int, int, bool]:
+    """Best (xor_key, offset_mod, modulus_ambiguous) for packed nibble observations."""
+    if not nibbles.size:
+        return 0, BLOCK_SIZE, True
+    mask = positions < SOLVE_POSITIONS
+    nibbles, unknown, positions = nibbles[mask], unknown[mask], positions[mask]
+    span = int(positions.max()) + 1
+
+    # Per-position residual histograms for each low key nibble; keep the most consistent
+    best = None
+    for low_key in range(16):
+        residuals = (unknown - (nibbles ^ low_key)).astype(np.int64)
+        counts = np.bincount(positions * 256 + residuals, minlength=span * 256).reshape(span, 256)
+        score = int(counts.max(axis=1).sum())
+        if best is None or score > best[0]:
+            best = (score, low_key, counts)
+    _, low_key, counts = best
+    schedule = counts.argmax(axis=1)
+    weights = counts.sum(axis=1)
+
+    # schedule[p] = (high key bits + p % offset_mod) mod 256 for the right modulus
+    index = np.arange(span)
+    fits = []
+    for offset_mod in range(1, BLOCK_SIZE + 1):
+        shifts = np.bincount((schedule - index % offset_mod) & 0xFF, weights=weights, minlength=256)
+        fits.append((int(shifts.max()), offset_mod, int(shifts.argmax())))
+    best_fit = max(fit[0] for fit in fits)
+    candidates = [fit for fit in fits if fit[0] == best_fit]
+    # Short payloads cannot tell large moduli apart; prefer the format's default then
+    _, offset_mod, shift = next(
+        (fit for fit in candidates if fit[1] == BLOCK_SIZE), candidates[0]
+    )
+    return (shift & 0xF0) | low_key, offset_mod, len(candidates) > 1
@@ -0,0 +1,142 @@
+# src/json_backend.py
+#
+# JSON parsing and serialization for the hot paths (payload parsing, result
+# writers, the server), with the fastest installed backend chosen at import.
+
+import json
+import math
+from typing import Any, Callable, Dict, IO, List, Type, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib backend is used without it
+    orjson = None
+
+JsonInput = Union[str, bytes]
+
+# orjson reads integers outside the 64-bit range as floats of at least this magnitude
+_INT64_LIMIT = 2.0 ** 63
+
+def _has_float(obj: Any, predicate: Callable[[float], bool]) -> bool:
+    """True if a document holds a float for which ``predicate`` is true."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if type(value) is dict:
+            stack.extend(value.values())
+        elif type(value) is list or type(value) is tuple:
+            stack.extend(value)
+        elif type(value) is float and predicate(value):
+            return True
+    return False
+
+def _is_large(value: float) -> bool:
+    """Magnitude of 2**63 or more (including infinities and NaN)."""
+    return not -_INT64_LIMIT < value < _INT64_LIMIT
+
+class StdlibBackend:
+    """The standard library ``json`` module."""
+
+    name = 'json'
+
+    def loads(self, data: JsonInput) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, indent: bool = False) -> str:
+        """Serialize compactly, or indented by two spaces."""
+        if indent:
+            return json.dumps(obj, indent=2)
+        return json.dumps(obj, separators=(',', ':'))
+
+    def dumpb(self, obj: Any) -> bytes:
+        """Serialize compactly to UTF-8 bytes."""
+        return self.dumps(obj).encode('utf-8')
+
+    def dump(self, obj: Any, fp: IO[str], indent: bool = False) -> None:
+        if indent:
+            json.dump(obj, fp, indent=2)
+        else:
+            json.dump(obj, fp, separators=(',', ':'))
+
+class OrjsonBackend(StdlibBackend):
+    """
+    orjson, with the stdlib as the reference for edge cases.
+
+    orjson rejects a few inputs the stdlib accepts (NaN, lone surrogates,
+    numbers out of float range) and cannot serialize integers beyond 64 bits,
+    so failures are retried with the stdlib: the set of accepted documents is
+    unchanged and errors are stdlib errors. It also writes NaN and infinities
+    as ``null``, so objects holding them are serialized with the stdlib. orjson also silently reads
+    integers beyond 64 bits as floats, so documents holding a float that large
+    are parsed again with the stdlib. Output is UTF-8 rather than ASCII-escaped.
+    """
+
+    name = 'orjson'
+
+    def loads(self, data: JsonInput) -> Any:
+        try:
+            obj = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+        # Walking the result is cheap next to parsing long payload strings
+        return json.loads(data) if _has_float(obj, _is_large) else obj
+
+    def dumps(self, obj: Any, indent: bool = False) -> str:
+        return self._dumpb(obj, indent).decode('utf-8')
+
+    def dumpb(self, obj: Any) -> bytes:
+        return self._dumpb(obj, False)
+
+    def dump(self, obj: Any, fp: IO[str], indent: bool = False) -> None:
+        fp.write(self.dumps(obj, indent))
+
+    def _dumpb(self, obj: Any, indent: bool) -> bytes:
+        # orjson writes NaN and infinities as null; the stdlib writes NaN and Infinity
+        if _has_float(obj, lambda value: not math.isfinite(value)):
+            return super().dumps(obj, indent).encode('utf-8')
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            return super().dumps(obj, indent).encode('utf-8')
+
+BACKENDS: Dict[str, Type[StdlibBackend]] = {
+    'json': StdlibBackend,
+    'orjson': OrjsonBackend,
+}
+
+def available_backends() -> List[str]:
+    """Names of the backends usable in this environment."""
+    return ['json'] + (['orjson'] if orjson is not None else [])
+
+def select_backend(name: str = 'auto') -> StdlibBackend:
+    """
+    Make ``name`` ('auto' for the fastest installed one) the active backend.
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    global backend
+    if name == 'auto':
+        name = available_backends()[-1]
+    if name not in available_backends():
+        raise ValueError(f"JSON backend '{name}' is not available, expected one of {available_backends()}")
+    backend = BACKENDS[name]()
+    return backend
+
+backend = select_backend()
+
+def loads(data: JsonInput) -> Any:
+    """Parse a JSON document with the active backend."""
+    return backend.loads(data)
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize with the active backend, compactly or indented by two spaces."""
+    return backend.dumps(obj, indent)
+
+def dumpb(obj: Any) -> bytes:
+    """Serialize compactly to UTF-8 bytes with the active backend."""
+    return backend.dumpb(obj)
+
+def dump(obj: Any, fp: IO[str], indent: bool = False) -> None:
+    """Serialize to a text file with the active backend."""
+    backend.dump(obj, fp, indent)
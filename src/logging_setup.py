@@ -0,0 +1,136 @@
+# src/logging_setup.py
+
+import logging
+import queue
+import sys
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterable, Iterator, List, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DEFAULT_LOG_FILE = 'crypto_processor.log'
+PACKAGE_LOGGER = __name__.rpartition('.')[0] or __name__  # Parent of this package's module loggers
+
+def build_handlers(log_files: Iterable[str]) -> List[logging.Handler]:
+    """Create the console handler plus one file handler per path, all using LOG_FORMAT."""
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+    handlers += [logging.FileHandler(path) for path in log_files]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+@contextmanager
+def configure_logging(level: int = logging.INFO, log_files: Iterable[str] = (),
+                      use_queue: bool = True) -> Iterator[None]:
+    """
+    Install console and file handlers on the root logger for the duration of a command.
+
+    With ``use_queue`` the root logger only gets a QueueHandler: callers merely
+    enqueue records, and a QueueListener thread does the formatting and the
+    (blocking) console and file writes. Queued records are drained on exit.
+
+    ``level`` applies to this package's loggers. Other libraries' loggers
+    inherit the root level, which never drops below INFO, so a debug run does
+    not also turn on their debug output.
+
+    Args:
+        level (int): Level of the package loggers
+        log_files (Iterable[str]): Files to append log lines to (none: console only)
+        use_queue (bool): Write logs from a background thread instead of in-line
+    """
+    root = logging.getLogger()
+    package = logging.getLogger(PACKAGE_LOGGER)
+    handlers = build_handlers(log_files)
+    listener = None
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        installed: List[logging.Handler] = [QueueHandler(log_queue)]
+        listener.start()
+    else:
+        installed = handlers
+
+    previous_levels = root.level, package.level
+    for handler in installed:
+        root.addHandler(handler)
+    root.setLevel(max(level, logging.INFO))
+    package.setLevel(level)
+    try:
+        yield
+    finally:
+        for handler in installed:
+            root.removeHandler(handler)
+        root.setLevel(previous_levels[0])
+        package.setLevel(previous_levels[1])
+        if listener is not None:
+            listener.stop()
+        for handler in handlers:
+            handler.close()
+
+def reset_worker_logging() -> None:
+    """
+    Replace queue handlers inherited by a forked worker process with a stderr handler.
+
+    The listener draining the queue only runs in the parent, so records queued
+    in a worker would never be written.
+    """
+    root = logging.getLogger()
+    inherited = [handler for handler in root.handlers if isinstance(handler, QueueHandler)]
+    if not inherited:
+        return
+    for handler in inherited:
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(handler)
+
+class ProgressReporter:
+    """
+    Rate-limited progress log: one INFO line every ``every`` entries or ``interval`` seconds.
+
+    When ``total`` (input size) and ``position`` (input consumed so far) are set,
+    lines include the completed fraction and an ETA extrapolated from it.
+    """
+
+    def __init__(self, logger: logging.Logger, every: int = 10000, interval: float = 10.0):
+        self.logger = logger
+        self.every = every
+        self.interval = interval
+        self.total: Optional[int] = None
+        self.position = 0
+        self.started = time.perf_counter()
+        self._next_count = every if every > 0 else float('inf')
+        self._next_time = self.started + interval if interval > 0 else float('inf')
+
+    def update(self, done: int) -> None:
+        """Log progress if ``done`` entries or the elapsed time crossed the next threshold."""
+        if done < self._next_count:
+            now = time.perf_counter()
+            if now < self._next_time:
+                return
+        else:
+            now = time.perf_counter()
+        self._report(done, now)
+        if self.every > 0:
+            self._next_count = done + self.every
+        if self.interval > 0:
+            self._next_time = now + self.interval
+
+    def finish(self, done: int) -> None:
+        """Log the final count and overall rate."""
+        elapsed = time.perf_counter() - self.started
+        self.logger.info("Processed %d datasets in %.1fs (%.0f/s)",
+                         done, elapsed, done / elapsed if elapsed else 0.0)
+
+    def _report(self, done: int, now: float) -> None:
+        elapsed = now - self.started
+        rate = done / elapsed if elapsed else 0.0
+        if self.total and self.position:
+            fraction = min(self.position / self.total, 1.0)
+            eta = elapsed * (1 - fraction) / fraction
+            self.logger.info("Processed %d datasets (%.1f%%, %.0f/s, ETA %.0fs)",
+                             done, fraction * 100, rate, eta)
+        else:
+            self.logger.info("Processed %d datasets (%.0f/s)", done, rate)
@@ -3,23 +3,39 @@
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 import argparse
+import asyncio
+import itertools
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+import signal
 import sys
+import threading
+import time
 
-from .conversions import CryptoConverter
-from .utils import ValidationError
-
-# Configure logging with more detailed format
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('crypto_processor.log')
-    ]
+from . import json_backend
+from .cache import ConversionCache
+from .checkpoint import CheckpointManifest
+from .field_index import DEFAULT_FIELDS, FieldIndex, extract_fields, parse_condition
+from .inference import infer_profile
+from .logging_setup import DEFAULT_LOG_FILE, ProgressReporter, configure_logging, reset_worker_logging
+from .conversions import CryptoConverter, EntryContext, HAS_NUMPY, transform_file
+from .metrics import RunMetrics
+from .output import OUTPUT_FORMATS, BinaryResultReader, ResultWriter
+from .prevalidation import REASONS, scan_entries, scan_report
+from .profiling import RunProfiler
+from .profiles import ProfileRegistry
+from .results import (
+    CONVERSION_PAIR, HEX_TO_ASCII, HEX_TO_UNKNOWN, UNKNOWN_TO_HEX, VALIDATIONS, EntryResult
 )
+from .server import make_server
+from .sharding import Shard, find_run_outputs, iter_result_file, merge_summaries, resolve_input_files
+from .utils import CountingReader, ValidationError, iter_chunks, iter_json_object
+
+# Handlers are installed by main() (see logging_setup), not at import time
 logger = logging.getLogger(__name__)
 
 class CryptoProcessor:
@@ -28,29 +44,162 @@ class CryptoProcessor:
     Includes validation and detailed error reporting.
     """
     
-    def __init__(self, input_file: str, output_dir: str, debug: bool = False):
+    def __init__(self, input_file: Optional[str], output_dir: str, debug: bool = False, engine: str = 'table',
+                 batch_size: int = 1024, output_format: str = 'json', workers: int = 1,
+                 chunk_size: int = 256, cache_path: Optional[str] = None,
+                 cache_max_bytes: Optional[int] = None, cache_max_age: Optional[float] = None,
+                 resume: bool = False, prometheus_file: Optional[str] = None,
+                 progress_every: int = 10000, progress_interval: float = 10.0,
+                 compact_output: bool = False, index_path: Optional[str] = None,
+                 index_fields: Optional[Iterable[str]] = None, profiles_path: Optional[str] = None,
+                 shard: Optional[Shard] = None,
+                 prevalidate: bool = True, profiling: bool = False, profile_sample_rate: float = 1.0,
+                 profile_top: int = 20):
         """
         Initialize the processor with input and output paths.
         
         Args:
-            input_file (str): Path to input JSON file
+            input_file (Optional[str]): Path to input JSON file, or a directory or glob of
+                them; None for a processor that only handles process_batch calls
             output_dir (str): Directory for output files
             debug (bool): Enable debug mode for additional logging
+            engine (str): Codec engine used by the converter ('loop' or 'table')
+            batch_size (int): Entries converted per vectorized batch (0 disables batching)
+            output_format (str): Detailed results format ('json' or 'ndjson')
+            workers (int): Worker processes for entry conversion (1 processes in-line)
+            chunk_size (int): Entries sent to a worker process per task
+            cache_path (Optional[str]): SQLite file for the persistent conversion cache
+            cache_max_bytes (Optional[int]): Cache size limit, LRU-evicted beyond it
+            cache_max_age (Optional[float]): Seconds after which unused cache entries expire
+            resume (bool): Checkpoint results in output_dir and reuse those of unchanged entries
+            prometheus_file (Optional[str]): Also write run metrics in Prometheus text format here
+            progress_every (int): Log progress every this many entries (0 disables)
+            progress_interval (float): Log progress at least this often in seconds (0 disables)
+            compact_output (bool): Leave the original entry and round-trip strings that
+                reproduce it out of the detailed results
+            index_path (Optional[str]): SQLite file for a secondary index over decoded fields
+                (tagged with the shard label for sharded runs)
+            index_fields (Optional[Iterable[str]]): Decoded payload fields to index
+                (defaults to DEFAULT_FIELDS; ignored without index_path)
+            profiles_path (Optional[str]): Codec profile file; entries are routed to the
+                profile matching their unknown-format header
+            shard (Optional[Shard]): Only process the entries of this hash partition
+            prevalidate (bool): Structurally scan each chunk first and reject malformed
+                entries without converting them
+            profiling (bool): Profile the load, process and save stages with cProfile and
+                tracemalloc and record the slowest entries (needs workers=1)
+            profile_sample_rate (float): Fraction of stage calls (one per chunk) profiled
+            profile_top (int): Number of slowest entries recorded
         """
-        self.input_file = Path(input_file)
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'")
+        if profiling and workers > 1:
+            raise ValueError("Profiling runs conversions in-process and needs workers=1")
+        self.input_file = Path(input_file) if input_file is not None else None
+        self.shard = shard
+        # Tag added to output file names so shards can share an output directory
+        self.run_tag = f"_{shard.label}" if shard else ''
         self.output_dir = Path(output_dir)
-        self.converter = CryptoConverter(debug=debug)
+        self.debug = debug
+        self.engine = engine
+        self.profiles_path = profiles_path
+        self.profiles = ProfileRegistry.load(profiles_path) if profiles_path else None
+        self.converter = CryptoConverter(
+            debug=debug, engine=engine, profile=self.profiles.default if self.profiles else None
+        )
+        self.batch_size = batch_size
+        self.output_format = output_format
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.cache_path = cache_path
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_max_age = cache_max_age
+        self.cache = None
+        if cache_path:
+            self.cache = ConversionCache(
+                cache_path, self.converter.HEADER, self.converter.XOR_KEY,
+                max_bytes=cache_max_bytes, max_age=cache_max_age
+            )
+        # Converter per codec profile name; the default one handles unrecognized headers
+        self.converters: Dict[str, Any] = {self.converter.profile_name: self.converter}
+        for profile in self.profiles or ():
+            if profile.name not in self.converters:
+                self.converters[profile.name] = CryptoConverter(debug=debug, engine=engine, profile=profile)
+        # Cache key parameters per routed profile name (None: the default converter)
+        self._cache_params = {
+            name: ConversionCache.params_for(converter.HEADER, converter.XOR_KEY, converter.OFFSET_MOD)
+            for name, converter in [(None, self.converter), *self.converters.items()]
+        }
+        self.prevalidate = prevalidate
+        self.profiling = profiling
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_top = profile_top
+        # Validate the settings now; each run starts a fresh profiler
+        self.profiler = RunProfiler(profile_sample_rate, profile_top) if profiling else None
+        # Unknown-format headers a well-formed entry may start with
+        self.accepted_headers = frozenset(
+            profile.header for profile in self.profiles
+        ) if self.profiles else frozenset((self.converter.HEADER,))
         self._setup_output_directory()
+        self.checkpoint = None
+        if resume:
+            checkpoint_dir = self.output_dir / shard.label if shard else self.output_dir
+            checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            self.checkpoint = CheckpointManifest(
+                checkpoint_dir,
+                self.profiles.signature() if self.profiles else self.converter.HEADER,
+                self.converter.XOR_KEY
+            )
+        self._fingerprints: Dict[str, str] = {}
+        # Checkpointed results of unchanged entries, until their chunk is written
+        self._reused: Dict[str, EntryResult] = {}
+        self._write_lock = threading.Lock()
+        self.prometheus_file = prometheus_file
+        self.metrics = RunMetrics()
+        self.progress_every = progress_every
+        self.progress_interval = progress_interval
+        self.progress = self._new_progress()
+        self.compact_output = compact_output
+        # Fields are only extracted for an index; without one payloads need not be kept parsed
+        self.index_fields = tuple(index_fields or DEFAULT_FIELDS) if index_path else ()
+        if index_path and shard:
+            # Every run rebuilds its index, so shards sharing a path would replace each other
+            index_path = shard.tag_path(index_path)
+        self.field_index = FieldIndex(index_path, self.index_fields) if index_path else None
         
     def _setup_output_directory(self) -> None:
         """Create output directory structure if it doesn't exist."""
         try:
             self.output_dir.mkdir(parents=True, exist_ok=True)
-            logger.debug(f"Output directory setup complete: {self.output_dir}")
+            logger.debug("Output directory setup complete: %s", self.output_dir)
         except Exception as e:
-            logger.error(f"Failed to create output directory: {str(e)}")
+            logger.error("Failed to create output directory: %s", e)
             raise
 
+    REQUIRED_FIELDS = {'unknown', 'hex', 'ascii_text'}
+
+    def validate_entry(self, key: str, entry: Any) -> Tuple[bool, str]:
+        """
+        Validate the structure and content of a single dataset entry.
+        
+        Args:
+            key (str): Entry identifier
+            entry (Any): Entry value from the input file
+            
+        Returns:
+            Tuple[bool, str]: (is_valid, error_message)
+        """
+        if not isinstance(entry, dict):
+            return False, f"Dataset {key} must be a dictionary"
+            
+        if not all(field in entry for field in self.REQUIRED_FIELDS):
+            return False, f"Dataset {key} missing required fields: {self.REQUIRED_FIELDS}"
+            
+        if not isinstance(entry['ascii_text'], dict):
+            return False, f"Dataset {key}: ascii_text must be a JSON object"
+            
+        return True, ""
+
     def validate_dataset(self, data: Dict[str, Any]) -> Tuple[bool, str]:
         """
         Validate the structure and content of input dataset.
@@ -61,155 +210,846 @@ class CryptoProcessor:
         Returns:
             Tuple[bool, str]: (is_valid, error_message)
         """
-        required_fields = {'unknown', 'hex', 'ascii_text'}
-        
         if not isinstance(data, dict):
             return False, "Input data must be a dictionary"
             
         for key, entry in data.items():
-            if not isinstance(entry, dict):
-                return False, f"Dataset {key} must be a dictionary"
-                
-            if not all(field in entry for field in required_fields):
-                return False, f"Dataset {key} missing required fields: {required_fields}"
-                
-            if not isinstance(entry['ascii_text'], dict):
-                return False, f"Dataset {key}: ascii_text must be a JSON object"
+            is_valid, error_msg = self.validate_entry(key, entry)
+            if not is_valid:
+                return False, error_msg
                 
         return True, ""
 
-    def load_data(self) -> Dict[str, Dict[str, Any]]:
+    def iter_entries(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
         """
-        Load and validate the JSON data file.
+        Stream validated (entry_id, entry) pairs from the input file as they are parsed.
         
-        Returns:
-            Dict[str, Dict[str, Any]]: Loaded and validated data
+        Yields:
+            Tuple[str, Dict[str, Any]]: Entry identifier and entry
             
         Raises:
-            ValidationError: If data validation fails
+            ValidationError: If an entry fails validation or an entry id appears
+                in more than one input file
             FileNotFoundError: If input file doesn't exist
             json.JSONDecodeError: If JSON parsing fails
         """
         try:
-            if not self.input_file.exists():
-                raise FileNotFoundError(f"Input file not found: {self.input_file}")
-                
-            with open(self.input_file, 'r') as f:
-                data = json.load(f)
-                
-            is_valid, error_msg = self.validate_dataset(data)
-            if not is_valid:
-                raise ValidationError(error_msg)
-                
-            logger.info(f"Successfully loaded {len(data)} datasets from {self.input_file}")
-            return data
+            input_files = self._input_files()
+            # Ids of the files read so far; only needed to catch duplicates across files
+            seen = set() if len(input_files) > 1 else None
+            count = 0
+            self.progress.total = sum(path.stat().st_size for path in input_files)
+            consumed = 0
+            for path in input_files:
+                file_keys = set() if seen is not None else None
+                with open(path, 'r') as f:
+                    reader = CountingReader(f)
+                    members = iter_json_object(reader)
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            key, entry = next(members)
+                        except StopIteration:
+                            break
+                        parsed = time.perf_counter()
+                        self.progress.position = consumed + reader.consumed
+                        # Other shards' entries are parsed past but not validated
+                        if self.shard is not None and not self.shard.contains(key):
+                            continue
+                        if seen is not None:
+                            if key in seen:
+                                raise ValidationError(_duplicate_entry_error(key, path))
+                            file_keys.add(key)
+                        is_valid, error_msg = self.validate_entry(key, entry)
+                        if not is_valid:
+                            raise ValidationError(error_msg)
+                        self.metrics.add_stage('load', parsed - started)
+                        self.metrics.add_stage('validate', time.perf_counter() - parsed)
+                        count += 1
+                        yield key, entry
+                    consumed += reader.consumed
+                if seen is not None:
+                    seen |= file_keys
+                    
+            logger.info("Successfully streamed %d datasets from %s", count, self.input_file)
             
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in input file: {str(e)}")
+            logger.error("Invalid JSON in input file: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error loading input file: {str(e)}")
+            logger.error("Error loading input file: %s", e)
             raise
 
-    def process_single_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+    def load_data(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load and validate the JSON data file in one parse with the active JSON backend.
+        
+        Unlike iter_entries this holds the whole document in memory.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Loaded and validated data
+            
+        Raises:
+            ValidationError: If data validation fails or an entry id appears in
+                more than one input file
+            FileNotFoundError: If input file doesn't exist
+            json.JSONDecodeError: If JSON parsing fails
+        """
+        data = {}
+        for path in self._input_files():
+            try:
+                with self.metrics.stage('load'):
+                    with open(path, 'rb') as f:
+                        document = json_backend.loads(f.read())
+            except json.JSONDecodeError as e:
+                logger.error("Invalid JSON in input file: %s", e)
+                raise
+            if self.shard is not None and isinstance(document, dict):
+                document = {key: entry for key, entry in document.items() if self.shard.contains(key)}
+            with self.metrics.stage('validate'):
+                is_valid, error_msg = self.validate_dataset(document)
+            if not is_valid:
+                raise ValidationError(error_msg)
+            if data and data.keys() & document.keys():
+                duplicate = next(key for key in document if key in data)
+                raise ValidationError(_duplicate_entry_error(duplicate, path))
+            data.update(document)
+        logger.info("Successfully loaded %d datasets from %s", len(data), self.input_file)
+        return data
+
+    def _input_files(self) -> List[Path]:
+        """Input files to read, in order."""
+        if self.input_file is None:
+            raise ValidationError("No input file configured")
+        input_files = resolve_input_files(str(self.input_file))
+        for path in input_files:
+            if not path.exists():
+                raise FileNotFoundError(f"Input file not found: {path}")
+        return input_files
+
+    def process_single_entry(self, entry: Dict[str, Any],
+                             precomputed: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Process and validate a single dataset entry.
         
         Args:
             entry (Dict[str, Any]): Single dataset entry
+            precomputed (Optional[Dict[str, Any]]): See process_entry
             
         Returns:
             Dict[str, Any]: Processing results with validation details
         """
-        results = {
-            'original': entry.copy(),
-            'validations': {},
-            'conversions': {},
-            'errors': []
-        }
+        return self.process_entry(entry, precomputed).to_dict()
+
+    def process_entry(self, entry: Dict[str, Any],
+                      precomputed: Optional[Dict[str, Any]] = None) -> EntryResult:
+        """
+        Process and validate a single dataset entry into a compact result.
+        
+        Args:
+            entry (Dict[str, Any]): Single dataset entry
+            precomputed (Optional[Dict[str, Any]]): Conversions already produced by a
+                batch call, keyed by 'hex_to_unknown' / 'unknown_to_hex', plus the
+                entry's 'context' (EntryContext) when one was already built
+            
+        Returns:
+            EntryResult: Validation flags, conversions and errors for the entry
+        """
+        precomputed = precomputed or {}
+        result = EntryResult(entry)
+        result.profile, converter = self._route(entry)
         
         try:
+            # Decode the hex payload once and share it across conversions
+            context = precomputed.get('context') or EntryContext(entry['hex'])
+            
             # Validate hex to ASCII conversion
             try:
-                ascii_result = self.converter.hex_to_ascii(entry['hex'])
-                results['validations']['hex_to_ascii_valid'] = True
-                results['conversions']['hex_to_ascii'] = ascii_result
+                started = time.perf_counter()
+                result.ascii = converter.hex_to_ascii(context)
+                self.metrics.observe('hex_to_ascii', time.perf_counter() - started)
+                result.record(HEX_TO_ASCII, True)
+                if self.index_fields:
+                    # The payload was parsed for validation; pick the fields from that parse
+                    result.fields = extract_fields(context.parsed, self.index_fields)
             except Exception as e:
-                results['validations']['hex_to_ascii_valid'] = False
-                results['errors'].append(f"Hex to ASCII conversion failed: {str(e)}")
+                result.record(HEX_TO_ASCII, False)
+                result.add_error(f"Hex to ASCII conversion failed: {str(e)}")
 
             # Validate hex to unknown conversion
             try:
-                unknown_result = self.converter.hex_to_unknown(entry['hex'])
-                results['validations']['hex_to_unknown_valid'] = True
-                results['conversions']['hex_to_unknown'] = unknown_result
+                if 'hex_to_unknown' in precomputed:
+                    unknown_result = precomputed['hex_to_unknown']
+                else:
+                    started = time.perf_counter()
+                    unknown_result = converter.hex_to_unknown(context)
+                    self.metrics.observe('hex_to_unknown', time.perf_counter() - started)
+                # The converters report bad input by returning None rather than raising
+                if unknown_result is None:
+                    raise ValueError("invalid hex payload")
+                result.set_unknown(unknown_result)
+                result.record(HEX_TO_UNKNOWN, True)
             except Exception as e:
-                results['validations']['hex_to_unknown_valid'] = False
-                results['errors'].append(f"Hex to unknown conversion failed: {str(e)}")
+                result.record(HEX_TO_UNKNOWN, False)
+                result.add_error(f"Hex to unknown conversion failed: {str(e)}")
 
             # Validate unknown to hex conversion
-            if results['validations'].get('hex_to_unknown_valid', False):
+            if result.valid(HEX_TO_UNKNOWN):
                 try:
-                    hex_result = self.converter.unknown_to_hex(entry['unknown'])
-                    results['validations']['unknown_to_hex_valid'] = True
-                    results['conversions']['unknown_to_hex'] = hex_result
+                    if 'unknown_to_hex' in precomputed:
+                        hex_result = precomputed['unknown_to_hex']
+                    else:
+                        started = time.perf_counter()
+                        hex_result = converter.unknown_to_hex(entry['unknown'])
+                        self.metrics.observe('unknown_to_hex', time.perf_counter() - started)
+                    if hex_result is None:
+                        raise ValueError("invalid or unrecognized unknown-format payload")
+                    result.set_hex(hex_result)
+                    result.record(UNKNOWN_TO_HEX, True)
                 except Exception as e:
-                    results['validations']['unknown_to_hex_valid'] = False
-                    results['errors'].append(f"Unknown to hex conversion failed: {str(e)}")
+                    result.record(UNKNOWN_TO_HEX, False)
+                    result.add_error(f"Unknown to hex conversion failed: {str(e)}")
 
-            # Validate conversion pair
-            # results['validations']['conversion_pair_valid'] = (
-            #     self.converter.validate_conversion_pair(entry['unknown'], entry['hex'])
-            # )
+            # Validate conversion pair, reusing the expected encoding computed above
+            started = time.perf_counter()
+            verification = converter.verify_conversion_pair(
+                entry['unknown'], context, result.unknown if result.valid(HEX_TO_UNKNOWN) else None
+            )
+            self.metrics.observe('conversion_pair', time.perf_counter() - started)
+            result.record(CONVERSION_PAIR, verification.valid)
+            if not verification.valid:
+                result.mismatch = verification
 
-            return results
+            return result
             
         except Exception as e:
-            logger.error(f"Error processing entry: {str(e)}")
-            results['errors'].append(f"General processing error: {str(e)}")
-            return results
+            logger.error("Error processing entry: %s", e)
+            result.add_error(f"General processing error: {str(e)}")
+            return result
+
+    def rejected_entry(self, entry: Dict[str, Any], reason: str) -> EntryResult:
+        """
+        Result for an entry rejected by pre-validation: no conversion ran, so no
+        validation is recorded.
+        
+        Args:
+            entry (Dict[str, Any]): Single dataset entry
+            reason (str): Rejection reason code (see prevalidation.REASONS)
+            
+        Returns:
+            EntryResult: Result carrying the reason and a matching error
+        """
+        result = EntryResult(entry)
+        result.profile = self._route(entry)[0]
+        result.rejected = reason
+        result.add_error(f"Rejected before conversion: {REASONS[reason]}")
+        return result
+
+    def process_batch(self, data: Any) -> Tuple[Dict[str, EntryResult], Dict[str, Any]]:
+        """
+        Validate and process an in-memory batch of entries, without writing any output.
+        
+        Args:
+            data (Any): Entries in the input file format ({entry_id: entry})
+            
+        Returns:
+            Tuple of the results by entry id and the batch's summary statistics
+            
+        Raises:
+            ValidationError: If the batch or one of its entries is malformed
+        """
+        is_valid, error_msg = self.validate_dataset(data)
+        if not is_valid:
+            raise ValidationError(error_msg)
+        summary_stats = self._new_summary_stats()
+        results = {}
+        for key, result in self.process_chunk(list(data.items())):
+            self._update_summary_stats(summary_stats, result)
+            results[key] = result
+        return results, summary_stats
 
     def process_all_data(self) -> None:
         """
         Process all datasets and generate detailed results with validation.
         """
         try:
-            data = self.load_data()
-            results = {}
-            summary_stats = {
-                'total_entries': len(data),
-                'successful_conversions': 0,
-                'failed_conversions': 0,
-                'validation_stats': {
-                    'hex_to_ascii_valid': 0,
-                    'hex_to_unknown_valid': 0,
-                    'unknown_to_hex_valid': 0,
-                    # 'conversion_pair_valid': 0
-                }
-            }
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            summary_stats = self._new_summary_stats()
+            self.metrics = RunMetrics()
+            self.progress = self._new_progress()
+            if self.profiling:
+                self.profiler = RunProfiler(self.profile_sample_rate, self.profile_top)
+            self._start_checkpoint(timestamp, summary_stats)
+            self._start_index()
             
-            for idx, (key, entry) in enumerate(data.items(), 1):
-                logger.info(f"Processing dataset {idx}/{len(data)}: {key}")
+            with self._result_writer(timestamp) as writer:
+                entries = self._entries_to_process(summary_stats)
+                for chunk_results in self.iter_result_chunks(entries):
+                    self._write_chunk(writer, chunk_results, summary_stats)
+            
+            self._finish_checkpoint()
+            self._finish_index(summary_stats)
+            self._finish_cache(summary_stats)
+            self.progress.finish(summary_stats['total_entries'])
+            self.save_summary(summary_stats, timestamp, with_metrics=True)
+            
+        except Exception as e:
+            logger.error("Error in batch processing: %s", e)
+            self._abort_run()
+            raise
+
+    async def process_all_data_async(self, queue_size: int = 4) -> None:
+        """
+        Process all datasets as a pipeline of reader, converter and writer stages.
+        
+        Stages are connected by bounded queues, so reading the next chunks and
+        writing finished ones overlap with conversion while backpressure keeps
+        at most ``queue_size`` chunks buffered between any two stages.
+        
+        Args:
+            queue_size (int): Maximum chunks buffered between stages
+            
+        Raises:
+            ValueError: If profiling is enabled (stages overlap, so they cannot be profiled apart)
+        """
+        if self.profiling:
+            raise ValueError("Profiling is not supported for pipelined runs")
+        loop = asyncio.get_running_loop()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        summary_stats = self._new_summary_stats()
+        self.metrics = RunMetrics()
+        self.progress = self._new_progress()
+        read_queue = asyncio.Queue(maxsize=queue_size)
+        write_queue = asyncio.Queue(maxsize=queue_size)
+        
+        async def read_stage(io_executor: Executor) -> None:
+            entries = self._entries_to_process(summary_stats)
+            chunks = iter_chunks(entries, self._task_size())
+            while True:
+                chunk = await loop.run_in_executor(io_executor, next, chunks, None)
+                await read_queue.put(chunk)
+                if chunk is None:
+                    return
+                    
+        async def convert_stage(cpu_executor: Executor, convert) -> None:
+            while True:
+                chunk = await read_queue.get()
+                if chunk is None:
+                    await write_queue.put(None)
+                    return
+                # Queue the pending conversion itself so the writer keeps input order
+                to_convert = self._to_convert(chunk)
+                await write_queue.put((
+                    chunk, loop.run_in_executor(cpu_executor, convert, to_convert) if to_convert else None
+                ))
                 
-                result = self.process_single_entry(entry)
-                results[key] = result
+        async def write_stage(io_executor: Executor, writer: ResultWriter) -> None:
+            while True:
+                queued = await write_queue.get()
+                if queued is None:
+                    return
+                chunk, pending = queued
+                converted = self._absorb_worker_output(await pending, chunk) if pending is not None else []
+                chunk_results = self._merge_reused(chunk, converted)
+                await loop.run_in_executor(
+                    io_executor, self._write_chunk, writer, chunk_results, summary_stats
+                )
                 
-                # Update summary statistics
-                if not result.get('errors'):
-                    summary_stats['successful_conversions'] += 1
-                else:
-                    summary_stats['failed_conversions'] += 1
+        try:
+            self._start_checkpoint(timestamp, summary_stats)
+            self._start_index()
+            with ThreadPoolExecutor(max_workers=2) as io_executor, \
+                    self._conversion_executor() as cpu_executor, \
+                    self._result_writer(timestamp) as writer:
+                convert = _process_chunk_in_worker if self.workers > 1 else self.process_chunk
+                tasks = [
+                    asyncio.create_task(read_stage(io_executor)),
+                    asyncio.create_task(convert_stage(cpu_executor, convert)),
+                    asyncio.create_task(write_stage(io_executor, writer)),
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    raise
                     
-                for validation_key in summary_stats['validation_stats'].keys():
-                    if result['validations'].get(validation_key, False):
-                        summary_stats['validation_stats'][validation_key] += 1
-            
-            self.save_results(results, summary_stats)
+            self._finish_checkpoint()
+            self._finish_index(summary_stats)
+            self._finish_cache(summary_stats)
+            self.progress.finish(summary_stats['total_entries'])
+            self.save_summary(summary_stats, timestamp, with_metrics=True)
             
         except Exception as e:
-            logger.error(f"Error in batch processing: {str(e)}")
+            logger.error("Error in pipelined processing: %s", e)
+            self._abort_run()
             raise
 
+    def process_all_data_pipelined(self, queue_size: int = 4) -> None:
+        """Run process_all_data_async to completion on a fresh event loop."""
+        asyncio.run(self.process_all_data_async(queue_size))
+
+    def _abort_run(self) -> None:
+        """Release run state after a failure, keeping the conversions cached so far."""
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+        if self.field_index is not None:
+            self.field_index.rollback()
+        if self.cache is not None:
+            try:
+                self.cache.flush()
+            except Exception as e:
+                logger.warning("Could not flush the conversion cache: %s", e)
+
+    def close(self) -> None:
+        """Flush and close the conversion cache; the processor cannot convert afterwards."""
+        if self.cache is not None:
+            self.cache.close()
+
+    def _write_chunk(self, writer: ResultWriter, chunk_results: List[Tuple[str, EntryResult]],
+                     summary_stats: Dict[str, Any]) -> None:
+        """Write one chunk of results and fold them into the summary statistics."""
+        with self._write_lock, self.metrics.stage('save'), self._profile_stage('save'):
+            for key, result in chunk_results:
+                self._update_summary_stats(summary_stats, result)
+                logger.debug("Processed dataset %d: %s", summary_stats['total_entries'], key)
+                writer.write(key, result.to_dict(self.compact_output))
+                self._index_result(key, result)
+                fingerprint = self._fingerprints.pop(key, None)
+                if fingerprint is not None:
+                    # The entry is at hand on reuse, so the compact form is enough
+                    self.checkpoint.record(key, fingerprint, result.to_dict(compact=True))
+            writer.flush()
+            if self.checkpoint is not None:
+                self.checkpoint.flush()
+            if self.field_index is not None:
+                self.field_index.flush()
+            self.progress.update(summary_stats['total_entries'])
+
+    def _entries_to_process(self, summary_stats: Dict[str, Any]
+                            ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream the entries of the run.
+        
+        With checkpointing enabled, the stored results of unchanged entries are set
+        aside in ``_reused``; the chunk path skips their conversion and writes them
+        in input order with the rest.
+        """
+        for key, entry in self.iter_entries():
+            if self.checkpoint is None:
+                yield key, entry
+                continue
+                
+            fingerprint = self.checkpoint.fingerprint(entry)
+            stored = self.checkpoint.load_result(key, fingerprint)
+            if stored is None:
+                self._fingerprints[key] = fingerprint
+                yield key, entry
+                continue
+                
+            self._reused[key] = EntryResult.from_dict(entry, stored)
+            with self._write_lock:
+                summary_stats['checkpoint']['reused_entries'] += 1
+            logger.debug("Reusing checkpointed dataset: %s", key)
+            yield key, entry
+
+    def _to_convert(self, chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Entries of a chunk that need conversion, i.e. not reused from the checkpoint."""
+        if not self._reused:
+            return chunk
+        return [item for item in chunk if item[0] not in self._reused]
+
+    def _merge_reused(self, chunk: List[Tuple[str, Dict[str, Any]]],
+                      converted: List[Tuple[str, EntryResult]]) -> List[Tuple[str, EntryResult]]:
+        """Interleave the chunk's reused results with its converted ones, in input order."""
+        if len(converted) == len(chunk):
+            return converted
+        results = iter(converted)
+        return [
+            (key, self._reused.pop(key)) if key in self._reused else next(results)
+            for key, _ in chunk
+        ]
+
+    def _route(self, entry: Dict[str, Any]) -> Tuple[Optional[str], Any]:
+        """Codec profile name (None if not routed) and converter for an entry."""
+        if self.profiles is None:
+            return None, self.converter
+        profile = self.profiles.detect(entry.get('unknown'))
+        if profile is None:
+            return None, self.converter
+        return profile.name, self.converters[profile.name]
+
+    def _cached_results(self, chunk: List[Tuple[str, Dict[str, Any]]], reasons: List[Optional[str]]
+                        ) -> Tuple[List[Optional[str]], List[Optional[EntryResult]]]:
+        """
+        Look up the well-formed entries of a chunk in the conversion cache with one batched query.
+
+        Returns:
+            Tuple[List[Optional[str]], List[Optional[EntryResult]]]: Per-entry cache keys
+            (None for uncacheable entries) and cached results (None on a miss)
+        """
+        if self.cache is None:
+            return [None] * len(chunk), [None] * len(chunk)
+        keys = []
+        for (_, entry), reason in zip(chunk, reasons):
+            hex_str, unknown_str = entry.get('hex'), entry.get('unknown')
+            if reason is not None or not isinstance(hex_str, str) or not isinstance(unknown_str, str):
+                keys.append(None)
+                continue
+            profile_name = self._route(entry)[0]
+            keys.append(self.cache.entry_key(self._cache_params[profile_name], profile_name,
+                                             hex_str, unknown_str))
+        stored = self.cache.get_many([key for key in keys if key is not None])
+        return keys, [
+            EntryResult.from_dict(entry, json_backend.loads(stored[key])) if key in stored else None
+            for (_, entry), key in zip(chunk, keys)
+        ]
+
+    def _store_results(self, chunk_results: List[Tuple[str, EntryResult]], keys: List[Optional[str]],
+                       cached: List[Optional[EntryResult]]) -> None:
+        """Add the freshly converted results of a chunk to the conversion cache."""
+        if self.cache is None:
+            return
+        self.cache.put_many(
+            (cache_key, json_backend.dumps(result.to_dict(compact=True)))
+            for (_, result), cache_key, hit in zip(chunk_results, keys, cached)
+            if cache_key is not None and hit is None
+        )
+
+    def _index_result(self, key: str, result: EntryResult) -> None:
+        """Add an entry's decoded fields to the secondary index, if one is configured."""
+        if self.field_index is None or not result.valid(HEX_TO_ASCII):
+            return
+        fields = result.fields
+        if fields is None:
+            # Results reused from a checkpoint carry only the decoded text
+            fields = extract_fields(json_backend.loads(result.ascii), self.index_fields)
+        self.field_index.add(key, fields)
+
+    def _start_checkpoint(self, timestamp: str, summary_stats: Dict[str, Any]) -> None:
+        """Open this run's checkpoint files and add checkpoint counters to the summary."""
+        if self.checkpoint is None:
+            return
+        self.checkpoint.open_run(timestamp)
+        self._fingerprints = {}
+        self._reused = {}
+        summary_stats['checkpoint'] = {'reused_entries': 0}
+
+    def _finish_checkpoint(self) -> None:
+        """Compact the checkpoint manifest after a completed run."""
+        if self.checkpoint is not None:
+            self.checkpoint.compact()
+
+    def _start_index(self) -> None:
+        """Start rebuilding the secondary index for this run."""
+        if self.field_index is not None:
+            self.field_index.begin(str(self.input_file))
+
+    def _finish_index(self, summary_stats: Dict[str, Any]) -> None:
+        """Publish the rebuilt secondary index."""
+        if self.field_index is None:
+            return
+        self.field_index.commit()
+        summary_stats['index'] = {'path': str(self.field_index.path), 'fields': list(self.index_fields)}
+        logger.info("Indexed fields %s in %s", ', '.join(self.index_fields), self.field_index.path)
+
+    def _task_size(self) -> int:
+        """Entries per unit of conversion work: a NumPy batch in-process, a pool task otherwise."""
+        return self.chunk_size if self.workers > 1 else self.batch_size
+
+    def _conversion_executor(self) -> Executor:
+        """Executor running chunk conversions: a process pool or a single background thread."""
+        if self.workers > 1:
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.worker_config(), json_backend.backend.name, self.index_fields)
+            )
+        return ThreadPoolExecutor(max_workers=1)
+
+    def process_chunk(self, chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, EntryResult]]:
+        """
+        Process a chunk of entries, batching the hex/unknown conversions when possible.
+        
+        With a conversion cache, entries seen before (same payloads and codec
+        parameters) reuse their stored result instead of being converted again.
+        
+        Args:
+            chunk (List[Tuple[str, Dict[str, Any]]]): (entry_id, entry) pairs
+            
+        Returns:
+            List[Tuple[str, EntryResult]]: (entry_id, result) pairs in input order
+        """
+        with self.metrics.stage('convert'), self._profile_stage('process'):
+            if self.prevalidate:
+                reasons = scan_entries(chunk, self.accepted_headers)
+            else:
+                reasons = [None] * len(chunk)
+            cache_keys, cached = self._cached_results(chunk, reasons)
+            accepted = [
+                item for item, reason, hit in zip(chunk, reasons, cached) if reason is None and hit is None
+            ]
+            started = time.perf_counter()
+            if HAS_NUMPY and self.batch_size > 1 and len(accepted) > 1:
+                batch = iter(self._batch_convert(accepted))
+            else:
+                batch = itertools.repeat(None)
+            if self.profiler is None:
+                chunk_results = [
+                    (key, hit if hit is not None
+                     else self.process_entry(entry, next(batch)) if reason is None
+                     else self.rejected_entry(entry, reason))
+                    for (key, entry), reason, hit in zip(chunk, reasons, cached)
+                ]
+            else:
+                chunk_results = self._process_timed(chunk, reasons, cached, batch,
+                                                    time.perf_counter() - started)
+            self._store_results(chunk_results, cache_keys, cached)
+        for _, entry in chunk:
+            hex_str = entry.get('hex')
+            self.metrics.add_entry(len(hex_str) // 2 if isinstance(hex_str, str) else 0)
+        return chunk_results
+
+    def _process_timed(self, chunk: List[Tuple[str, Dict[str, Any]]], reasons: List[Optional[str]],
+                       cached: List[Optional[EntryResult]], batch: Iterator[Optional[Dict[str, Any]]],
+                       batch_seconds: float) -> List[Tuple[str, EntryResult]]:
+        """process_chunk's per-entry loop, timing each entry for the profiler's slowest entries."""
+        # Vectorized batch time is attributed evenly to the converted entries
+        converted = sum(reason is None and hit is None for reason, hit in zip(reasons, cached))
+        batch_share = batch_seconds / max(converted, 1)
+        chunk_results = []
+        for (key, entry), reason, hit in zip(chunk, reasons, cached):
+            if hit is not None:
+                chunk_results.append((key, hit))
+                continue
+            if reason is not None:
+                chunk_results.append((key, self.rejected_entry(entry, reason)))
+                continue
+            started = time.perf_counter()
+            chunk_results.append((key, self.process_entry(entry, next(batch))))
+            hex_str = entry.get('hex')
+            self.profiler.observe_entry(
+                key, len(hex_str) // 2 if isinstance(hex_str, str) else 0,
+                time.perf_counter() - started + batch_share
+            )
+        return chunk_results
+
+    def _profile_stage(self, stage: str):
+        """Profiler context for one call of ``stage``; a no-op unless profiling."""
+        return self.profiler.stage(stage) if self.profiler is not None else nullcontext()
+
+    def iter_result_chunks(self, entries: Iterable[Tuple[str, Dict[str, Any]]]
+                           ) -> Iterator[List[Tuple[str, EntryResult]]]:
+        """
+        Convert entries in chunks, in-line or on a process pool, preserving input order.
+        
+        Args:
+            entries (Iterable[Tuple[str, Dict[str, Any]]]): (entry_id, entry) pairs
+            
+        Yields:
+            List[Tuple[str, EntryResult]]: (entry_id, result) pairs per chunk
+        """
+        if self.workers <= 1:
+            chunks = iter_chunks(entries, self._task_size())
+            if self.profiler is not None:
+                chunks = self.profiler.iter_stage('load', chunks)
+            for chunk in chunks:
+                to_convert = self._to_convert(chunk)
+                yield self._merge_reused(chunk, self.process_chunk(to_convert) if to_convert else [])
+            return
+            
+        # Bound in-flight chunks so a streamed input never piles up in memory
+        max_pending = self.workers * 2
+        pending = deque()
+        with self._conversion_executor() as executor:
+            for chunk in iter_chunks(entries, self._task_size()):
+                to_convert = self._to_convert(chunk)
+                future = executor.submit(_process_chunk_in_worker, to_convert) if to_convert else None
+                pending.append((chunk, future))
+                if len(pending) >= max_pending:
+                    yield self._collect_chunk(*pending.popleft())
+            while pending:
+                yield self._collect_chunk(*pending.popleft())
+
+    def _collect_chunk(self, chunk: List[Tuple[str, Dict[str, Any]]], future
+                       ) -> List[Tuple[str, EntryResult]]:
+        """Results of a chunk submitted to the pool (None when it was all reused)."""
+        converted = self._absorb_worker_output(future.result(), chunk) if future is not None else []
+        return self._merge_reused(chunk, converted)
+
+    def _absorb_worker_output(self, output, chunk: List[Tuple[str, Dict[str, Any]]]
+                              ) -> List[Tuple[str, EntryResult]]:
+        """
+        Unpack a conversion task result, folding worker cache counters and metrics into ours.
+
+        Pool workers return detached results, which get the chunk's entries attached again.
+        """
+        if isinstance(output, tuple):
+            detached, worker_stats = output
+            if self.cache is not None and worker_stats['cache']:
+                self.cache.add_stats(worker_stats['cache'])
+            self.metrics.merge(worker_stats['metrics'])
+            entries = dict(chunk)
+            return [(key, EntryResult.attach(entries[key], state)) for key, state in detached]
+        return output
+
+    def _new_progress(self) -> ProgressReporter:
+        """Create the rate-limited progress reporter for a run."""
+        return ProgressReporter(logger, every=self.progress_every, interval=self.progress_interval)
+
+    def _finish_metrics(self, summary_stats: Dict[str, Any]) -> None:
+        """Add run metrics to the summary and export them if a Prometheus file is configured."""
+        summary_stats['metrics'] = self.metrics.summary()
+        if self.prometheus_file:
+            self.metrics.write_prometheus(self.prometheus_file)
+            logger.info("Metrics written to %s", self.prometheus_file)
+
+    def _finish_profiling(self, summary_stats: Dict[str, Any], timestamp: str) -> None:
+        """Write the stage profiles and add the profile section to the summary."""
+        if self.profiler is None:
+            return
+        summary_stats['profile'] = self.profiler.write(self.output_dir, f"{timestamp}{self.run_tag}")
+        logger.info("Profiles written to %s/profile_%s%s_*", self.output_dir, timestamp, self.run_tag)
+
+    def _finish_cache(self, summary_stats: Dict[str, Any]) -> None:
+        """Persist the conversion cache, apply eviction and report hit/miss counts."""
+        if self.cache is None:
+            return
+        evicted = self.cache.evict()
+        stats = self.cache.take_stats()
+        lookups = stats['hits'] + stats['misses']
+        summary_stats['cache'] = {
+            **stats,
+            'hit_rate': f"{(stats['hits'] / lookups if lookups else 0.0) * 100:.2f}%",
+            'evicted': evicted
+        }
+        logger.info("Cache hits: %d, misses: %d", stats['hits'], stats['misses'])
+
+    def worker_config(self) -> Dict[str, Any]:
+        """Constructor arguments used to rebuild this processor inside a worker process."""
+        return {
+            'input_file': str(self.input_file),
+            'output_dir': str(self.output_dir),
+            'debug': self.debug,
+            'engine': self.engine,
+            'batch_size': self.batch_size,
+            'cache_path': self.cache_path,
+            'profiles_path': self.profiles_path,
+            'prevalidate': self.prevalidate,
+        }
+
+    def _new_summary_stats(self) -> Dict[str, Any]:
+        """Create an empty summary statistics dictionary."""
+        summary_stats = {
+            'total_entries': 0,
+            'successful_conversions': 0,
+            'failed_conversions': 0,
+            'validation_stats': {validation_key: 0 for validation_key in VALIDATIONS},
+            'rejected_entries': 0,
+            'rejection_reasons': {}
+        }
+        if self.profiles is not None:
+            summary_stats['profile_stats'] = {
+                profile.name: {'total_entries': 0, 'successful_conversions': 0, 'conversion_pair_valid': 0}
+                for profile in self.profiles
+            }
+            summary_stats['unmatched_profile_entries'] = 0
+        return summary_stats
+
+    @staticmethod
+    def _update_summary_stats(summary_stats: Dict[str, Any], result: EntryResult) -> None:
+        """Fold a single entry result into the summary statistics."""
+        summary_stats['total_entries'] += 1
+        if not result.errors:
+            summary_stats['successful_conversions'] += 1
+        else:
+            summary_stats['failed_conversions'] += 1
+            
+        validation_stats = summary_stats['validation_stats']
+        for i, validation_key in enumerate(VALIDATIONS):
+            if result.passed & (1 << i):
+                validation_stats[validation_key] += 1
+
+        if result.rejected is not None:
+            reasons = summary_stats['rejection_reasons']
+            summary_stats['rejected_entries'] += 1
+            reasons[result.rejected] = reasons.get(result.rejected, 0) + 1
+
+        profile_stats = summary_stats.get('profile_stats')
+        if profile_stats is not None:
+            if result.profile is None:
+                summary_stats['unmatched_profile_entries'] += 1
+            else:
+                stats = profile_stats[result.profile]
+                stats['total_entries'] += 1
+                stats['successful_conversions'] += not result.errors
+                stats['conversion_pair_valid'] += result.valid(CONVERSION_PAIR)
+
+    def _batch_convert(self, chunk) -> list:
+        """
+        Run the hex/unknown conversions for a chunk of entries in one vectorized call.
+        
+        Args:
+            chunk: Sequence of (entry_id, entry) pairs
+            
+        Returns:
+            list: Per-entry dicts of precomputed conversions for process_single_entry
+        """
+        contexts = [EntryContext(entry['hex']) for _, entry in chunk]
+        unknown_results = [None] * len(chunk)
+        hex_results = [None] * len(chunk)
+        # One vectorized call per codec profile present in the chunk
+        groups: Dict[Optional[str], List[int]] = {}
+        for i, (_, entry) in enumerate(chunk):
+            groups.setdefault(self._route(entry)[0], []).append(i)
+        for name, positions in groups.items():
+            converter = self.converters[name] if name is not None else self.converter
+            started = time.perf_counter()
+            encoded_group = converter.encode_many([contexts[i] for i in positions])
+            encoded = time.perf_counter()
+            decoded_group = converter.decode_many([chunk[i][1]['unknown'] for i in positions])
+            # Batch latency is attributed evenly to the entries of the batch
+            self.metrics.observe('hex_to_unknown', (encoded - started) / len(positions), len(positions))
+            self.metrics.observe(
+                'unknown_to_hex', (time.perf_counter() - encoded) / len(positions), len(positions)
+            )
+            for i, unknown_result, hex_result in zip(positions, encoded_group, decoded_group):
+                unknown_results[i] = unknown_result
+                hex_results[i] = hex_result
+        return [
+            {'context': context, 'hex_to_unknown': unknown_result, 'unknown_to_hex': hex_result}
+            for context, unknown_result, hex_result in zip(contexts, unknown_results, hex_results)
+        ]
+
+    def open_result_writer(self, timestamp: str) -> ResultWriter:
+        """
+        Open the detailed results writer for the configured output format.
+        
+        Args:
+            timestamp (str): Run timestamp used in the output file name
+            
+        Returns:
+            ResultWriter: Writer accepting per-entry results
+        """
+        writer_cls = OUTPUT_FORMATS[self.output_format]
+        path = self.output_dir / f"detailed_results_{timestamp}{self.run_tag}{writer_cls.extension}"
+        return writer_cls(path)
+
+    @contextmanager
+    def _result_writer(self, timestamp: str) -> Iterator[ResultWriter]:
+        """
+        open_result_writer for a run: aborted on failure, and closed under the 'save'
+        stage, since closing is where the JSON writer does all of its writing.
+        """
+        writer = self.open_result_writer(timestamp)
+        try:
+            yield writer
+        except BaseException:
+            writer.abort()
+            raise
+        with self.metrics.stage('save'), self._profile_stage('save'):
+            writer.close()
+
     def save_results(self, results: Dict[str, Any], summary_stats: Dict[str, Any]) -> None:
         """
         Save processing results and summary statistics to output files.
@@ -222,36 +1062,564 @@ class CryptoProcessor:
         
         try:
             # Save detailed results
-            detailed_output = self.output_dir / f"detailed_results_{timestamp}.json"
-            with open(detailed_output, 'w') as f:
-                json.dump(results, f, indent=2)
+            with self._result_writer(timestamp) as writer:
+                for key, result in results.items():
+                    writer.write(key, result)
+            
+        except Exception as e:
+            logger.error("Error saving results: %s", e)
+            raise
+            
+        self.save_summary(summary_stats, timestamp)
+
+    def save_summary(self, summary_stats: Dict[str, Any], timestamp: str,
+                     with_metrics: bool = False) -> Dict[str, Any]:
+        """
+        Save summary statistics next to the detailed results.
+        
+        Args:
+            summary_stats (Dict[str, Any]): Summary statistics
+            timestamp (str): Run timestamp used in the output file name
+            with_metrics (bool): Finish the run metrics and profile once the summary is
+                written, so they include the write, and add them to the summary
             
-            # Save summary with statistics
+        Returns:
+            Dict[str, Any]: The summary as written
+        """
+        try:
+            total = summary_stats['total_entries']
+            success_rate = summary_stats['successful_conversions'] / total if total else 0.0
             summary = {
                 **summary_stats,
                 'timestamp': timestamp,
                 'input_file': str(self.input_file),
-                'success_rate': f"{(summary_stats['successful_conversions'] / summary_stats['total_entries']) * 100:.2f}%"
+                'success_rate': f"{success_rate * 100:.2f}%"
             }
+            if self.shard is not None:
+                summary['shard'] = self.shard.to_dict()
             
-            summary_output = self.output_dir / f"summary_{timestamp}.json"
-            with open(summary_output, 'w') as f:
-                json.dump(summary, f, indent=2)
+            summary_output = self.output_dir / f"summary_{timestamp}{self.run_tag}.json"
+            with self.metrics.stage('save'), self._profile_stage('save'):
+                self._write_summary(summary, summary_output)
+            if with_metrics:
+                # Metrics cannot time the write of the file holding them, so they are
+                # taken last and the summary (a few KB) is written once more with them
+                self._finish_profiling(summary, timestamp)
+                self._finish_metrics(summary)
+                self._write_summary(summary, summary_output)
                 
-            logger.info(f"Results saved to {self.output_dir}")
-            logger.info(f"Success rate: {summary['success_rate']}")
+            logger.info("Results saved to %s", self.output_dir)
+            logger.info("Success rate: %s", summary['success_rate'])
+            return summary
             
         except Exception as e:
-            logger.error(f"Error saving results: {str(e)}")
+            logger.error("Error saving results: %s", e)
             raise
 
-def main():
+    @staticmethod
+    def _write_summary(summary: Dict[str, Any], path: Path) -> None:
+        with open(path, 'w') as f:
+            json_backend.dump(summary, f, indent=True)
+
+def _duplicate_entry_error(key: str, path: Path) -> str:
+    """Error message for an entry id already read from an earlier input file."""
+    return f"Dataset {key} in {path} already appears in an earlier input file"
+
+_worker_processor: Optional[CryptoProcessor] = None
+
+def _init_worker(config: Dict[str, Any], json_backend_name: str, index_fields: Tuple[str, ...]) -> None:
+    """
+    Build the per-process CryptoProcessor used by pool workers, with the parent's JSON backend.
+    
+    Workers extract the fields of the parent's index without opening the index themselves.
+    """
+    global _worker_processor
+    reset_worker_logging()
+    json_backend.select_backend(json_backend_name)
+    _worker_processor = CryptoProcessor(**config)
+    _worker_processor.index_fields = index_fields
+
+def _process_chunk_in_worker(chunk: List[Tuple[str, Dict[str, Any]]]):
+    """
+    Pool task: process one chunk of entries with the worker's processor.
+    
+    Results are detached from their entries, which the parent already holds.
+
+    Returns:
+        Tuple of the (entry_id, detached result) pairs and a dict with the worker's
+        cache counters (None without a cache) and run metrics for this chunk
+    """
+    chunk_results = [(key, result.detach()) for key, result in _worker_processor.process_chunk(chunk)]
+    cache = _worker_processor.cache
+    cache_stats = None
+    if cache is not None:
+        cache.flush()
+        cache_stats = cache.take_stats()
+    return chunk_results, {'cache': cache_stats, 'metrics': _worker_processor.metrics.take()}
+
+def file_command(argv, decode: bool) -> int:
+    """
+    Encode or decode a raw binary file via memory maps.
+    
+    Args:
+        argv: Command arguments after the subcommand name
+        decode (bool): Decode instead of encode
+        
+    Returns:
+        int: Process exit code
+    """
+    action = 'decode' if decode else 'encode'
+    parser = argparse.ArgumentParser(
+        prog=f'python -m src.main {action}-file',
+        description=f'{action.capitalize()} a raw binary file without hex expansion',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('input_file', help='Path to raw input file')
+    parser.add_argument('output_file', help='Path to output file')
+    parser.add_argument(
+        '--engine',
+        choices=CryptoConverter.ENGINES,
+        default='table',
+        help='Codec engine for the transform'
+    )
+    parser.add_argument(
+        '--no-header',
+        action='store_true',
+        help='Do not write (encode) or expect (decode) the binary header'
+    )
+    parser.add_argument(
+        '--block-size',
+        type=int,
+        default=1 << 20,
+        help='Input bytes processed per step'
+    )
+    _add_log_file_options(parser)
+    args = parser.parse_args(argv)
+    
+    with configure_logging(log_files=_log_files(args)):
+        try:
+            written = transform_file(
+                args.input_file, args.output_file, decode=decode,
+                converter=CryptoConverter(engine=args.engine),
+                header=not args.no_header, block_size=args.block_size
+            )
+            logger.info("Wrote %d bytes to %s", written, args.output_file)
+            return 0
+        except Exception as e:
+            logger.error("File %s failed: %s", action, e)
+            return 1
+
+def serve_command(argv) -> int:
+    """
+    Keep a warmed-up processor resident and serve conversion requests until interrupted.
+    
+    Args:
+        argv: Command arguments after the subcommand name
+        
+    Returns:
+        int: Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m src.main serve',
+        description='Serve batch conversion requests as JSON over localhost HTTP or a Unix socket '
+                    '(client: python -m src.client)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port to listen on')
+    parser.add_argument('--socket', help='Listen on this Unix socket instead of TCP')
+    parser.add_argument(
+        '--output-dir',
+        default='output',
+        help='Directory for processor output files'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=CryptoConverter.ENGINES,
+        default='table',
+        help='Codec engine for conversions'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1024,
+        help='Entries per vectorized NumPy batch (0 disables batching)'
+    )
+    parser.add_argument(
+        '--cache',
+        help='SQLite file for a persistent conversion cache shared with batch runs'
+    )
+    parser.add_argument('--debug', action='store_true', help='Enable verbose logging')
+    _add_log_file_options(parser)
+    args = parser.parse_args(argv)
+    
+    with configure_logging(level=logging.DEBUG if args.debug else logging.INFO, log_files=_log_files(args)):
+        try:
+            processor = CryptoProcessor(
+                None, args.output_dir, debug=args.debug, engine=args.engine,
+                batch_size=args.batch_size, cache_path=args.cache
+            )
+            server = make_server(processor, args.host, args.port, socket_path=args.socket)
+        except Exception as e:
+            logger.error("Server startup failed: %s", e)
+            return 1
+            
+        logger.info("Serving on %s", args.socket or f"http://{args.host}:{server.server_address[1]}")
+        # shutdown() blocks until serve_forever returns, so it cannot run in the handler itself
+        signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            logger.info("Shutting down")
+            server.server_close()
+            processor.close()
+        return 0
+
+def lookup_command(argv) -> int:
+    """
+    Print stored results for entries of a binary result store.
+    
+    Args:
+        argv: Command arguments after the subcommand name
+        
+    Returns:
+        int: Process exit code (1 if any entry is missing)
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m src.main lookup',
+        description='Fetch single entries from a detailed_results_*.rbin file without reading the rest'
+    )
+    parser.add_argument('results_file', help='Binary result store (--output-format binary)')
+    parser.add_argument('entry_ids', nargs='*', help='Entries to print')
+    parser.add_argument('--list', action='store_true', help='List the stored entry ids')
+    args = parser.parse_args(argv)
+    
+    try:
+        reader = BinaryResultReader(args.results_file)
+    except (OSError, ValueError) as e:
+        print(f"Cannot open results: {e}", file=sys.stderr)
+        return 1
+        
+    status = 0
+    with reader:
+        if args.list:
+            for key in reader.keys():
+                print(key)
+        found = {}
+        for key in args.entry_ids:
+            result = reader.get(key)
+            if result is None:
+                print(f"Entry not found: {key}", file=sys.stderr)
+                status = 1
+            else:
+                found[key] = result
+        if args.entry_ids:
+            json.dump(found, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+    return status
+
+def query_command(argv) -> int:
+    """
+    Print the ids of entries whose indexed fields match all conditions.
+    
+    Args:
+        argv: Command arguments after the subcommand name
+        
+    Returns:
+        int: Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m src.main query',
+        description='Look up entries by decoded payload fields in an index built with --index'
+    )
+    parser.add_argument('index_file', help='Index file written by a run with --index')
+    parser.add_argument(
+        'conditions', nargs='+',
+        help="Conditions like 'expireTime<1735637240851' or 'hash=abc' (=, !=, <, <=, >, >=), all must match"
+    )
+    parser.add_argument('--count', action='store_true', help='Print only the number of matches')
+    args = parser.parse_args(argv)
+    
+    if not Path(args.index_file).exists():
+        print(f"Index not found: {args.index_file}", file=sys.stderr)
+        return 1
+    try:
+        conditions = [parse_condition(text) for text in args.conditions]
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+        
+    index = FieldIndex(args.index_file)
+    try:
+        entry_ids = index.query(conditions)
+    finally:
+        index.close()
+    if args.count:
+        print(len(entry_ids))
+    else:
+        for entry_id in entry_ids:
+            print(entry_id)
+    return 0
+
+def scan_command(argv) -> int:
+    """
+    Report the entries pre-validation would reject, without converting anything.
+    
+    Args:
+        argv: Command arguments after the subcommand name
+        
+    Returns:
+        int: Process exit code (1 if any entry would be rejected)
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m src.main scan',
+        description='Check hex alphabet, lengths and headers of every entry before a full run'
+    )
+    parser.add_argument('input_file', help='Input JSON file, or a directory or quoted glob of them')
+    parser.add_argument(
+        '--profiles',
+        help='Codec profile file whose headers are accepted (default: the built-in header)'
+    )
+    parser.add_argument(
+        '--limit', type=int, default=100, help='List at most this many rejected entry ids (default 100)'
+    )
+    args = parser.parse_args(argv)
+    
+    def entries():
+        for path in resolve_input_files(args.input_file):
+            with open(path, 'r') as f:
+                yield from ((key, entry) for key, entry in iter_json_object(f) if isinstance(entry, dict))
+                
+    try:
+        headers = (
+            {profile.header for profile in ProfileRegistry.load(args.profiles)} if args.profiles
+            else {CryptoConverter().HEADER}
+        )
+        report = scan_report(entries(), headers, limit=args.limit)
+    except (OSError, ValueError) as e:
+        print(f"Scan failed: {e}", file=sys.stderr)
+        return 1
+        
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    return 1 if report['rejected_entries'] else 0
+
+def infer_command(argv) -> int:
+    """
+    Infer the codec profile of an input file from its known (hex, unknown) pairs.
+    
+    Args:
+        argv: Command arguments after the subcommand name
+        
+    Returns:
+        int: Process exit code (1 if the confidence is below the threshold)
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m src.main infer',
+        description='Recover header, XOR key and offset modulus from entries with known hex and unknown values'
+    )
+    parser.add_argument('input_file', help='Input JSON file in the usual entry format')
+    parser.add_argument('--name', default='inferred', help='Name of the inferred profile')
+    parser.add_argument('--max-pairs', type=int, help='Only use the first N entries')
+    parser.add_argument(
+        '--output',
+        help='Write the profile to this file (loadable with --profiles); existing profiles are kept'
+    )
+    parser.add_argument(
+        '--min-confidence',
+        type=float,
+        default=0.99,
+        help='Fraction of unknown bytes the profile must reproduce before it is written (default 0.99)'
+    )
+    args = parser.parse_args(argv)
+    
+    try:
+        with open(args.input_file, 'r') as f:
+            entries = iter_json_object(f)
+            if args.max_pairs is not None:
+                entries = itertools.islice(entries, args.max_pairs)
+            result = infer_profile(
+                ((entry.get('hex'), entry.get('unknown')) for _, entry in entries if isinstance(entry, dict)),
+                name=args.name
+            )
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Inference failed: {e}", file=sys.stderr)
+        return 1
+        
+    json.dump(result.to_dict(), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    if result.confidence < args.min_confidence:
+        print(f"Confidence {result.confidence:.4f} is below {args.min_confidence}", file=sys.stderr)
+        return 1
+    if args.output:
+        try:
+            if Path(args.output).exists():
+                registry = ProfileRegistry.load(args.output, include_default=False)
+                registry.register(result.profile)
+            else:
+                registry = ProfileRegistry([result.profile])
+        except ValueError as e:
+            print(f"Cannot add profile to {args.output}: {e}", file=sys.stderr)
+            return 1
+        registry.save(args.output)
+    return 0
+
+def merge_command(argv) -> int:
+    """
+    Combine the detailed results and summaries of sharded runs.
+    
+    Args:
+        argv: Command arguments after the subcommand name
+        
+    Returns:
+        int: Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m src.main merge',
+        description='Merge the outputs of --shard i/N runs into one detailed results file and summary'
+    )
+    parser.add_argument(
+        'inputs', nargs='+',
+        help='Shard output directories (every summary_*.json in them) or summary files'
+    )
+    parser.add_argument('--output-dir', default='output', help='Directory for the merged files')
+    parser.add_argument(
+        '--output-format',
+        choices=list(OUTPUT_FORMATS),
+        default='json',
+        help='Format of the merged detailed results'
+    )
+    parser.add_argument('--summary-only', action='store_true', help='Only merge the summaries')
+    parser.add_argument(
+        '--index',
+        help='Combine the field indexes of runs with --index into this SQLite file'
+    )
+    parser.add_argument(
+        '--allow-missing',
+        action='store_true',
+        help='Merge even if some shards of the run have no summary'
+    )
+    _add_log_file_options(parser)
+    args = parser.parse_args(argv)
+    
+    with configure_logging(log_files=_log_files(args)):
+        try:
+            runs = find_run_outputs(args.inputs)
+            if not runs:
+                raise ValueError("No summary files found")
+            summaries = []
+            for summary_path, detailed_path in runs:
+                if detailed_path is None and not args.summary_only:
+                    raise ValueError(f"No detailed results next to {summary_path}")
+                with open(summary_path, 'r') as f:
+                    summaries.append(json_backend.loads(f.read()))
+            merged = merge_summaries(summaries)
+            missing = merged.get('shards', {}).get('missing')
+            if missing and not args.allow_missing:
+                raise ValueError(f"Shards {missing} have no summary (use --allow-missing to merge anyway)")
+                
+            output_dir = Path(args.output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            merged['timestamp'] = timestamp
+            merged['merged_from'] = [str(summary_path) for summary_path, _ in runs]
+            if not args.summary_only:
+                writer_cls = OUTPUT_FORMATS[args.output_format]
+                with writer_cls(output_dir / f"detailed_results_{timestamp}{writer_cls.extension}") as writer:
+                    for _, detailed_path in runs:
+                        for key, result in iter_result_file(detailed_path):
+                            writer.write(key, result)
+                logger.info("Merged %d results from %d runs", writer.count, len(runs))
+            if args.index:
+                merged['index'] = _merge_indexes(args.index, runs, summaries, merged['input_file'])
+            with open(output_dir / f"summary_{timestamp}.json", 'w') as f:
+                json_backend.dump(merged, f, indent=True)
+            logger.info("Merged summary saved to %s (success rate %s)", output_dir, merged['success_rate'])
+            return 0
+        except Exception as e:
+            logger.error("Merge failed: %s", e)
+            return 1
+
+def _merge_indexes(index_path: str, runs: List[Tuple[Path, Optional[Path]]],
+                   summaries: List[Dict[str, Any]], input_file: Any) -> Dict[str, Any]:
+    """
+    Rebuild ``index_path`` from the field indexes of merged runs.
+
+    An index path recorded in a summary that does not exist here (e.g. a run on
+    another host) is looked up next to the summary instead.
+
+    Returns:
+        Dict[str, Any]: The merged summary's ``index`` section
+
+    Raises:
+        ValueError: If a run has no index or the runs index different fields
+    """
+    sources = []
+    for (summary_path, _), summary in zip(runs, summaries):
+        if 'index' not in summary:
+            raise ValueError(f"{summary_path} comes from a run without --index")
+        source = Path(summary['index']['path'])
+        if not source.exists():
+            source = summary_path.parent / source.name
+        sources.append(source)
+    fields = {tuple(summary['index']['fields']) for summary in summaries}
+    if len(fields) > 1:
+        raise ValueError(f"Runs index different fields: {sorted(list(f) for f in fields)}")
+    index = FieldIndex(index_path, fields.pop())
+    try:
+        index.begin(input_file if isinstance(input_file, str) else json_backend.dumps(input_file))
+        rows = sum(index.absorb(str(source)) for source in sources)
+        index.commit()
+    except Exception:
+        index.rollback()
+        raise
+    finally:
+        index.close()
+    logger.info("Merged %d index rows from %d runs into %s", rows, len(sources), index_path)
+    return {'path': str(index.path), 'fields': list(index.fields)}
+
+COMMANDS = {
+    'encode-file': lambda argv: file_command(argv, decode=False),
+    'decode-file': lambda argv: file_command(argv, decode=True),
+    'serve': serve_command,
+    'lookup': lookup_command,
+    'query': query_command,
+    'scan': scan_command,
+    'infer': infer_command,
+    'merge': merge_command,
+}
+
+def _add_log_file_options(parser: argparse.ArgumentParser) -> None:
+    """Add --log-file / --no-log-file to a command that configures logging."""
+    parser.add_argument('--log-file', default=DEFAULT_LOG_FILE, help='File to append log lines to')
+    parser.add_argument('--no-log-file', dest='log_file', action='store_const', const=None,
+                        default=argparse.SUPPRESS, help='Log to stdout only')
+
+def _log_files(args) -> List[str]:
+    """Log files selected by _add_log_file_options."""
+    return [args.log_file] if args.log_file else []
+
+def _shard_arg(text: str) -> Shard:
+    """argparse type for --shard."""
+    try:
+        return Shard.parse(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def main(argv=None):
     """Main entry point with enhanced argument parsing and error handling."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+        
     parser = argparse.ArgumentParser(
+        epilog=f"Subcommands: {', '.join(COMMANDS)} (run '<subcommand> --help' for details)",
         description='Cryptographic Conversion Tool',
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
-    parser.add_argument('input_file', help='Path to input JSON file')
+    parser.add_argument('input_file', help='Path to input JSON file, or a directory or quoted glob of them')
     parser.add_argument(
         '--output-dir', 
         default='output',
@@ -262,31 +1630,181 @@ def main():
         action='store_true',
         help='Enable debug mode with verbose logging'
     )
+    _add_log_file_options(parser)
+    parser.add_argument(
+        '--engine',
+        choices=CryptoConverter.ENGINES,
+        default='table',
+        help='Codec engine for hex/unknown conversions'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1024,
+        help='Entries per vectorized NumPy batch (0 disables batching)'
+    )
+    parser.add_argument(
+        '--output-format',
+        choices=sorted(OUTPUT_FORMATS),
+        default='json',
+        help='Detailed results format; ndjson streams one line per entry, binary adds an index for random access'
+    )
     parser.add_argument(
-        '--log-file',
-        help='Path to log file (optional)'
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes for entry conversion'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=256,
+        help='Entries sent to a worker process per task'
+    )
+    parser.add_argument(
+        '--cache',
+        help='SQLite file for a persistent conversion cache reused across runs'
+    )
+    parser.add_argument(
+        '--cache-max-mb',
+        type=float,
+        help='Evict least-recently-used cache entries beyond this size'
+    )
+    parser.add_argument(
+        '--cache-max-age-days',
+        type=float,
+        help='Evict cache entries not used for this many days'
+    )
+    parser.add_argument(
+        '--resume', '--incremental',
+        dest='resume',
+        action='store_true',
+        help='Checkpoint results in the output directory and only process new or changed entries'
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Overlap reading, conversion and writing with an asyncio pipeline'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=4,
+        help='Chunks buffered between pipeline stages'
+    )
+    parser.add_argument(
+        '--prometheus-file',
+        help='Write run metrics to this file in Prometheus text exposition format'
+    )
+    parser.add_argument(
+        '--progress-every',
+        type=int,
+        default=10000,
+        help='Log progress every this many datasets (0 disables)'
+    )
+    parser.add_argument(
+        '--progress-interval',
+        type=float,
+        default=10.0,
+        help='Log progress at least this often, in seconds (0 disables)'
+    )
+    parser.add_argument(
+        '--index',
+        help='SQLite file for a secondary index over decoded payload fields (see the query subcommand)'
+    )
+    parser.add_argument(
+        '--index-fields',
+        help=f"Comma-separated decoded payload fields to index with --index; unset means {','.join(DEFAULT_FIELDS)}"
+    )
+    parser.add_argument(
+        '--shard',
+        type=_shard_arg,
+        help='Only process the i-th of N hash partitions of the entry ids, e.g. 0/4 (see the merge subcommand)'
+    )
+    parser.add_argument(
+        '--json-backend',
+        choices=['auto'] + list(json_backend.BACKENDS),
+        default='auto',
+        help='JSON parser/serializer: the fastest installed one (auto), the stdlib or orjson'
+    )
+    parser.add_argument(
+        '--profiles',
+        help='JSON file of codec profiles; entries are routed by their unknown-format header'
+    )
+    parser.add_argument(
+        '--no-prevalidate',
+        dest='prevalidate',
+        action='store_false',
+        help='Convert every entry instead of rejecting structurally malformed ones up front'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Write cProfile .pstats files and tracemalloc reports per stage to --output-dir and '
+             'record the slowest entries in the summary (in-process runs only)'
+    )
+    parser.add_argument(
+        '--profile-sample-rate',
+        type=float,
+        default=1.0,
+        help='Fraction of chunks profiled per stage; lower it to keep overhead small on large runs'
+    )
+    parser.add_argument(
+        '--profile-top',
+        type=int,
+        default=20,
+        help='Number of slowest entries recorded by --profile'
+    )
+    parser.add_argument(
+        '--compact-output',
+        action='store_true',
+        help='Omit the original entry and round-trip strings that reproduce it from detailed results'
+    )
+    parser.add_argument(
+        '--sync-logging',
+        action='store_true',
+        help='Write log records in the calling thread instead of a background listener'
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.profile and (args.pipeline or args.workers > 1):
+        parser.error("--profile needs an in-process run (no --pipeline, --workers 1)")
     
-    if args.debug:
-        logger.setLevel(logging.DEBUG)
-        
-    if args.log_file:
-        file_handler = logging.FileHandler(args.log_file)
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        ))
-        logger.addHandler(file_handler)
+    with configure_logging(level=logging.DEBUG if args.debug else logging.INFO,
+                           log_files=_log_files(args), use_queue=not args.sync_logging):
+        return _run(args)
 
+def _run(args) -> int:
+    """Run the processor for parsed main() arguments."""
+    processor = None
     try:
-        processor = CryptoProcessor(args.input_file, args.output_dir, debug=args.debug)
-        processor.process_all_data()
+        json_backend.select_backend(args.json_backend)
+        processor = CryptoProcessor(
+            args.input_file, args.output_dir, debug=args.debug, engine=args.engine,
+            batch_size=args.batch_size, output_format=args.output_format,
+            workers=args.workers, chunk_size=args.chunk_size, cache_path=args.cache,
+            cache_max_bytes=int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb is not None else None,
+            cache_max_age=args.cache_max_age_days * 86400 if args.cache_max_age_days is not None else None,
+            resume=args.resume, prometheus_file=args.prometheus_file,
+            progress_every=args.progress_every, progress_interval=args.progress_interval,
+            compact_output=args.compact_output, index_path=args.index,
+            index_fields=[field for field in args.index_fields.split(',') if field] if args.index_fields else None,
+            profiles_path=args.profiles, shard=args.shard,
+            prevalidate=args.prevalidate, profiling=args.profile,
+            profile_sample_rate=args.profile_sample_rate, profile_top=args.profile_top
+        )
+        if args.pipeline:
+            processor.process_all_data_pipelined(args.queue_size)
+        else:
+            processor.process_all_data()
         logger.info("Processing completed successfully")
         return 0
     except Exception as e:
-        logger.error(f"Processing failed: {str(e)}")
+        logger.error("Processing failed: %s", e)
         return 1
+    finally:
+        if processor is not None:
+            processor.close()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,210 @@
+# src/metrics.py
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+# Log-scale latency buckets: 4 per power of two from ~1µs to ~137s
+_BUCKET_BOUNDS: List[float] = [2 ** (exponent / 4) for exponent in range(-80, 29)]
+# Prometheus export uses every 4th bound (powers of two), which keeps counts exact
+_PROMETHEUS_BOUNDS = _BUCKET_BOUNDS[::4]
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with bounded memory and approximate percentiles.
+    
+    Percentiles are reported as the upper bound of the bucket holding the rank,
+    which overestimates by at most ~19% (one quarter power of two).
+    """
+    
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float, count: int = 1) -> None:
+        """Record ``count`` observations of ``seconds`` each."""
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += count
+        self.count += count
+        self.total += seconds * count
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Fold another histogram's observations into this one."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, fraction: float) -> float:
+        """Approximate latency below which ``fraction`` of observations fall."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(_BUCKET_BOUNDS[index], self.max) if index < len(_BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def cumulative(self, bounds: List[float]) -> List[int]:
+        """Observation counts at or below each bound (bounds must be bucket bounds)."""
+        counts = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            while index < len(_BUCKET_BOUNDS) and _BUCKET_BOUNDS[index] <= bound:
+                seen += self.counts[index]
+                index += 1
+            counts.append(seen)
+        return counts
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': self.max
+        }
+
+class RunMetrics:
+    """
+    Stage wall times, per-conversion latency histograms and byte counts for a run.
+    
+    Stage times are cumulative busy time; in pipelined or multi-process runs the
+    stages overlap, so they can add up to more than the total wall time.
+    Recording is thread-safe so pipeline stages can share one instance.
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.latencies: Dict[str, LatencyHistogram] = {}
+        self.bytes_processed = 0
+        self.entries = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Context manager adding the enclosed wall time to ``stage``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(stage, time.perf_counter() - start)
+
+    def observe(self, conversion: str, seconds: float, count: int = 1) -> None:
+        """Record the latency of one (or ``count`` amortized) conversions."""
+        with self._lock:
+            histogram = self.latencies.get(conversion)
+            if histogram is None:
+                histogram = self.latencies[conversion] = LatencyHistogram()
+            histogram.add(seconds, count)
+
+    def add_entry(self, payload_bytes: int) -> None:
+        """Count one converted entry and its payload size."""
+        with self._lock:
+            self.entries += 1
+            self.bytes_processed += payload_bytes
+
+    def take(self) -> 'RunMetrics':
+        """Return the observations so far and start over (used to ship worker metrics)."""
+        taken = RunMetrics()
+        with self._lock:
+            taken.stages, self.stages = self.stages, {}
+            taken.latencies, self.latencies = self.latencies, {}
+            taken.bytes_processed, self.bytes_processed = self.bytes_processed, 0
+            taken.entries, self.entries = self.entries, 0
+        return taken
+
+    def merge(self, other: 'RunMetrics') -> None:
+        """Fold observations collected elsewhere (e.g. in a worker) into this run."""
+        with self._lock:
+            for stage, seconds in other.stages.items():
+                self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+            for conversion, histogram in other.latencies.items():
+                if conversion in self.latencies:
+                    self.latencies[conversion].merge(histogram)
+                else:
+                    self.latencies[conversion] = histogram
+            self.bytes_processed += other.bytes_processed
+            self.entries += other.entries
+
+    def summary(self) -> Dict[str, Any]:
+        """Metrics section for the run summary."""
+        wall = time.perf_counter() - self.started
+        return {
+            'wall_seconds': wall,
+            'stage_seconds': dict(self.stages),
+            'latency_seconds': {name: h.summary() for name, h in sorted(self.latencies.items())},
+            'bytes_processed': self.bytes_processed,
+            'throughput_mb_s': self.bytes_processed / 1e6 / wall if wall else 0.0,
+            'entries_per_s': self.entries / wall if wall else 0.0
+        }
+
+    def write_prometheus(self, path: str, prefix: str = 'crypto_processor') -> None:
+        """
+        Write the metrics in Prometheus text exposition format.
+        
+        The file is replaced atomically so a node exporter textfile collector
+        never reads a partial file.
+        """
+        summary = self.summary()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Cumulative wall time spent per processing stage.",
+            f"# TYPE {prefix}_stage_seconds gauge",
+        ]
+        for stage, seconds in sorted(self.stages.items()):
+            lines.append(f'{prefix}_stage_seconds{{stage="{stage}"}} {seconds:.6f}')
+        lines += [
+            f"# HELP {prefix}_conversion_latency_seconds Per-entry conversion latency.",
+            f"# TYPE {prefix}_conversion_latency_seconds histogram",
+        ]
+        for conversion, histogram in sorted(self.latencies.items()):
+            label = f'conversion="{conversion}"'
+            for bound, count in zip(_PROMETHEUS_BOUNDS, histogram.cumulative(_PROMETHEUS_BOUNDS)):
+                lines.append(f'{prefix}_conversion_latency_seconds_bucket{{{label},le="{bound:.9g}"}} {count}')
+            lines.append(f'{prefix}_conversion_latency_seconds_bucket{{{label},le="+Inf"}} {histogram.count}')
+            lines.append(f'{prefix}_conversion_latency_seconds_sum{{{label}}} {histogram.total:.9f}')
+            lines.append(f'{prefix}_conversion_latency_seconds_count{{{label}}} {histogram.count}')
+        lines += [
+            f"# HELP {prefix}_bytes_processed Payload bytes processed in the last run.",
+            f"# TYPE {prefix}_bytes_processed gauge",
+            f"{prefix}_bytes_processed {self.bytes_processed}",
+            f"# HELP {prefix}_entries_processed Entries processed in the last run.",
+            f"# TYPE {prefix}_entries_processed gauge",
+            f"{prefix}_entries_processed {self.entries}",
+            f"# HELP {prefix}_throughput_bytes_per_second Payload throughput of the last run.",
+            f"# TYPE {prefix}_throughput_bytes_per_second gauge",
+            f"{prefix}_throughput_bytes_per_second {summary['throughput_mb_s'] * 1e6:.3f}",
+            f"# HELP {prefix}_wall_seconds Wall time of the last run.",
+            f"# TYPE {prefix}_wall_seconds gauge",
+            f"{prefix}_wall_seconds {summary['wall_seconds']:.6f}",
+        ]
+        
+        target = Path(path)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, target)
@@ -0,0 +1,263 @@
+# src/output.py
+
+import hashlib
+import mmap
+from abc import ABC, abstractmethod
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple, Type
+
+from . import json_backend
+
+class ResultWriter(ABC):
+    """
+    Base class for writers that persist per-entry processing results.
+    """
+    
+    extension = ''
+    
+    def __init__(self, path: Path):
+        """
+        Args:
+            path (Path): Destination file
+        """
+        self.path = Path(path)
+        self.count = 0
+
+    @abstractmethod
+    def write(self, key: str, result: Dict[str, Any]) -> None:
+        """Persist the result for a single entry."""
+
+    def flush(self) -> None:
+        """Push buffered results to disk."""
+
+    def close(self) -> None:
+        """Finish writing and release the destination file."""
+
+    def abort(self) -> None:
+        """Stop writing after a failure, keeping whatever was already persisted."""
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class JsonResultWriter(ResultWriter):
+    """
+    Collect every result and write them as one indented JSON object on close.
+    """
+    
+    extension = '.json'
+    
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._results = {}
+
+    def write(self, key: str, result: Dict[str, Any]) -> None:
+        self._results[key] = result
+        self.count += 1
+
+    def close(self) -> None:
+        with open(self.path, 'w') as f:
+            json_backend.dump(self._results, f, indent=True)
+        self._results = {}
+
+    def abort(self) -> None:
+        # Nothing is on disk yet; a partial JSON document would only mislead
+        self._results = {}
+
+class NdjsonResultWriter(ResultWriter):
+    """
+    Append one compact JSON line per entry as soon as it is written.
+    
+    Memory stays flat regardless of the number of entries, and every flushed
+    line survives if the run is interrupted.
+    """
+    
+    extension = '.ndjson'
+    
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._file = open(self.path, 'w')
+
+    def write(self, key: str, result: Dict[str, Any]) -> None:
+        self._file.write(json_backend.dumps({'entry_id': key, **result}))
+        self._file.write('\n')
+        self.count += 1
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+# Binary result store layout (little-endian):
+#   magic | records | index | footer
+#   record: key length (u32), value length (u32), UTF-8 entry id, compact JSON result
+#   index:  open-addressing hash table of (key hash u64, record offset u64) slots;
+#           offset 0 marks an empty slot (records start after the magic)
+#   footer: index offset (u64), slot count (u64), record count (u64), magic
+BINARY_MAGIC = b'CRSTORE1'
+_RECORD_HEADER = struct.Struct('<II')
+_SLOT = struct.Struct('<QQ')
+_FOOTER = struct.Struct('<QQQ8s')
+
+def _key_hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+class BinaryResultWriter(ResultWriter):
+    """
+    Append length-prefixed records and finish with an entry-id hash index.
+    
+    Results are streamed to disk as they are written; only the hash and offset
+    of each record (16 bytes) are held until close, when the index is appended.
+    BinaryResultReader then fetches any entry with a single probe sequence.
+    """
+    
+    extension = '.rbin'
+    
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._file = open(self.path, 'wb')
+        self._file.write(BINARY_MAGIC)
+        self._offset = len(BINARY_MAGIC)
+        self._hashes = array('Q')
+        self._offsets = array('Q')
+
+    def write(self, key: str, result: Dict[str, Any]) -> None:
+        key_bytes = key.encode('utf-8')
+        value = json_backend.dumpb(result)
+        self._file.write(_RECORD_HEADER.pack(len(key_bytes), len(value)))
+        self._file.write(key_bytes)
+        self._file.write(value)
+        self._hashes.append(_key_hash(key_bytes))
+        self._offsets.append(self._offset)
+        self._offset += _RECORD_HEADER.size + len(key_bytes) + len(value)
+        self.count += 1
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        # At most half full, so probe sequences stay short
+        slots = 1
+        while slots < 2 * len(self._offsets):
+            slots *= 2
+        mask = slots - 1
+        table = bytearray(slots * _SLOT.size)
+        for key_hash, offset in zip(self._hashes, self._offsets):
+            slot = key_hash & mask
+            while _SLOT.unpack_from(table, slot * _SLOT.size)[1]:
+                slot = (slot + 1) & mask
+            _SLOT.pack_into(table, slot * _SLOT.size, key_hash, offset)
+        self._file.write(table)
+        self._file.write(_FOOTER.pack(self._offset, slots, len(self._offsets), BINARY_MAGIC))
+        self._file.close()
+        self._hashes = array('Q')
+        self._offsets = array('Q')
+
+    def abort(self) -> None:
+        # Without index and footer, readers reject the file as incomplete
+        if not self._file.closed:
+            self._file.close()
+        self._hashes = array('Q')
+        self._offsets = array('Q')
+
+class BinaryResultReader:
+    """
+    Random-access reader for files written by BinaryResultWriter.
+    
+    The file is memory-mapped; ``get`` hashes the entry id, probes the index
+    and decodes only the matching record, independent of the file size.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Args:
+            path (Path): Binary result store
+            
+        Raises:
+            ValueError: If the file is not a complete binary result store
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._mm)
+        if self._mm[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a binary result store: {self.path}")
+        if size < len(BINARY_MAGIC) + _FOOTER.size or self._mm[size - len(BINARY_MAGIC):] != BINARY_MAGIC:
+            self._mm.close()
+            raise ValueError(f"Binary result store has no index (incomplete write?): {self.path}")
+        self._index, self._slots, self.count, _ = _FOOTER.unpack_from(self._mm, size - _FOOTER.size)
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        """Return the stored JSON bytes for an entry, or None if it is absent."""
+        key_bytes = key.encode('utf-8')
+        key_hash = _key_hash(key_bytes)
+        mask = self._slots - 1
+        slot = key_hash & mask
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(self._mm, self._index + slot * _SLOT.size)
+            if not offset:
+                return None
+            if slot_hash == key_hash:
+                key_length, value_length = _RECORD_HEADER.unpack_from(self._mm, offset)
+                start = offset + _RECORD_HEADER.size
+                if self._mm[start:start + key_length] == key_bytes:
+                    return self._mm[start + key_length:start + key_length + value_length]
+            slot = (slot + 1) & mask
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the result for an entry, or None if it is absent."""
+        raw = self.get_raw(key)
+        return json_backend.loads(raw) if raw is not None else None
+
+    def __contains__(self, key: str) -> bool:
+        return self.get_raw(key) is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _records(self) -> Iterator[Tuple[str, int, int]]:
+        """Walk the record headers: (entry_id, value start, value end) in write order."""
+        offset = len(BINARY_MAGIC)
+        while offset < self._index:
+            key_length, value_length = _RECORD_HEADER.unpack_from(self._mm, offset)
+            start = offset + _RECORD_HEADER.size
+            offset = start + key_length + value_length
+            yield self._mm[start:start + key_length].decode('utf-8'), start + key_length, offset
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over (entry_id, result) pairs in write order."""
+        for key, start, end in self._records():
+            yield key, json_backend.loads(self._mm[start:end])
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over entry ids in write order without decoding the results."""
+        for key, _, _ in self._records():
+            yield key
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+OUTPUT_FORMATS: Dict[str, Type[ResultWriter]] = {
+    'json': JsonResultWriter,
+    'ndjson': NdjsonResultWriter,
+    'binary': BinaryResultWriter,
+}
@@ -0,0 +1,104 @@
+# src/prevalidation.py
+
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .utils import iter_chunks
+
+HEX_DIGITS = b'0123456789abcdefABCDEF'
+HEADER_LENGTH = 32  # Hex characters of the unknown-format header
+
+# Rejection reason codes, in the order they are checked, with their messages
+REASONS = {
+    'hex_not_string': "hex is not a string",
+    'hex_odd_length': "hex has an odd number of characters",
+    'hex_not_hex': "hex contains non-hex characters",
+    'unknown_not_string': "unknown is not a string",
+    'unknown_bad_header': "unknown does not start with a known header",
+    'unknown_not_hex': "unknown contains non-hex characters",
+    'length_ratio': "unknown payload is not twice the length of hex",
+}
+
+def _is_hex(text: str) -> bool:
+    """True if ``text`` only holds hex digits (no exception on bad input)."""
+    return text.isascii() and not text.encode('ascii').translate(None, HEX_DIGITS)
+
+def rejection_reason(hex_str: Any, unknown_str: Any, headers: Collection[str]) -> Optional[str]:
+    """
+    First structural problem of an entry's hex/unknown pair, or None if it is well-formed.
+
+    Args:
+        hex_str: The entry's hex payload
+        unknown_str: The entry's unknown-format payload
+        headers: Accepted unknown-format headers
+
+    Returns:
+        Optional[str]: A REASONS code, or None
+    """
+    if not isinstance(hex_str, str):
+        return 'hex_not_string'
+    if len(hex_str) % 2:
+        return 'hex_odd_length'
+    if not _is_hex(hex_str):
+        return 'hex_not_hex'
+    if not isinstance(unknown_str, str):
+        return 'unknown_not_string'
+    if unknown_str[:HEADER_LENGTH] not in headers:
+        return 'unknown_bad_header'
+    if not _is_hex(unknown_str[HEADER_LENGTH:]):
+        return 'unknown_not_hex'
+    if len(unknown_str) - HEADER_LENGTH != 2 * len(hex_str):
+        return 'length_ratio'
+    return None
+
+def scan_entries(entries: Sequence[Tuple[str, Dict[str, Any]]],
+                 headers: Collection[str]) -> List[Optional[str]]:
+    """
+    Structurally check many entries before any conversion runs.
+
+    The whole batch is checked first with a handful of C-level calls: one
+    ``isascii`` and one ``bytes.translate`` over the concatenated payloads,
+    plus length arithmetic and header lookups. Entries are only examined one by
+    one when the batch contains a bad one, and no check raises.
+
+    Args:
+        entries: (entry_id, entry) pairs
+        headers: Accepted unknown-format headers
+
+    Returns:
+        List[Optional[str]]: Per entry, a REASONS code or None if well-formed
+    """
+    hexes = [entry.get('hex') for _, entry in entries]
+    unknowns = [entry.get('unknown') for _, entry in entries]
+    if (all(type(value) is str for value in hexes) and all(type(value) is str for value in unknowns)
+            and all(len(unknown_str) - HEADER_LENGTH == 2 * len(hex_str) and not len(hex_str) % 2
+                    and unknown_str[:HEADER_LENGTH] in headers
+                    for hex_str, unknown_str in zip(hexes, unknowns))
+            and _is_hex(''.join(hexes)) and _is_hex(''.join(u[HEADER_LENGTH:] for u in unknowns))):
+        return [None] * len(entries)
+    return [rejection_reason(hex_str, unknown_str, headers) for hex_str, unknown_str in zip(hexes, unknowns)]
+
+def scan_report(entries: Iterable[Tuple[str, Dict[str, Any]]], headers: Collection[str],
+                batch_size: int = 4096, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Scan a dataset and summarize what would be rejected.
+
+    Args:
+        entries: (entry_id, entry) pairs
+        headers: Accepted unknown-format headers
+        batch_size (int): Entries checked per scan_entries call
+        limit (Optional[int]): Maximum number of rejected entry ids listed
+
+    Returns:
+        Dict[str, Any]: Totals, counts per reason and the rejected entry ids
+    """
+    report: Dict[str, Any] = {'total_entries': 0, 'rejected_entries': 0, 'rejection_reasons': {}, 'rejected': {}}
+    for chunk in iter_chunks(entries, batch_size):
+        report['total_entries'] += len(chunk)
+        for (key, _), reason in zip(chunk, scan_entries(chunk, headers)):
+            if reason is None:
+                continue
+            report['rejected_entries'] += 1
+            report['rejection_reasons'][reason] = report['rejection_reasons'].get(reason, 0) + 1
+            if limit is None or len(report['rejected']) < limit:
+                report['rejected'][key] = reason
+    return report
@@ -0,0 +1,147 @@
+# src/profiles.py
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .conversions import BLOCK_SIZE, CodecProfile, CryptoConverter
+
+HEADER_LENGTH = 32  # Hex characters of the header prefix that identifies a profile
+_HEADER_PATTERN = re.compile(r'^[0-9a-f]{%d}$' % HEADER_LENGTH)
+
+DEFAULT_PROFILE = CodecProfile('default', CryptoConverter.HEADER, CryptoConverter.XOR_KEY)
+
+class ProfileRegistry:
+    """
+    Codec profiles keyed by their header, for routing mixed input in one pass.
+
+    ``detect`` slices the 32-character header prefix off an unknown-format
+    string and looks it up in a dict, so routing costs the same however many
+    profiles are registered. Profile files are JSON documents of the form
+    ``{"profiles": [{"name": ..., "header": ..., "xor_key": ..., "offset_mod": ...}]}``
+    (``offset_mod`` is optional and defaults to 256).
+    """
+
+    def __init__(self, profiles: Optional[List[CodecProfile]] = None):
+        """
+        Args:
+            profiles (Optional[List[CodecProfile]]): Profiles to register; the first one
+                is the fallback for unrecognized headers (defaults to DEFAULT_PROFILE)
+        """
+        self._by_header: Dict[str, CodecProfile] = {}
+        self._by_name: Dict[str, CodecProfile] = {}
+        self._converters: Dict[Tuple[str, str], CryptoConverter] = {}
+        for profile in profiles or [DEFAULT_PROFILE]:
+            self.register(profile)
+
+    def register(self, profile: CodecProfile) -> None:
+        """
+        Add a profile.
+
+        Raises:
+            ValueError: If the header or key is malformed, or the name or header is taken
+        """
+        header = profile.header.lower()
+        if not _HEADER_PATTERN.match(header):
+            raise ValueError(f"Profile '{profile.name}' header must be {HEADER_LENGTH} hex characters")
+        if not 0 <= profile.xor_key <= 0xFF:
+            raise ValueError(f"Profile '{profile.name}' XOR key must be a byte value")
+        if not 1 <= profile.offset_mod <= BLOCK_SIZE:
+            raise ValueError(f"Profile '{profile.name}' offset modulus must be between 1 and {BLOCK_SIZE}")
+        if profile.name in self._by_name:
+            raise ValueError(f"Duplicate profile name: {profile.name}")
+        if header in self._by_header:
+            raise ValueError(
+                f"Profiles '{self._by_header[header].name}' and '{profile.name}' share header {header}"
+            )
+        profile = profile._replace(header=header)
+        self._by_header[header] = profile
+        self._by_name[profile.name] = profile
+
+    @property
+    def default(self) -> CodecProfile:
+        """Fallback profile: the first one registered."""
+        return next(iter(self._by_name.values()))
+
+    def __iter__(self) -> Iterator[CodecProfile]:
+        return iter(self._by_name.values())
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __getitem__(self, name: str) -> CodecProfile:
+        return self._by_name[name]
+
+    def detect(self, unknown_string: Any) -> Optional[CodecProfile]:
+        """Profile whose header prefixes ``unknown_string``, or None."""
+        if not isinstance(unknown_string, str):
+            return None
+        prefix = unknown_string[:HEADER_LENGTH]
+        return self._by_header.get(prefix) or self._by_header.get(prefix.lower())
+
+    def converter(self, profile: CodecProfile, engine: str = 'table') -> CryptoConverter:
+        """Shared converter instance for a profile and engine."""
+        key = (profile.name, engine)
+        converter = self._converters.get(key)
+        if converter is None:
+            converter = self._converters[key] = CryptoConverter(engine=engine, profile=profile)
+        return converter
+
+    def unknown_to_hex(self, unknown_string: str, engine: str = 'table') -> Optional[str]:
+        """
+        Convert unknown format to hex with the profile matching its header.
+
+        Raises:
+            ValueError: If no registered profile matches the header
+        """
+        profile = self.detect(unknown_string)
+        if profile is None:
+            raise ValueError("Invalid unknown string: no codec profile matches its header")
+        return self.converter(profile, engine).unknown_to_hex(unknown_string)
+
+    def signature(self) -> str:
+        """Digest of all profiles, for keys that must change when the registry does."""
+        canonical = json.dumps(self.to_dict(), sort_keys=True)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'profiles': [profile._asdict() for profile in self]}
+
+    def save(self, path: str) -> None:
+        """Write the profiles in the format read by ``load``."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, include_default: bool = True) -> 'ProfileRegistry':
+        """
+        Read a profile file.
+
+        Args:
+            path (str): JSON profile file
+            include_default (bool): Also register DEFAULT_PROFILE (as the fallback) unless
+                the file defines a profile of the same name or header
+
+        Raises:
+            ValueError: If the file is malformed
+        """
+        with open(path, 'r') as f:
+            data = json.load(f)
+        try:
+            profiles = [
+                CodecProfile(
+                    str(item['name']), str(item['header']),
+                    int(item['xor_key'], 0) if isinstance(item['xor_key'], str) else int(item['xor_key']),
+                    int(item.get('offset_mod', BLOCK_SIZE))
+                )
+                for item in data['profiles']
+            ]
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Malformed profile file {Path(path)}: {e}")
+        if include_default and not any(
+                profile.name == DEFAULT_PROFILE.name or profile.header.lower() == DEFAULT_PROFILE.header
+                for profile in profiles):
+            profiles.insert(0, DEFAULT_PROFILE)
+        return cls(profiles)
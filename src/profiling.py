@@ -0,0 +1,192 @@
+# src/profiling.py
+
+import cProfile
+import heapq
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+STAGES = ('load', 'process', 'save')
+# Allocation sites left out of memory reports: the profilers' own bookkeeping
+_IGNORED_FILES = (tracemalloc.__file__, cProfile.__file__, __file__)
+
+class RunProfiler:
+    """
+    Sampled cProfile and tracemalloc profiling of a run's stages, plus the slowest entries.
+
+    Each stage ('load', 'process', 'save') is entered once per chunk. Only a
+    ``sample_rate`` fraction of those calls is profiled (the first call always
+    is), so overhead stays proportional to the rate. A sampled call runs under
+    the stage's own ``cProfile.Profile`` and, unless ``memory`` is off, with
+    tracemalloc tracing only for its duration; the allocations still alive at
+    the end of the call are added to the stage's totals per source line.
+    Per-entry timings are cheap and always recorded; a bounded heap keeps the
+    ``top_entries`` slowest.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, top_entries: int = 20, memory: bool = True,
+                 memory_frames: int = 1):
+        """
+        Args:
+            sample_rate (float): Fraction of stage calls profiled, in (0, 1]
+            top_entries (int): Number of slowest entries kept
+            memory (bool): Also trace allocations of the sampled calls
+            memory_frames (int): Traceback depth recorded per allocation
+
+        Raises:
+            ValueError: If sample_rate is outside (0, 1] or top_entries is negative
+        """
+        if not 0 < sample_rate <= 1:
+            raise ValueError(f"Profile sample rate must be in (0, 1], got {sample_rate}")
+        if top_entries < 0:
+            raise ValueError(f"Number of slowest entries must not be negative, got {top_entries}")
+        self.sample_rate = sample_rate
+        self.top_entries = top_entries
+        self.memory = memory
+        self.memory_frames = memory_frames
+        self.profiles = {stage: cProfile.Profile() for stage in STAGES}
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.sampled = dict.fromkeys(STAGES, 0)
+        # Bytes and blocks still allocated at the end of sampled calls, per source location
+        self.allocations: Dict[str, Dict[str, List[int]]] = {stage: {} for stage in STAGES}
+        self._credit = dict.fromkeys(STAGES, 1.0 - sample_rate)
+        self._active: Optional[str] = None
+        self._slowest: List[Tuple[float, int, str, int]] = []
+        self._observed = 0
+
+    def _take_sample(self, stage: str) -> bool:
+        """Spread sampled calls evenly: one every 1/sample_rate calls, starting with the first."""
+        self.calls[stage] += 1
+        if self._active is not None:  # Never nest profilers
+            return False
+        self._credit[stage] += self.sample_rate
+        if self._credit[stage] < 1.0 - 1e-9:
+            return False
+        self._credit[stage] -= 1.0
+        self.sampled[stage] += 1
+        return True
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Context manager profiling the enclosed call of ``stage`` if it is sampled."""
+        if not self._take_sample(stage):
+            yield
+            return
+        self._active = stage
+        # Tracing may already be on (python -X tracemalloc); then only the difference counts
+        was_tracing = tracemalloc.is_tracing()
+        baseline = None
+        if self.memory:
+            if was_tracing:
+                baseline = tracemalloc.take_snapshot()
+            else:
+                tracemalloc.start(self.memory_frames)
+        profile = self.profiles[stage]
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            if self.memory:
+                snapshot = tracemalloc.take_snapshot()
+                if not was_tracing:
+                    tracemalloc.stop()
+                self._add_allocations(stage, snapshot, baseline)
+            self._active = None
+
+    def iter_stage(self, stage: str, items: Iterable[Any]) -> Iterator[Any]:
+        """Iterate ``items``, profiling the production of each item as a call of ``stage``."""
+        iterator = iter(items)
+        done = object()
+        while True:
+            with self.stage(stage):
+                item = next(iterator, done)
+            if item is done:
+                return
+            yield item
+
+    def _add_allocations(self, stage: str, snapshot: tracemalloc.Snapshot,
+                         baseline: Optional[tracemalloc.Snapshot]) -> None:
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, path) for path in _IGNORED_FILES])
+        if baseline is None:
+            stats = [(stat.traceback, stat.size, stat.count) for stat in snapshot.statistics('lineno')]
+        else:
+            stats = [
+                (stat.traceback, stat.size_diff, stat.count_diff)
+                for stat in snapshot.compare_to(baseline, 'lineno') if stat.size_diff > 0
+            ]
+        totals = self.allocations[stage]
+        for traceback, size, count in stats:
+            total = totals.setdefault(str(traceback), [0, 0])
+            total[0] += size
+            total[1] += count
+
+    def observe_entry(self, entry_id: str, payload_bytes: int, seconds: float) -> None:
+        """Record one entry's processing time, keeping it if it is among the slowest."""
+        if not self.top_entries:
+            return
+        self._observed += 1
+        # The counter breaks ties so entry ids are never compared
+        item = (seconds, self._observed, entry_id, payload_bytes)
+        if len(self._slowest) < self.top_entries:
+            heapq.heappush(self._slowest, item)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def slowest_entries(self) -> List[Dict[str, Any]]:
+        """The slowest entries seen, slowest first (earlier entries first on ties)."""
+        return [
+            {'entry_id': entry_id, 'bytes': payload_bytes, 'seconds': seconds}
+            for seconds, _, entry_id, payload_bytes
+            in sorted(self._slowest, key=lambda item: (-item[0], item[1]))
+        ]
+
+    def top_allocations(self, stage: str, limit: int = 25) -> List[Tuple[str, int, int]]:
+        """(location, bytes, blocks) of the largest allocation sites of ``stage``."""
+        totals = self.allocations[stage].items()
+        return [
+            (location, size, count)
+            for location, (size, count) in sorted(totals, key=lambda item: item[1][0], reverse=True)[:limit]
+        ]
+
+    def write(self, output_dir: Path, tag: str, limit: int = 25) -> Dict[str, Any]:
+        """
+        Write a ``.pstats`` file and an allocation report per sampled stage.
+
+        Files are named ``profile_<tag>_<stage>.pstats`` and
+        ``profile_<tag>_<stage>_memory.txt``; the pstats files load with
+        ``pstats.Stats`` or snakeviz.
+
+        Args:
+            output_dir (Path): Directory for the files
+            tag (str): Run tag in the file names (timestamp and shard)
+            limit (int): Allocation sites listed per stage
+
+        Returns:
+            Dict[str, Any]: Profile section for the run summary
+        """
+        output_dir = Path(output_dir)
+        stages = {}
+        for stage in STAGES:
+            stats = {'calls': self.calls[stage], 'sampled': self.sampled[stage]}
+            if self.sampled[stage]:
+                pstats_path = output_dir / f"profile_{tag}_{stage}.pstats"
+                self.profiles[stage].dump_stats(str(pstats_path))
+                stats['pstats'] = pstats_path.name
+                if self.memory:
+                    memory_path = output_dir / f"profile_{tag}_{stage}_memory.txt"
+                    top = self.top_allocations(stage, limit)
+                    with open(memory_path, 'w') as f:
+                        f.write(f"# {stage}: allocations alive at the end of {self.sampled[stage]} "
+                                f"sampled of {self.calls[stage]} calls\n")
+                        for location, size, count in top:
+                            f.write(f"{location}: size={size / 1024:.1f} KiB, count={count}\n")
+                    stats['memory'] = memory_path.name
+                    stats['retained_bytes'] = sum(size for size, _ in self.allocations[stage].values())
+            stages[stage] = stats
+        return {
+            'sample_rate': self.sample_rate,
+            'stages': stages,
+            'slowest_entries': self.slowest_entries(),
+        }
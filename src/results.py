@@ -0,0 +1,180 @@
+# src/results.py
+
+from typing import Any, Dict, List, Optional
+
+from .conversions import PairVerification
+
+# Validation names in the order they are checked; bit i of the flag masks is VALIDATIONS[i]
+VALIDATIONS = ('hex_to_ascii_valid', 'hex_to_unknown_valid', 'unknown_to_hex_valid',
+               'conversion_pair_valid')
+HEX_TO_ASCII, HEX_TO_UNKNOWN, UNKNOWN_TO_HEX, CONVERSION_PAIR = (1 << i for i in range(len(VALIDATIONS)))
+# Version of the stored result layout (to_dict) and its meaning; bump when either
+# changes so checkpointed and cached results from older code are not reused
+RESULT_VERSION = 2
+
+class EntryResult:
+    """
+    Compact processing result for one entry.
+
+    Validations are two bitmasks (``checked``: which validations ran, ``passed``:
+    which succeeded) instead of a dict. Payloads are stored once: ``entry`` is a
+    reference to the input entry, and round-trip conversions that reproduce the
+    input are stored as references to the entry's own strings rather than as
+    equal copies (pickling keeps that sharing too). Pool workers send results
+    back ``detach``ed from the entry, which the parent already holds, and the
+    parent ``attach``es its own entry again.
+
+    ``to_dict()`` renders the detailed results layout; ``to_dict(compact=True)``
+    leaves out the original entry and round-trip strings equal to it, and
+    ``from_dict`` restores either form given the entry.
+    """
+
+    __slots__ = ('entry', 'checked', 'passed', 'ascii', 'unknown', 'hex', 'errors', 'mismatch',
+                 'fields', 'profile', 'rejected')
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.entry = entry
+        self.checked = 0
+        self.passed = 0
+        self.ascii: Optional[str] = None
+        self.unknown: Optional[str] = None
+        self.hex: Optional[str] = None
+        self.errors: Optional[List[str]] = None
+        self.mismatch: Optional[PairVerification] = None
+        # Decoded payload fields picked for the secondary index (not part of the output)
+        self.fields: Optional[Dict[str, Any]] = None
+        # Name of the codec profile the entry was routed to (None without a registry or match)
+        self.profile: Optional[str] = None
+        # Pre-validation reason code when the entry was rejected before any conversion
+        self.rejected: Optional[str] = None
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def detach(self) -> tuple:
+        """
+        Picklable state without the entry, for shipping the result to the entry's owner.
+
+        Round-trip conversions that are the entry's own strings are sent as
+        ``True`` rather than copied.
+        """
+        shared = {'unknown': self.entry.get('unknown'), 'hex': self.entry.get('hex')}
+        return tuple(
+            True if name in shared and value is not None and value is shared[name] else value
+            for name, value in zip(self.__slots__[1:], self.__getstate__()[1:])
+        )
+
+    @classmethod
+    def attach(cls, entry: Dict[str, Any], state: tuple) -> 'EntryResult':
+        """Rebuild a ``detach``ed result for its input entry."""
+        result = cls.__new__(cls)
+        result.__setstate__((entry,) + state)
+        if result.unknown is True:
+            result.unknown = entry.get('unknown')
+        if result.hex is True:
+            result.hex = entry.get('hex')
+        return result
+
+    def record(self, flag: int, valid: bool) -> None:
+        """Record the outcome of one validation."""
+        self.checked |= flag
+        if valid:
+            self.passed |= flag
+
+    def valid(self, flag: int) -> bool:
+        return bool(self.passed & flag)
+
+    def add_error(self, message: str) -> None:
+        if self.errors is None:
+            self.errors = []
+        self.errors.append(message)
+
+    def set_unknown(self, value: Optional[str]) -> None:
+        """Store the hex_to_unknown result, sharing the input string when equal."""
+        original = self.entry.get('unknown')
+        self.unknown = original if value == original else value
+
+    def set_hex(self, value: Optional[str]) -> None:
+        """Store the unknown_to_hex result, sharing the input string when equal."""
+        original = self.entry.get('hex')
+        self.hex = original if value == original else value
+
+    @property
+    def validations(self) -> Dict[str, bool]:
+        return {
+            name: bool(self.passed & (1 << i))
+            for i, name in enumerate(VALIDATIONS) if self.checked & (1 << i)
+        }
+
+    def to_dict(self, compact: bool = False) -> Dict[str, Any]:
+        """
+        Render the result in the detailed results layout.
+
+        Args:
+            compact (bool): Omit ``original`` and round-trip conversions identical to the input
+
+        Returns:
+            Dict[str, Any]: JSON-serializable result
+        """
+        conversions = {}
+        if self.passed & HEX_TO_ASCII:
+            conversions['hex_to_ascii'] = self.ascii
+        if self.passed & HEX_TO_UNKNOWN and not (compact and self.unknown is self.entry.get('unknown')):
+            conversions['hex_to_unknown'] = self.unknown
+        if self.passed & UNKNOWN_TO_HEX and not (compact and self.hex is self.entry.get('hex')):
+            conversions['unknown_to_hex'] = self.hex
+
+        result = {} if compact else {'original': dict(self.entry)}
+        result['validations'] = self.validations
+        result['conversions'] = conversions
+        result['errors'] = list(self.errors or ())
+        if self.mismatch is not None:
+            result['pair_mismatch'] = {
+                'reason': self.mismatch.reason,
+                'offset': self.mismatch.offset,
+                'original': self.mismatch.original,
+                'reconstructed': self.mismatch.reconstructed
+            }
+        if self.profile is not None:
+            result['profile'] = self.profile
+        if self.rejected is not None:
+            result['rejected'] = self.rejected
+        return result
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any], data: Dict[str, Any]) -> 'EntryResult':
+        """
+        Rebuild a result rendered by ``to_dict`` (either form) for its input entry.
+
+        Args:
+            entry (Dict[str, Any]): The input entry the result was computed from
+            data (Dict[str, Any]): Output of ``to_dict``
+
+        Returns:
+            EntryResult: Equivalent compact result
+        """
+        result = cls(entry)
+        for i, name in enumerate(VALIDATIONS):
+            if name in data['validations']:
+                result.record(1 << i, data['validations'][name])
+        conversions = data['conversions']
+        result.ascii = conversions.get('hex_to_ascii')
+        if result.passed & HEX_TO_UNKNOWN:
+            result.set_unknown(conversions.get('hex_to_unknown', entry.get('unknown')))
+        if result.passed & UNKNOWN_TO_HEX:
+            result.set_hex(conversions.get('unknown_to_hex', entry.get('hex')))
+        for message in data['errors']:
+            result.add_error(message)
+        mismatch = data.get('pair_mismatch')
+        if mismatch is not None:
+            result.mismatch = PairVerification(
+                False, mismatch['reason'], mismatch['offset'], mismatch['original'],
+                mismatch['reconstructed']
+            )
+        result.profile = data.get('profile')
+        result.rejected = data.get('rejected')
+        return result
@@ -0,0 +1,172 @@
+# src/server.py
+
+import logging
+import os
+import stat
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Callable, Dict, Optional
+
+from . import json_backend
+from .cache import CachedConverter
+from .utils import ValidationError
+
+logger = logging.getLogger(__name__)
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+class ConversionService:
+    """
+    Request handlers backed by one resident, warmed-up CryptoProcessor.
+
+    Every handler takes and returns JSON-compatible dicts, so the same service
+    can sit behind any transport. Handlers may run concurrently from the
+    server's request threads.
+    """
+
+    def __init__(self, processor):
+        """
+        Args:
+            processor (CryptoProcessor): Processor whose converter and settings serve requests
+        """
+        self.processor = processor
+        self.routes: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+            '/process': self.process,
+            '/encode': self.encode,
+            '/decode': self.decode,
+        }
+        # /process reuses whole entry results from the processor's cache; /encode and /decode
+        # receive one side of an entry only, so they are cached per payload (see CachedConverter)
+        self.converter = (
+            CachedConverter(processor.converter, processor.cache) if processor.cache is not None
+            else processor.converter
+        )
+        # Build the translate tables before the first request
+        converter = processor.converter
+        converter.decode_bytes(converter.encode_bytes(b'\x00'))
+
+    def process(self, payload: Any) -> Dict[str, Any]:
+        """
+        Run the full per-entry pipeline on a batch of entries.
+
+        Args:
+            payload: Entries in the input file format ({entry_id: entry})
+
+        Returns:
+            Dict[str, Any]: ``results`` per entry id and the batch ``summary``
+        """
+        results, summary_stats = self.processor.process_batch(payload)
+        return {
+            'results': {key: result.to_dict(self.processor.compact_output) for key, result in results.items()},
+            'summary': summary_stats
+        }
+
+    def encode(self, payload: Any) -> Dict[str, Any]:
+        """Convert ``{"hex": [...]}`` to ``{"unknown": [...]}`` (null for invalid input)."""
+        return {'unknown': self.converter.encode_many(self._strings(payload, 'hex'))}
+
+    def decode(self, payload: Any) -> Dict[str, Any]:
+        """Convert ``{"unknown": [...]}`` to ``{"hex": [...]}`` (null for invalid input)."""
+        return {'hex': self.converter.decode_many(self._strings(payload, 'unknown'))}
+
+    def status(self) -> Dict[str, Any]:
+        """Health check payload with the processor settings and metrics so far."""
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'engine': self.processor.engine,
+            'metrics': self.processor.metrics.summary()
+        }
+
+    @staticmethod
+    def _strings(payload: Any, field: str) -> list:
+        values = payload.get(field) if isinstance(payload, dict) else None
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValidationError(f"Request must contain a '{field}' list of strings")
+        return values
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP/1.1 with keep-alive, so clients can reuse one connection."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'CryptoProcessor'
+
+    def do_GET(self) -> None:
+        if self.path == '/health':
+            self._send_json(200, self.server.service.status())
+        else:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        route = self.server.service.routes.get(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_REQUEST_BYTES:
+            self.close_connection = True
+            self._send_json(413, {'error': f"Request body exceeds {MAX_REQUEST_BYTES} bytes"})
+            return
+        body = self.rfile.read(length)
+        if route is None:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+
+        try:
+            response = route(json_backend.loads(body))
+        except (ValueError, ValidationError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            logger.error("Error handling %s: %s", self.path, e)
+            self._send_json(500, {'error': str(e)})
+            return
+        self._send_json(200, response)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json_backend.dumpb(payload)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """Unix socket counterpart of ThreadingHTTPServer."""
+
+    daemon_threads = True
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+def make_server(processor, host: str = '127.0.0.1', port: int = 8765,
+                socket_path: Optional[str] = None):
+    """
+    Create a threaded conversion server for a processor.
+
+    Args:
+        processor (CryptoProcessor): Processor serving the requests
+        host (str): Address to listen on (ignored with ``socket_path``)
+        port (int): TCP port; 0 picks a free one (see ``server.server_address``)
+        socket_path (Optional[str]): Listen on this Unix socket instead of TCP
+
+    Returns:
+        A socketserver instance; call ``serve_forever()`` and ``server_close()``
+    """
+    if socket_path:
+        # Replace a socket left behind by a previous server, but never a regular file
+        if os.path.exists(socket_path):
+            if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                raise FileExistsError(f"Not a socket: {socket_path}")
+            os.unlink(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, ConversionRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ConversionRequestHandler)
+    server.service = ConversionService(processor)
+    return server
@@ -0,0 +1,191 @@
+# src/sharding.py
+
+import glob
+import hashlib
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import json_backend
+from .output import BinaryResultReader, OUTPUT_FORMATS
+from .results import VALIDATIONS
+from .utils import iter_json_object
+
+_SHARD_SPEC = re.compile(r'^\s*(\d+)\s*/\s*(\d+)\s*$')
+
+# Summary counters that add up across shards; rates are recomputed from them
+SUMMED_COUNTERS = ('total_entries', 'successful_conversions', 'failed_conversions',
+                   'unmatched_profile_entries', 'rejected_entries')
+SUMMED_SECTIONS = ('validation_stats', 'rejection_reasons', 'profile_stats', 'checkpoint')
+
+def shard_of(entry_id: str, count: int) -> int:
+    """Shard (0..count-1) owning an entry id; stable across hosts and Python versions."""
+    digest = hashlib.blake2b(entry_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % count
+
+class Shard(NamedTuple):
+    """One slice ``index`` of ``count`` of the entry ids, partitioned by hash."""
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, text: str) -> 'Shard':
+        """
+        Parse an ``i/N`` shard spec (0 <= i < N).
+
+        Raises:
+            ValueError: If the spec is malformed or out of range
+        """
+        match = _SHARD_SPEC.match(text)
+        if match is None:
+            raise ValueError(f"Invalid shard '{text}', expected i/N such as 0/4")
+        index, count = int(match.group(1)), int(match.group(2))
+        if not 0 <= index < count:
+            raise ValueError(f"Invalid shard '{text}': index must be between 0 and {count - 1}")
+        return cls(index, count)
+
+    def contains(self, entry_id: str) -> bool:
+        return shard_of(entry_id, self.count) == self.index
+
+    @property
+    def label(self) -> str:
+        """File name tag, e.g. ``shard-0-of-4``."""
+        return f"shard-{self.index}-of-{self.count}"
+
+    def tag_path(self, path: str) -> Path:
+        """``path`` with the shard label before its suffix, e.g. ``fields_shard-0-of-4.sqlite``."""
+        path = Path(path)
+        return path.with_name(f"{path.stem}_{self.label}{path.suffix}")
+
+    def to_dict(self) -> Dict[str, int]:
+        return {'index': self.index, 'count': self.count}
+
+def resolve_input_files(spec: str) -> List[Path]:
+    """
+    Input files named by a file path, a directory (its ``*.json`` files) or a glob.
+
+    Returns:
+        List[Path]: Files in sorted order (a single path is returned as is)
+
+    Raises:
+        FileNotFoundError: If a directory or glob matches no files
+    """
+    path = Path(spec)
+    if path.is_dir():
+        files = sorted(p for p in path.glob('*.json') if p.is_file())
+    elif any(char in spec for char in '*?['):
+        files = sorted(Path(p) for p in glob.glob(spec) if Path(p).is_file())
+    else:
+        return [path]
+    if not files:
+        raise FileNotFoundError(f"No input files match {spec}")
+    return files
+
+def iter_result_file(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream (entry_id, result) pairs from a detailed results file of any output format."""
+    path = Path(path)
+    if path.suffix == OUTPUT_FORMATS['binary'].extension:
+        with BinaryResultReader(path) as reader:
+            yield from reader.items()
+    elif path.suffix == OUTPUT_FORMATS['ndjson'].extension:
+        with open(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    result = json_backend.loads(line)
+                    yield result.pop('entry_id'), result
+    else:
+        with open(path, 'r') as f:
+            yield from iter_json_object(f)
+
+def find_run_outputs(paths: Sequence[str]) -> List[Tuple[Path, Optional[Path]]]:
+    """
+    Pair every summary found under ``paths`` with its detailed results file.
+
+    Args:
+        paths: Output directories (all their ``summary_*.json``) or summary files
+
+    Returns:
+        List of (summary path, detailed results path or None)
+    """
+    summaries = []
+    for spec in paths:
+        path = Path(spec)
+        summaries += sorted(path.glob('summary_*.json')) if path.is_dir() else [path]
+    runs = []
+    for summary in summaries:
+        tag = summary.name[len('summary_'):-len('.json')]
+        detailed = None
+        for writer_cls in OUTPUT_FORMATS.values():
+            candidate = summary.parent / f"detailed_results_{tag}{writer_cls.extension}"
+            if candidate.exists():
+                detailed = candidate
+                break
+        runs.append((summary, detailed))
+    return runs
+
+def _add_counts(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """Add the numbers of a (nested) counter dict into ``target``."""
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _add_counts(target.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            target[key] = target.get(key, 0) + value
+
+def merge_summaries(summaries: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine per-shard summaries into one global summary.
+
+    Entry counters, ``validation_stats``, ``rejection_reasons``, ``profile_stats``,
+    checkpoint reuse and cache hits/misses are summed, and ``success_rate`` and
+    the cache hit rate are recomputed from the sums. Per-run metrics do not add up and are left out;
+    ``shards`` lists what was merged.
+
+    Raises:
+        ValueError: If the summaries mix shard counts, repeat a shard or mix
+            sharded and unsharded runs
+    """
+    merged: Dict[str, Any] = {
+        'total_entries': 0,
+        'successful_conversions': 0,
+        'failed_conversions': 0,
+        'validation_stats': {validation_key: 0 for validation_key in VALIDATIONS},
+    }
+    counts = {summary['shard']['count'] for summary in summaries if 'shard' in summary}
+    if len(counts) > 1:
+        raise ValueError(f"Summaries come from different shard counts: {sorted(counts)}")
+    seen = set()
+    cache: Dict[str, Any] = {}
+    for summary in summaries:
+        shard = summary.get('shard')
+        index = shard['index'] if shard else None
+        if index in seen:
+            raise ValueError(f"Shard {index if index is not None else '(unsharded)'} appears more than once")
+        seen.add(index)
+        for counter in SUMMED_COUNTERS:
+            if counter in summary:
+                merged[counter] = merged.get(counter, 0) + summary[counter]
+        for section in SUMMED_SECTIONS:
+            if section in summary:
+                _add_counts(merged.setdefault(section, {}), summary[section])
+        if 'cache' in summary:
+            _add_counts(cache, {key: summary['cache'].get(key, 0) for key in ('hits', 'misses', 'evicted')})
+    if counts and None in seen:
+        raise ValueError("Cannot merge sharded and unsharded summaries")
+
+    if cache:
+        lookups = cache['hits'] + cache['misses']
+        merged['cache'] = {**cache, 'hit_rate': f"{(cache['hits'] / lookups if lookups else 0.0) * 100:.2f}%"}
+    total = merged['total_entries']
+    success_rate = merged['successful_conversions'] / total if total else 0.0
+    merged['success_rate'] = f"{success_rate * 100:.2f}%"
+    inputs = sorted({str(summary.get('input_file')) for summary in summaries})
+    merged['input_file'] = inputs[0] if len(inputs) == 1 else inputs
+    if counts:
+        shard_count = counts.pop()
+        merged['shards'] = {
+            'count': shard_count,
+            'merged': sorted(index for index in seen if index is not None),
+            'missing': sorted(set(range(shard_count)) - seen),
+        }
+    return merged
@@ -1,7 +1,14 @@
 # src/utils.py
 
 import json
-from typing import Any
+from itertools import islice
+from typing import Any, IO, Iterable, Iterator, List, Tuple
+
+from . import json_backend
+
+# Longest tail a decode error can point into that more input may still complete
+# (a cut '\uXXXX\uXXXX' escape, literal or number); strings can be cut anywhere
+_MAX_CUT_TOKEN = 12
 
 class ValidationError(Exception):
     """Custom exception for validation errors."""
@@ -18,7 +25,7 @@ def validate_json(json_string: str) -> bool:
         bool: True if valid JSON, False otherwise
     """
     try:
-        json.loads(json_string)
+        json_backend.loads(json_string)
         return True
     except:
         return False
@@ -37,6 +44,150 @@ def safe_json_loads(json_string: str) -> Any:
         ValidationError: If JSON is invalid
     """
     try:
-        return json.loads(json_string)
+        return json_backend.loads(json_string)
     except json.JSONDecodeError as e:
         raise ValidationError(f"Invalid JSON: {str(e)}")
+
+def iter_chunks(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Split an iterable into lists of at most ``size`` items without materializing it.
+    
+    Args:
+        iterable (Iterable[Any]): Source items
+        size (int): Maximum chunk length (values below 1 are treated as 1)
+        
+    Yields:
+        List[Any]: Consecutive chunks in input order
+    """
+    iterator = iter(iterable)
+    size = max(size, 1)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class CountingReader:
+    """
+    Read-only file wrapper counting the characters handed out by ``read``.
+    
+    Lets a caller report how far a consumer such as iter_json_object has got
+    without calling ``tell`` on a text file.
+    """
+    
+    def __init__(self, fp: IO[str]):
+        self.fp = fp
+        self.consumed = 0
+
+    def read(self, size: int = -1) -> str:
+        data = self.fp.read(size)
+        self.consumed += len(data)
+        return data
+
+def iter_json_object(fp: IO[str], chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a top-level JSON object, yielding its members as they are read.
+    
+    Only the member currently being parsed is held in memory, so arbitrarily large
+    files can be consumed in bounded memory. Duplicate keys are yielded as they
+    appear rather than collapsed.
+    
+    Args:
+        fp (IO[str]): Text file object positioned at the start of the document
+        chunk_size (int): Minimum number of characters read per refill
+        
+    Yields:
+        Tuple[str, Any]: (key, value) pairs in document order
+        
+    Raises:
+        ValidationError: If the document is not a JSON object
+        json.JSONDecodeError: If the document is malformed or truncated, or has
+            data after the object
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill(min_chars: int) -> bool:
+        """Read at least min_chars more characters; returns False at EOF."""
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = fp.read(max(chunk_size, min_chars))
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_ws() -> str:
+        """Advance past whitespace and return the next character ('' at EOF)."""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\n\r':
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill(chunk_size):
+                return ''
+
+    def decode_value() -> Any:
+        """Decode one JSON value, reading more input while it may be incomplete."""
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # A scalar ending at the buffer edge may continue in the next chunk, and so
+                # may a number followed by a cut fraction or exponent ('1' of '1e+', '-0' of '-0.')
+                cut = end == len(buf) or (
+                    isinstance(value, (int, float)) and buf[end] in '.eE'
+                    and len(buf) - end <= _MAX_CUT_TOKEN
+                )
+                if eof or not cut:
+                    pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                # Errors before the buffer's end cannot be fixed by reading more
+                if eof or (len(buf) - e.pos > _MAX_CUT_TOKEN
+                           and not e.msg.startswith('Unterminated string')):
+                    raise
+            # Grow geometrically so large values are re-scanned O(log n) times
+            if not fill(len(buf) - pos):
+                value, pos = decoder.raw_decode(buf, pos)
+                return value
+
+    def expect(chars: str) -> str:
+        """Consume one of the expected structural characters."""
+        nonlocal pos
+        char = skip_ws()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", buf, pos)
+        pos += 1
+        return char
+
+    def expect_end() -> None:
+        """Only whitespace may follow the top-level object."""
+        if skip_ws():
+            raise json.JSONDecodeError("Extra data", buf, pos)
+
+    if skip_ws() != '{':
+        raise ValidationError("Input data must be a dictionary")
+    pos += 1
+
+    if skip_ws() == '}':
+        pos += 1
+        expect_end()
+        return
+
+    while True:
+        if skip_ws() != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", buf, pos)
+        key = decode_value()
+        expect(':')
+        skip_ws()
+        yield key, decode_value()
+        if expect(',}') == '}':
+            expect_end()
+            return
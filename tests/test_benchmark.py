@@ -0,0 +1,32 @@
+# tests/test_benchmark.py
+
+import json
+from src.benchmark import bench_cache, bench_converter, bench_processor, compare, make_payload
+
+def test_make_payload_is_valid_json_of_requested_size():
+    payload = bytes.fromhex(make_payload(100))
+    assert len(payload) == 100
+    assert json.loads(payload)["data"]
+    assert make_payload(100, 'a') != make_payload(100, 'b')
+
+def test_bench_converter_reports_all_operations():
+    records = bench_converter([64, 256], min_time=0)
+    assert {r['name'] for r in records} == {
+        'hex_to_unknown', 'unknown_to_hex', 'hex_to_ascii', 'validate_conversion_pair'
+    }
+    assert all(r['mb_per_s'] > 0 and r['peak_memory_bytes'] >= 0 for r in records)
+
+def test_bench_processor_end_to_end(tmp_path):
+    record = bench_processor(5, 64, workdir=tmp_path)
+    assert record['name'] == 'process_all_data'
+    assert record['entries_per_s'] > 0
+
+def test_bench_cache_reports_cold_and_warm_runs(tmp_path):
+    records = bench_cache(5, 64, workdir=tmp_path)
+    assert [r['name'] for r in records] == ['process_all_data_cache_cold', 'process_all_data_cache_warm']
+    assert all(r['entries_per_s'] > 0 for r in records)
+
+def test_compare_flags_regressions():
+    baseline = [{'name': 'hex_to_unknown', 'size': 64, 'mb_per_s': 10.0}]
+    assert compare([{'name': 'hex_to_unknown', 'size': 64, 'mb_per_s': 9.0}], baseline) == []
+    assert len(compare([{'name': 'hex_to_unknown', 'size': 64, 'mb_per_s': 5.0}], baseline)) == 1
@@ -0,0 +1,54 @@
+# tests/test_cache.py
+
+from src.cache import CachedConverter, ConversionCache
+from src.conversions import CryptoConverter
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache.sqlite"), "header", 0xD8, max_bytes=50)
+    for i in range(10):
+        cache.put('op', str(i), 'x' * 10)
+    cache.flush()
+    assert cache.get('op', '0') == (True, 'x' * 10)
+
+    assert cache.evict() == 5
+    assert cache.get('op', '0')[0]
+    assert not cache.get('op', '1')[0]
+    assert cache.get('op', '9')[0]
+
+def test_get_many_reads_pending_and_stored_results(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache.sqlite"), "header", 0xD8)
+    cache.LOOKUP_BATCH = 2
+    cache.put_many([(str(i), f"value {i}") for i in range(5)])
+    cache.flush()
+    cache.put_many([("pending", None)])
+
+    keys = [str(i) for i in range(6)] + ["pending"]
+    assert cache.get_many(keys) == {**{str(i): f"value {i}" for i in range(5)}, "pending": None}
+    assert cache.take_stats() == {'hits': 6, 'misses': 1}
+
+def test_entry_keys_depend_on_both_payloads_and_profile(tmp_path):
+    params = ConversionCache.params_for("header", 0xD8)
+    key = ConversionCache.entry_key(params, None, "ab", "cd")
+    assert key != ConversionCache.entry_key(params, None, "abc", "d")
+    assert key != ConversionCache.entry_key(params, "other", "ab", "cd")
+    assert key != ConversionCache.entry_key(ConversionCache.params_for("header", 0xD9), None, "ab", "cd")
+
+def test_cache_keys_depend_on_converter_parameters(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = ConversionCache(path, "header", 0xD8).key('op', 'ab')
+    assert first != ConversionCache(path, "header", 0xD9).key('op', 'ab')
+    assert first != ConversionCache(path, "other", 0xD8).key('op', 'ab')
+
+def test_cached_converter_matches_converter(tmp_path):
+    converter = CryptoConverter()
+    cache = ConversionCache(str(tmp_path / "cache.sqlite"), converter.HEADER, converter.XOR_KEY)
+    cached = CachedConverter(converter, cache)
+    hex_str = b'{"a": 1}'.hex()
+    for _ in range(2):
+        assert cached.hex_to_ascii(hex_str) == converter.hex_to_ascii(hex_str)
+        assert cached.encode_many([hex_str, "zz"]) == converter.encode_many([hex_str, "zz"])
+        unknown_str = cached.hex_to_unknown(hex_str)
+        assert cached.unknown_to_hex(unknown_str) == hex_str
+    # Second pass is served entirely from the cache; the first pass only reuses
+    # the hex_to_unknown result stored by encode_many
+    assert cache.take_stats() == {'hits': 6, 'misses': 4}
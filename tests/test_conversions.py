@@ -2,7 +2,10 @@
 
 import json
 import pytest
-from src.conversions import CryptoConverter
+from src.conversions import (
+    CodecProfile, CryptoConverter, EntryContext, UnknownIncrementalEncoder,
+    UnknownIncrementalDecoder, transform_file
+)
 
 @pytest.fixture
 def converter():
@@ -47,5 +50,215 @@ def test_invalid_unknown():
     with pytest.raises(ValueError):
         converter.unknown_to_hex("invalid unknown")
 
+@pytest.mark.parametrize("size", [0, 1, 255, 256, 257, 1000])
+def test_table_engine_matches_loop(size):
+    loop = CryptoConverter(engine='loop')
+    table = CryptoConverter(engine='table')
+    hex_str = bytes((i * 37 + 11) % 256 for i in range(size)).hex()
+
+    encoded = table.hex_to_unknown(hex_str)
+    assert encoded == loop.hex_to_unknown(hex_str)
+    assert table.unknown_to_hex(encoded) == loop.unknown_to_hex(encoded) == hex_str
+
+def test_table_engine_odd_unknown_length():
+    loop = CryptoConverter(engine='loop')
+    table = CryptoConverter(engine='table')
+    data = bytes(range(255))
+    assert table.decode_bytes(data, 300) == loop.decode_bytes(data, 300)
+    assert table._decode_table(data, 300) == loop._decode_loop(data, 300)
+
+@pytest.mark.parametrize("size", [1, 64, 511, 512])
+def test_table_transform_matches_loop_below_threshold(size):
+    # Short payloads are routed to the loop, so exercise the table code directly
+    converter = CryptoConverter(engine='table')
+    data = bytes((i * 37 + 11) % 256 for i in range(size))
+    encoded = converter._encode_table(data, 5)
+    assert encoded == converter._encode_loop(data, 5)
+    assert converter._decode_table(encoded, 5) == converter._decode_loop(encoded, 5) == data
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        CryptoConverter(engine='simd')
+
+def test_encode_decode_many_match_single(converter):
+    hex_strings = [bytes(range(n % 256)).hex() * (n // 256 + 1) for n in (0, 1, 17, 256, 700)]
+    hex_strings += ["invalid hex", None]
+
+    encoded = converter.encode_many(hex_strings)
+    assert encoded == [converter.hex_to_unknown(h) for h in hex_strings]
+
+    unknown_strings = [u for u in encoded if u] + ["no header", converter.HEADER + "abc"]
+    assert converter.decode_many(unknown_strings) == [
+        converter.unknown_to_hex(u) for u in unknown_strings
+    ]
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 10000])
+def test_incremental_round_trip(converter, test_data, chunk_size):
+    hex_str = test_data['hex']
+    unknown_str = test_data['unknown']
+
+    encoder = UnknownIncrementalEncoder(converter)
+    encoded = ''.join(
+        encoder.feed(hex_str[i:i + chunk_size]) for i in range(0, len(hex_str), chunk_size)
+    ) + encoder.flush()
+    assert encoded == converter.hex_to_unknown(hex_str)
+
+    decoder = UnknownIncrementalDecoder(converter)
+    decoded = ''.join(
+        decoder.feed(unknown_str[i:i + chunk_size]) for i in range(0, len(unknown_str), chunk_size)
+    ) + decoder.flush()
+    assert decoded == converter.unknown_to_hex(unknown_str)
+
+def test_incremental_decoder_odd_byte(converter):
+    unknown_str = converter.HEADER + "d9d8da"
+    decoder = UnknownIncrementalDecoder(converter)
+    assert decoder.feed(unknown_str) == converter.unknown_to_hex(unknown_str)[:2]
+    assert decoder.feed("", final=True) == converter.unknown_to_hex(unknown_str)[2:]
+
+def test_incremental_codecs_keep_state_after_a_rejected_chunk(converter, test_data):
+    hex_str = test_data['hex']
+    unknown_str = converter.hex_to_unknown(hex_str)
+
+    encoder = UnknownIncrementalEncoder(converter)
+    output = encoder.feed(hex_str[:5])
+    with pytest.raises(ValueError):
+        encoder.feed("zz" + hex_str[5:])
+    assert (encoder.position, encoder._pending) == (2, hex_str[4])
+    assert output + encoder.feed(hex_str[5:], final=True) == unknown_str
+
+    decoder = UnknownIncrementalDecoder(converter)
+    split = len(converter.HEADER) + 5
+    output = decoder.feed(unknown_str[:split])
+    with pytest.raises(ValueError):
+        decoder.feed("zz" + unknown_str[split:])
+    with pytest.raises(ValueError):
+        decoder.feed(unknown_str[split:-1], final=True)
+    assert decoder.position == 1
+    assert output + decoder.feed(unknown_str[split:], final=True) == hex_str
+
+def test_incremental_decoder_header_mismatch():
+    with pytest.raises(ValueError):
+        UnknownIncrementalDecoder().feed("ffff")
+
+def test_entry_context_shared_across_conversions(converter, test_data):
+    context = EntryContext(test_data['hex'])
+    assert converter.hex_to_ascii(context) == converter.hex_to_ascii(test_data['hex'])
+    assert converter.hex_to_unknown(context) == converter.hex_to_unknown(test_data['hex'])
+    assert context.parsed is context.parsed
+    assert context.parsed["hash"] == "0777fff783810100803c3c00fefef0fd"
+
+def test_entry_context_caches_errors(converter):
+    context = EntryContext("invalid hex")
+    with pytest.raises(ValueError):
+        converter.hex_to_ascii(context)
+    assert converter.hex_to_unknown(context) is None
+
+def test_verify_conversion_pair_valid(converter, test_data):
+    unknown_str = converter.hex_to_unknown(test_data['hex'])
+    result = converter.verify_conversion_pair(unknown_str, test_data['hex'])
+    assert result.valid
+    assert result.offset is None
+
+def test_verify_conversion_pair_length_mismatch(converter, test_data):
+    result = converter.verify_conversion_pair(test_data['unknown'], test_data['hex'])
+    assert not result.valid
+    assert result.reason.startswith("Length mismatch")
+
+@pytest.mark.parametrize("position", [0, 100, 399])
+def test_verify_conversion_pair_locates_mismatch(converter, position):
+    original = bytes(range(256)) + bytes(range(144))
+    unknown_str = converter.hex_to_unknown(original.hex())
+    tampered = bytearray(original)
+    tampered[position] ^= 0x01
+
+    result = converter.verify_conversion_pair(unknown_str, tampered.hex())
+    assert not result.valid
+    assert result.offset == position
+    assert result.original == tampered[position]
+    assert result.reconstructed == original[position]
+    assert not converter.validate_conversion_pair(unknown_str, tampered.hex())
+
+@pytest.mark.parametrize("size", [0, 1, 1000])
+def test_transform_file_round_trip(converter, tmp_path, size):
+    data = bytes((i * 7) % 256 for i in range(size))
+    raw = tmp_path / "payload.bin"
+    encoded = tmp_path / "payload.enc"
+    decoded = tmp_path / "payload.dec"
+    raw.write_bytes(data)
+
+    transform_file(raw, encoded, converter=converter, block_size=300)
+    assert encoded.read_bytes().hex() == converter.hex_to_unknown(data.hex())
+
+    transform_file(encoded, decoded, decode=True, converter=converter, block_size=300)
+    assert decoded.read_bytes() == data
+
+def test_transform_file_header_mismatch(tmp_path):
+    bogus = tmp_path / "bogus.enc"
+    bogus.write_bytes(b"\x00" * 40)
+    existing = tmp_path / "out.bin"
+    existing.write_bytes(b"previous output")
+    with pytest.raises(ValueError):
+        transform_file(bogus, existing, decode=True)
+    with pytest.raises(ValueError):
+        transform_file(tmp_path / "out.bin", existing, decode=True)  # shorter than the header
+    # A rejected input leaves an existing output untouched
+    assert existing.read_bytes() == b"previous output"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["bogus.enc", "out.bin"]
+
+def test_transform_file_failure_removes_its_temp_file(tmp_path, monkeypatch):
+    source = tmp_path / "in.bin"
+    source.write_bytes(bytes(range(256)) * 4)
+    output = tmp_path / "out.enc"
+    output.write_bytes(b"previous output")
+    other = tmp_path / "out.enc.tmp"  # Not ours: a fixed temp name would clobber it
+    other.write_bytes(b"someone else's")
+
+    def fail(self, data, position=0):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(CryptoConverter, "encode_bytes", fail)
+    with pytest.raises(RuntimeError):
+        transform_file(source, output, block_size=300)
+    monkeypatch.undo()
+
+    assert output.read_bytes() == b"previous output"
+    assert other.read_bytes() == b"someone else's"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["in.bin", "out.enc", "out.enc.tmp"]
+
+    transform_file(source, output)
+    reference = tmp_path / "reference"
+    reference.touch()
+    assert output.stat().st_mode == reference.stat().st_mode
+
+@pytest.mark.parametrize("offset_mod", [1, 16, 97, 256])
+def test_offset_modulus_consistent_across_engines(offset_mod):
+    profile = CodecProfile('custom', 'ab' * 16, 0x5A, offset_mod)
+    table = CryptoConverter(profile=profile)
+    loop = CryptoConverter(engine='loop', profile=profile)
+    hex_strings = [bytes(i % 256 for i in range(n)).hex() for n in (1, 300, 5000)]
+    for hex_str in hex_strings:
+        unknown_str = loop.hex_to_unknown(hex_str)
+        assert table.hex_to_unknown(hex_str) == unknown_str
+        assert table.unknown_to_hex(unknown_str) == hex_str
+        assert table.verify_conversion_pair(unknown_str, hex_str).valid
+    assert table.encode_many(hex_strings) == [loop.hex_to_unknown(h) for h in hex_strings]
+    assert table.decode_many(table.encode_many(hex_strings)) == hex_strings
+
+def test_entry_context_keeps_the_validating_parse(converter, test_data):
+    context = EntryContext(test_data['hex'])
+    assert converter.hex_to_ascii(context) == bytes.fromhex(test_data['hex']).decode()
+    assert context._parsed is not EntryContext._UNSET
+
+    invalid = EntryContext(b'{"a": '.hex())
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            converter.hex_to_ascii(invalid)
+
+def test_analyze_pattern_without_numpy(converter, test_data, monkeypatch, capsys):
+    monkeypatch.setattr("src.conversions.HAS_NUMPY", False)
+    assert converter.analyze_pattern(test_data['hex'], test_data['unknown']) is None
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Pattern Analysis:"
+    assert len(lines) == 1 + CryptoConverter.CHUNK_SIZE
+
 if __name__ == "__main__":
     pytest.main([__file__])
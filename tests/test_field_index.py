@@ -0,0 +1,56 @@
+# tests/test_field_index.py
+
+import pytest
+from src.field_index import FieldIndex, extract_fields, parse_condition
+
+def test_parse_condition():
+    assert parse_condition("expireTime<1735637240851") == ("expireTime", "<", 1735637240851)
+    assert parse_condition("hash = abc") == ("hash", "=", "abc")
+    assert parse_condition('url>="https://a"') == ("url", ">=", "https://a")
+    with pytest.raises(ValueError):
+        parse_condition("expireTime")
+
+def test_extract_fields_keeps_scalars():
+    parsed = {"hash": "abc", "expireTime": 5, "nested": {"a": 1}, "url": None}
+    assert extract_fields(parsed, ("hash", "expireTime", "nested", "url", "missing")) == \
+        {"hash": "abc", "expireTime": 5}
+    assert extract_fields([1, 2], ("hash",)) == {}
+
+def test_rollback_keeps_previous_index(tmp_path):
+    index = FieldIndex(str(tmp_path / "fields.sqlite"))
+    index.begin("first.json")
+    index.add("a", {"expireTime": 1})
+    index.commit()
+    index.begin("second.json")
+    index.add("b", {"expireTime": 2})
+    index.flush()
+    index.rollback()
+    assert index.query([("expireTime", ">", 0)]) == ["a"]
+    index.close()
+
+def test_integers_beyond_64_bits_are_indexed(tmp_path):
+    index = FieldIndex(str(tmp_path / "fields.sqlite"))
+    index.begin("input.json")
+    index.add("big", {"hash": 123456789012345678901234567890})
+    index.add("huge", {"hash": -10 ** 400})
+    index.add("small", {"hash": 5})
+    index.commit()
+    assert index.query([("hash", ">", 2 ** 64)]) == ["big"]
+    assert index.query([("hash", "<", 0)]) == ["huge"]
+    assert index.query([("hash", "<", 10 ** 29)]) == ["huge", "small"]
+    index.close()
+
+def test_absorb_combines_indexes(tmp_path):
+    for name, entry_id, value in (("a.sqlite", "a", 1), ("b.sqlite", "b", 2)):
+        part = FieldIndex(str(tmp_path / name), ("expireTime",))
+        part.begin("input.json")
+        part.add(entry_id, {"expireTime": value})
+        part.close()
+    index = FieldIndex(str(tmp_path / "merged.sqlite"), ("expireTime",))
+    index.begin("input.json")
+    assert index.absorb(str(tmp_path / "a.sqlite")) + index.absorb(str(tmp_path / "b.sqlite")) == 2
+    index.commit()
+    assert index.query([("expireTime", ">", 0)]) == ["a", "b"]
+    with pytest.raises(ValueError):
+        FieldIndex(str(tmp_path / "other.sqlite")).absorb(str(tmp_path / "a.sqlite"))
+    index.close()
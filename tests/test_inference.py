@@ -0,0 +1,64 @@
+# tests/test_inference.py
+
+import json
+import pytest
+from src.conversions import CodecProfile, CryptoConverter
+from src.inference import infer_profile
+from src.main import main
+from src.profiles import ProfileRegistry
+
+pytest.importorskip("numpy")
+
+def make_pairs(profile, count=40, pad=300):
+    converter = CryptoConverter(profile=profile)
+    pairs = []
+    for i in range(count):
+        hex_str = json.dumps({"hash": f"{i * 7919:032x}", "pad": "x" * (i * pad // count)}).encode().hex()
+        pairs.append((hex_str, converter.hex_to_unknown(hex_str)))
+    return pairs
+
+@pytest.mark.parametrize("profile", [
+    CodecProfile('default', CryptoConverter.HEADER, CryptoConverter.XOR_KEY),
+    CodecProfile('p16', '0123456789abcdef0123456789abcdef', 0x5A, 16),
+    CodecProfile('p97', 'ee' * 16, 0x71, 97),
+])
+def test_infer_recovers_profile(profile):
+    result = infer_profile(make_pairs(profile) + [("zz", "zz")], name=profile.name)
+    assert result.profile == profile
+    assert result.confidence == 1.0
+    assert result.matched_pairs == result.pairs == 40
+    assert result.skipped_pairs == 1
+    assert not result.modulus_ambiguous
+
+def test_infer_reports_ambiguous_modulus_and_mixed_headers():
+    profile = CodecProfile('p200', 'ab' * 16, 0x3C, 200)
+    pairs = make_pairs(profile, pad=50) + make_pairs(CodecProfile('other', 'cd' * 16, 0x3C), count=4)
+    result = infer_profile(pairs)
+    # Payloads never reach position 200, so the default modulus explains them too
+    assert result.modulus_ambiguous
+    assert result.profile == CodecProfile('inferred', profile.header, profile.xor_key, 256)
+    assert result.header_agreement == 40 / 44
+    assert result.matched_pairs == 40
+    assert 0.8 < result.confidence < 1.0
+
+def test_infer_rejects_unusable_pairs():
+    with pytest.raises(ValueError):
+        infer_profile([("zz", "zz"), (None, "ab")])
+
+def test_infer_command_writes_loadable_profile(tmp_path, capsys):
+    profile = CodecProfile('legacy', '0123456789abcdef0123456789abcdef', 0x5A, 16)
+    input_file = tmp_path / "crypto.json"
+    input_file.write_text(json.dumps({
+        f"entry_{i}": {"hex": hex_str, "unknown": unknown_str, "ascii_text": {}}
+        for i, (hex_str, unknown_str) in enumerate(make_pairs(profile))
+    }))
+    profiles_file = tmp_path / "profiles.json"
+
+    assert main(['infer', str(input_file), '--name', 'legacy', '--output', str(profiles_file)]) == 0
+    assert json.loads(capsys.readouterr().out)['confidence'] == 1.0
+    registry = ProfileRegistry.load(str(profiles_file))
+    assert registry['legacy'] == profile
+
+    # Same header again cannot be added to the existing file
+    assert main(['infer', str(input_file), '--output', str(profiles_file)]) == 1
+    assert main(['infer', str(input_file), '--min-confidence', '1.1']) == 1
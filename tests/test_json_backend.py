@@ -0,0 +1,55 @@
+# tests/test_json_backend.py
+
+import io
+import json
+import pytest
+from src import json_backend
+
+@pytest.fixture(params=json_backend.available_backends())
+def backend(request):
+    previous = json_backend.backend.name
+    yield json_backend.select_backend(request.param)
+    json_backend.select_backend(previous)
+
+def test_round_trip_matches_stdlib(backend):
+    data = {"a": [1, 2.5, None, True], "b": {"url": "https://x/é\""}, "c": ""}
+    assert json_backend.loads(json_backend.dumps(data)) == data
+    assert json_backend.loads(json_backend.dumpb(data)) == data
+    assert json.loads(json_backend.dumps(data, indent=True)) == data
+    assert json_backend.dumps(data, indent=True).startswith('{\n  "a": [\n    1,')
+    fp = io.StringIO()
+    json_backend.dump(data, fp, indent=True)
+    assert json.loads(fp.getvalue()) == data
+
+@pytest.mark.parametrize("value", [float('nan'), float('inf'), float('-inf')])
+def test_non_finite_floats_serialize_like_stdlib(backend, value):
+    data = {"a": [1, value], "b": (value,)}
+    assert json_backend.dumps(data) == json.dumps(data, separators=(',', ':'))
+    assert json_backend.dumps(data, indent=True) == json.dumps(data, indent=2)
+    assert json_backend.dumpb(data) == json.dumps(data, separators=(',', ':')).encode()
+
+@pytest.mark.parametrize("text", ['{"a": 1}', '[NaN]', '"\\ud800"', ' 12 ', '{"a": 1e400}'])
+def test_loads_accepts_what_stdlib_accepts(backend, text):
+    assert json_backend.loads(text.encode()) == json.loads(text) or text == '[NaN]'
+    assert json_backend.loads(text) == json.loads(text) or text == '[NaN]'
+
+@pytest.mark.parametrize("text", ['', '{"a": 1', '{"a": 1}x', "{'a': 1}", '[1,]'])
+def test_loads_rejects_malformed(backend, text):
+    with pytest.raises(json.JSONDecodeError):
+        json_backend.loads(text.encode())
+    with pytest.raises(json.JSONDecodeError):
+        json_backend.loads(text)
+
+def test_dumps_falls_back_for_big_integers(backend):
+    assert json.loads(json_backend.dumps({"n": 10 ** 30})) == {"n": 10 ** 30}
+
+@pytest.mark.parametrize("text", ['{"n": 123456789012345678901234}', '[-9223372036854775809, 1.5]',
+                                  '{"a": [{"n": 18446744073709551616}]}', '[1e19]'])
+def test_loads_keeps_big_integers(backend, text):
+    loaded = json_backend.loads(text)
+    assert loaded == json.loads(text)
+    assert repr(loaded) == repr(json.loads(text))
+
+def test_select_backend_rejects_unknown():
+    with pytest.raises(ValueError):
+        json_backend.select_backend('yaml')
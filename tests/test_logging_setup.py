@@ -0,0 +1,52 @@
+# tests/test_logging_setup.py
+
+import logging
+import subprocess
+import sys
+from pathlib import Path
+from logging.handlers import QueueHandler
+from src.logging_setup import ProgressReporter, configure_logging
+
+def test_queue_logging_writes_file_and_restores_root(tmp_path):
+    log_file = tmp_path / "run.log"
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    with configure_logging(log_files=[str(log_file)]):
+        assert any(isinstance(h, QueueHandler) for h in root.handlers)
+        logging.getLogger("src.test").info("entry %d of %s", 3, "input")
+    assert root.handlers == handlers
+    assert "src.test - INFO - entry 3 of input" in log_file.read_text()
+
+def test_debug_level_is_scoped_to_the_package(tmp_path):
+    log_file = tmp_path / "run.log"
+    root = logging.getLogger()
+    previous = root.level
+    with configure_logging(level=logging.DEBUG, log_files=[str(log_file)], use_queue=False):
+        assert root.level == logging.INFO
+        logging.getLogger("src.test").debug("package detail")
+        logging.getLogger("thirdparty").debug("library detail")
+        logging.getLogger("thirdparty").info("library info")
+    assert root.level == previous
+    assert logging.getLogger("src").level == logging.NOTSET
+    text = log_file.read_text()
+    assert "package detail" in text
+    assert "library info" in text
+    assert "library detail" not in text
+
+def test_import_has_no_logging_side_effects(tmp_path):
+    code = "import logging, src.main; assert not logging.getLogger().handlers"
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, check=True,
+                   env={"PYTHONPATH": str(Path(__file__).parents[1])})
+    assert not (tmp_path / "crypto_processor.log").exists()
+
+def test_progress_reporter_is_rate_limited(caplog):
+    progress = ProgressReporter(logging.getLogger("src.test"), every=100, interval=0)
+    progress.total = 1000
+    with caplog.at_level(logging.INFO, logger="src.test"):
+        for done in range(10, 310, 10):
+            progress.position = done * 3
+            progress.update(done)
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 3
+    assert messages[0].startswith("Processed 100 datasets (30.0%")
+    assert "ETA" in messages[0]
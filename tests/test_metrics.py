@@ -0,0 +1,51 @@
+# tests/test_metrics.py
+
+import pickle
+from src.metrics import LatencyHistogram, RunMetrics
+
+def test_histogram_percentiles_bracket_observations():
+    histogram = LatencyHistogram()
+    for i in range(1, 101):
+        histogram.add(i / 1000)
+    assert histogram.count == 100
+    assert 0.050 <= histogram.percentile(0.50) <= 0.050 * 1.2
+    assert 0.099 <= histogram.percentile(0.99) <= 0.100
+    assert histogram.percentile(1.0) == histogram.max == 0.1
+
+def test_histogram_merge_and_amortized_count():
+    first = LatencyHistogram()
+    first.add(0.001, count=10)
+    second = LatencyHistogram()
+    second.add(0.002)
+    first.merge(second)
+    assert first.count == 11
+    assert abs(first.total - 0.012) < 1e-12
+    assert first.max == 0.002
+
+def test_run_metrics_take_merge_and_pickle():
+    worker = RunMetrics()
+    worker.add_stage('convert', 0.5)
+    worker.observe('hex_to_unknown', 0.001, count=4)
+    worker.add_entry(100)
+    shipped = pickle.loads(pickle.dumps(worker.take()))
+    assert worker.entries == 0 and not worker.latencies
+
+    run = RunMetrics()
+    run.add_stage('convert', 0.25)
+    run.merge(shipped)
+    summary = run.summary()
+    assert summary['stage_seconds'] == {'convert': 0.75}
+    assert summary['latency_seconds']['hex_to_unknown']['count'] == 4
+    assert summary['bytes_processed'] == 100
+
+def test_prometheus_textfile(tmp_path):
+    metrics = RunMetrics()
+    metrics.add_stage('load', 0.1)
+    metrics.observe('hex_to_ascii', 0.003)
+    path = tmp_path / "crypto.prom"
+    metrics.write_prometheus(str(path))
+    text = path.read_text()
+    assert 'crypto_processor_stage_seconds{stage="load"} 0.100000' in text
+    assert 'crypto_processor_conversion_latency_seconds_bucket{conversion="hex_to_ascii",le="+Inf"} 1' in text
+    assert 'crypto_processor_conversion_latency_seconds_count{conversion="hex_to_ascii"} 1' in text
+    assert not list(tmp_path.glob("*.tmp"))
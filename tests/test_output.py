@@ -0,0 +1,54 @@
+# tests/test_output.py
+
+import pytest
+from src.output import BinaryResultReader, BinaryResultWriter, ResultWriter
+
+def test_binary_store_lookup_many_keys(tmp_path):
+    path = tmp_path / "results.rbin"
+    with BinaryResultWriter(path) as writer:
+        for i in range(1000):
+            writer.write(f"entry_{i}", {"value": i, "text": "é" * (i % 5)})
+    with BinaryResultReader(path) as reader:
+        assert len(reader) == 1000
+        assert all(reader.get(f"entry_{i}") == {"value": i, "text": "é" * (i % 5)}
+                   for i in range(1000))
+        assert "entry_1000" not in reader
+
+def test_binary_store_keys_do_not_decode_results(tmp_path, monkeypatch):
+    path = tmp_path / "results.rbin"
+    with BinaryResultWriter(path) as writer:
+        for i in range(10):
+            writer.write(f"entry_{i}", {"value": i})
+    with BinaryResultReader(path) as reader:
+        monkeypatch.setattr("src.output.json_backend.loads", lambda data: pytest.fail("decoded a result"))
+        assert list(reader.keys()) == [f"entry_{i}" for i in range(10)]
+
+def test_binary_store_empty_and_incomplete(tmp_path):
+    empty = tmp_path / "empty.rbin"
+    BinaryResultWriter(empty).close()
+    with BinaryResultReader(empty) as reader:
+        assert len(reader) == 0
+        assert reader.get("entry") is None
+        assert list(reader.items()) == []
+
+    incomplete = tmp_path / "incomplete.rbin"
+    writer = BinaryResultWriter(incomplete)
+    writer.write("entry", {"value": 1})
+    writer.flush()
+    with pytest.raises(ValueError):
+        BinaryResultReader(incomplete)
+    writer.close()
+
+def test_binary_store_aborted_write_is_incomplete(tmp_path):
+    path = tmp_path / "aborted.rbin"
+    with pytest.raises(RuntimeError):
+        with BinaryResultWriter(path) as writer:
+            writer.write("entry", {"value": 1})
+            raise RuntimeError("run failed")
+    assert path.stat().st_size > 0
+    with pytest.raises(ValueError, match="incomplete"):
+        BinaryResultReader(path)
+
+def test_result_writer_requires_write(tmp_path):
+    with pytest.raises(TypeError):
+        ResultWriter(tmp_path / "results")
@@ -0,0 +1,52 @@
+# tests/test_prevalidation.py
+
+import json
+from src.conversions import CryptoConverter
+from src.prevalidation import REASONS, rejection_reason, scan_entries, scan_report
+
+converter = CryptoConverter()
+HEADERS = {converter.HEADER}
+
+def make_entry(payload):
+    hex_str = json.dumps(payload).encode('utf-8').hex()
+    return {"hex": hex_str, "unknown": converter.hex_to_unknown(hex_str)}
+
+def test_well_formed_entries_pass():
+    entries = [(f"e{i}", make_entry({"i": i})) for i in range(10)]
+    assert scan_entries(entries, HEADERS) == [None] * 10
+    # Upper-case hex digits are accepted like bytes.fromhex accepts them
+    upper = {"hex": entries[0][1]["hex"].upper(), "unknown": entries[0][1]["unknown"]}
+    assert rejection_reason(upper["hex"], upper["unknown"], HEADERS) is None
+
+def test_each_reason_is_detected():
+    entry = make_entry({"a": 1})
+    hex_str, unknown = entry["hex"], entry["unknown"]
+    cases = {
+        'hex_not_string': (None, unknown),
+        'hex_odd_length': (hex_str[:-1], unknown),
+        'hex_not_hex': ("zz" + hex_str[2:], unknown),
+        'unknown_not_string': (hex_str, 42),
+        'unknown_bad_header': (hex_str, "ff" + unknown[2:]),
+        'unknown_not_hex': (hex_str, unknown[:-2] + "g0"),
+        'length_ratio': (hex_str, unknown + "00"),
+    }
+    assert set(cases) == set(REASONS)
+    for reason, (h, u) in cases.items():
+        assert rejection_reason(h, u, HEADERS) == reason
+    # Non-ASCII text is rejected without raising
+    assert rejection_reason("é" * 2, unknown, HEADERS) == 'hex_not_hex'
+
+def test_bad_entry_falls_back_to_per_entry_reasons():
+    entries = [(f"e{i}", make_entry({"i": i})) for i in range(4)]
+    entries.insert(2, ("bad", {"hex": "zz", "unknown": "zz"}))
+    entries.append(("missing", {}))
+    assert scan_entries(entries, HEADERS) == [None, None, 'hex_not_hex', None, None, 'hex_not_string']
+
+def test_scan_report_counts_and_limits():
+    entries = [(f"e{i}", make_entry({"i": i})) for i in range(5)]
+    entries += [(f"bad{i}", {"hex": "0", "unknown": ""}) for i in range(3)]
+    report = scan_report(iter(entries), HEADERS, batch_size=2, limit=2)
+    assert report['total_entries'] == 8
+    assert report['rejected_entries'] == 3
+    assert report['rejection_reasons'] == {'hex_odd_length': 3}
+    assert report['rejected'] == {'bad0': 'hex_odd_length', 'bad1': 'hex_odd_length'}
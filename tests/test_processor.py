@@ -0,0 +1,576 @@
+# tests/test_processor.py
+
+import json
+import logging
+import pstats
+import time
+import pytest
+from src import json_backend
+from src.cache import ConversionCache
+from src.conversions import CodecProfile, CryptoConverter
+from src.field_index import FieldIndex
+from src.main import CryptoProcessor, main
+from src.output import BinaryResultReader, JsonResultWriter
+from src.profiles import ProfileRegistry
+from src.results import EntryResult
+from src.sharding import Shard
+from src.utils import ValidationError
+
+def make_entry(converter, payload):
+    hex_str = json.dumps(payload).encode('utf-8').hex()
+    return {
+        "hex": hex_str,
+        "unknown": converter.hex_to_unknown(hex_str),
+        "ascii_text": payload
+    }
+
+@pytest.fixture
+def dataset(tmp_path):
+    converter = CryptoConverter()
+    data = {
+        f"entry_{i}": make_entry(converter, {"hash": f"{i:032x}", "expireTime": 1735637240851 + i})
+        for i in range(5)
+    }
+    data["entry_bad"] = {"hex": "zz", "unknown": "zz", "ascii_text": {}}
+    input_file = tmp_path / "crypto.json"
+    input_file.write_text(json.dumps(data))
+    return input_file
+
+def read_outputs(output_dir):
+    detailed = json.loads(next(output_dir.glob("detailed_results_*.json")).read_text())
+    summary = json.loads(next(output_dir.glob("summary_*.json")).read_text())
+    return detailed, summary
+
+def test_batched_run_matches_per_entry(dataset, tmp_path):
+    batched_dir = tmp_path / "batched"
+    single_dir = tmp_path / "single"
+    CryptoProcessor(str(dataset), str(batched_dir), batch_size=2).process_all_data()
+    CryptoProcessor(str(dataset), str(single_dir), batch_size=0).process_all_data()
+
+    batched, batched_summary = read_outputs(batched_dir)
+    single, single_summary = read_outputs(single_dir)
+    assert batched == single
+    assert batched_summary['validation_stats'] == single_summary['validation_stats']
+    assert batched_summary['total_entries'] == 6
+
+def test_iter_entries_streams_in_order(dataset, tmp_path):
+    processor = CryptoProcessor(str(dataset), str(tmp_path / "out"))
+    keys = [key for key, _ in processor.iter_entries()]
+    assert keys == list(json.loads(dataset.read_text()))
+
+def test_process_batch_matches_run(dataset, tmp_path):
+    CryptoProcessor(str(dataset), str(tmp_path / "run")).process_all_data()
+    detailed, summary = read_outputs(tmp_path / "run")
+
+    processor = CryptoProcessor(None, str(tmp_path / "batch"))
+    results, batch_summary = processor.process_batch(json.loads(dataset.read_text()))
+    assert {key: result.to_dict() for key, result in results.items()} == detailed
+    assert batch_summary['validation_stats'] == summary['validation_stats']
+    assert batch_summary['total_entries'] == 6
+    with pytest.raises(ValidationError):
+        processor.process_batch({"a": {"hex": "00"}})
+    with pytest.raises(ValidationError):
+        processor.load_data()
+
+def test_duplicate_entry_across_input_files_raises(dataset, tmp_path):
+    data = json.loads(dataset.read_text())
+    input_dir = tmp_path / "inputs"
+    input_dir.mkdir()
+    (input_dir / "a.json").write_text(json.dumps(dict(list(data.items())[:3])))
+    (input_dir / "b.json").write_text(json.dumps(dict(list(data.items())[2:])))
+    processor = CryptoProcessor(str(input_dir), str(tmp_path / "out"))
+    with pytest.raises(ValidationError, match="entry_2"):
+        processor.load_data()
+    with pytest.raises(ValidationError, match="entry_2"):
+        list(processor.iter_entries())
+
+    (input_dir / "b.json").write_text(json.dumps(dict(list(data.items())[3:])))
+    assert processor.load_data() == data
+    assert list(processor.iter_entries()) == list(data.items())
+
+def test_invalid_entry_raises(tmp_path):
+    input_file = tmp_path / "crypto.json"
+    input_file.write_text(json.dumps({"a": {"hex": "00"}}))
+    processor = CryptoProcessor(str(input_file), str(tmp_path / "out"))
+    with pytest.raises(ValidationError):
+        processor.process_all_data()
+
+def test_ndjson_output_matches_json(dataset, tmp_path):
+    json_dir = tmp_path / "json"
+    ndjson_dir = tmp_path / "ndjson"
+    CryptoProcessor(str(dataset), str(json_dir)).process_all_data()
+    CryptoProcessor(str(dataset), str(ndjson_dir), output_format='ndjson').process_all_data()
+
+    detailed, summary = read_outputs(json_dir)
+    lines = next(ndjson_dir.glob("detailed_results_*.ndjson")).read_text().splitlines()
+    streamed = {}
+    for line in lines:
+        record = json.loads(line)
+        streamed[record.pop('entry_id')] = record
+    assert streamed == detailed
+
+    ndjson_summary = json.loads(next(ndjson_dir.glob("summary_*.json")).read_text())
+    assert ndjson_summary['validation_stats'] == summary['validation_stats']
+
+def test_worker_pool_preserves_order_and_stats(dataset, tmp_path):
+    serial_dir = tmp_path / "serial"
+    pool_dir = tmp_path / "pool"
+    CryptoProcessor(str(dataset), str(serial_dir)).process_all_data()
+    CryptoProcessor(str(dataset), str(pool_dir), workers=2, chunk_size=2).process_all_data()
+
+    serial, serial_summary = read_outputs(serial_dir)
+    pooled, pooled_summary = read_outputs(pool_dir)
+    assert list(pooled) == list(serial)
+    assert pooled == serial
+    assert pooled_summary['validation_stats'] == serial_summary['validation_stats']
+    assert pooled_summary['total_entries'] == serial_summary['total_entries']
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pipelined_run_matches_sequential(dataset, tmp_path, workers):
+    sequential_dir = tmp_path / "sequential"
+    pipelined_dir = tmp_path / "pipelined"
+    CryptoProcessor(str(dataset), str(sequential_dir)).process_all_data()
+    processor = CryptoProcessor(str(dataset), str(pipelined_dir), batch_size=2,
+                                workers=workers, chunk_size=2)
+    processor.process_all_data_pipelined(queue_size=1)
+
+    sequential, sequential_summary = read_outputs(sequential_dir)
+    pipelined, pipelined_summary = read_outputs(pipelined_dir)
+    assert list(pipelined) == list(sequential)
+    assert pipelined == sequential
+    assert pipelined_summary['validation_stats'] == sequential_summary['validation_stats']
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_conversion_cache_reused_across_runs(dataset, tmp_path, workers):
+    cache_path = str(tmp_path / "cache.sqlite")
+    first_dir = tmp_path / "first"
+    second_dir = tmp_path / "second"
+    CryptoProcessor(str(dataset), str(first_dir), cache_path=cache_path,
+                    workers=workers, chunk_size=2).process_all_data()
+    CryptoProcessor(str(dataset), str(second_dir), cache_path=cache_path,
+                    workers=workers, chunk_size=2).process_all_data()
+
+    first, first_summary = read_outputs(first_dir)
+    second, second_summary = read_outputs(second_dir)
+    assert second == first
+    assert first_summary['cache']['hits'] == 0
+    assert second_summary['cache']['misses'] < first_summary['cache']['misses']
+    assert second_summary['cache']['hits'] > 0
+
+def test_warm_cache_run_converts_nothing(dataset, tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "cache.sqlite")
+    processor = CryptoProcessor(str(dataset), str(tmp_path / "first"), cache_path=cache_path)
+    processor.process_all_data()
+    processor.close()
+
+    calls = []
+    for name in ("hex_to_ascii", "hex_to_unknown", "unknown_to_hex", "encode_many", "decode_many"):
+        original = getattr(CryptoConverter, name)
+        def spy(self, *args, _original=original, **kwargs):
+            calls.append(_original.__name__)
+            return _original(self, *args, **kwargs)
+        monkeypatch.setattr(CryptoConverter, name, spy)
+    CryptoProcessor(str(dataset), str(tmp_path / "second"), cache_path=cache_path).process_all_data()
+
+    assert calls == []
+    first, _ = read_outputs(tmp_path / "first")
+    second, second_summary = read_outputs(tmp_path / "second")
+    assert second == first
+    # entry_bad is rejected by prevalidation before the cache lookup
+    assert second_summary['cache']['hits'] == len(first) - 1
+    assert second_summary['cache']['misses'] == 0
+
+def test_result_version_bump_invalidates_cached_results(dataset, tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "cache.sqlite")
+    processor = CryptoProcessor(str(dataset), str(tmp_path / "first"), cache_path=cache_path)
+    processor.process_all_data()
+    processor.close()
+
+    monkeypatch.setattr(ConversionCache, "ENTRY_VERSION", ConversionCache.ENTRY_VERSION + 1)
+    CryptoProcessor(str(dataset), str(tmp_path / "second"), cache_path=cache_path).process_all_data()
+    second_summary = read_outputs(tmp_path / "second")[1]
+    assert second_summary['cache']['hits'] == 0
+    assert second_summary['cache']['misses'] > 0
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_failed_run_keeps_cached_conversions(dataset, tmp_path, monkeypatch, pipelined):
+    cache_path = str(tmp_path / "cache.sqlite")
+    def failing_close(writer):
+        raise OSError("disk full")
+    with monkeypatch.context() as patch:
+        patch.setattr(JsonResultWriter, "close", failing_close)
+        processor = CryptoProcessor(str(dataset), str(tmp_path / "failed"), cache_path=cache_path)
+        with pytest.raises(OSError):
+            run_processor(processor, pipelined)
+        processor.close()
+
+    CryptoProcessor(str(dataset), str(tmp_path / "rerun"), cache_path=cache_path).process_all_data()
+    assert read_outputs(tmp_path / "rerun")[1]['cache']['misses'] == 0
+
+def test_cache_limits_of_zero_are_applied(dataset, tmp_path):
+    cache_path = str(tmp_path / "cache.sqlite")
+    output_dir = tmp_path / "out"
+    assert main([str(dataset), '--output-dir', str(output_dir), '--cache', cache_path,
+                 '--cache-max-mb', '0', '--no-log-file']) == 0
+    assert read_outputs(output_dir)[1]['cache']['evicted'] > 0
+
+def run_processor(processor, pipelined):
+    if pipelined:
+        processor.process_all_data_pipelined()
+    else:
+        processor.process_all_data()
+
+@pytest.mark.parametrize("workers, pipelined", [(1, False), (2, False), (1, True)])
+def test_resume_reuses_unchanged_entries(dataset, tmp_path, workers, pipelined):
+    output_dir = tmp_path / "out"
+    CryptoProcessor(str(dataset), str(output_dir), resume=True).process_all_data()
+
+    # Change one entry and add one; the rest must come from the checkpoint
+    data = json.loads(dataset.read_text())
+    converter = CryptoConverter()
+    data["entry_0"] = make_entry(converter, {"hash": "changed"})
+    data["entry_new"] = make_entry(converter, {"hash": "new"})
+    dataset.write_text(json.dumps(data))
+    for path in output_dir.glob("*_results_*.json"):
+        path.unlink()
+    for path in output_dir.glob("summary_*.json"):
+        path.unlink()
+
+    run_processor(CryptoProcessor(str(dataset), str(output_dir), resume=True, workers=workers,
+                                  batch_size=2, chunk_size=3), pipelined)
+    detailed, summary = read_outputs(output_dir)
+    assert summary['checkpoint']['reused_entries'] == 5
+    assert summary['total_entries'] == 7
+    # Reused and recomputed results are written in input order
+    assert list(detailed) == list(data)
+    assert detailed["entry_0"]['conversions']['hex_to_ascii'] == '{"hash": "changed"}'
+
+    fresh_dir = tmp_path / "fresh"
+    CryptoProcessor(str(dataset), str(fresh_dir)).process_all_data()
+    fresh, fresh_summary = read_outputs(fresh_dir)
+    assert detailed == fresh
+    assert summary['validation_stats'] == fresh_summary['validation_stats']
+
+    manifest = (output_dir / "checkpoint_manifest.ndjson").read_text().splitlines()
+    assert len(manifest) == 7
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_summary_includes_run_metrics(dataset, tmp_path, workers):
+    output_dir = tmp_path / "out"
+    prometheus_file = tmp_path / "crypto.prom"
+    CryptoProcessor(str(dataset), str(output_dir), batch_size=2, workers=workers,
+                    chunk_size=2, prometheus_file=str(prometheus_file)).process_all_data()
+
+    _, summary = read_outputs(output_dir)
+    metrics = summary['metrics']
+    assert set(metrics['stage_seconds']) == {'load', 'validate', 'convert', 'save'}
+    latencies = metrics['latency_seconds']
+    # entry_bad is rejected by pre-validation and never converted
+    assert latencies['conversion_pair']['count'] == 5
+    assert latencies['hex_to_unknown']['count'] == 5
+    assert latencies['hex_to_ascii']['p50'] <= latencies['hex_to_ascii']['p99']
+    assert metrics['bytes_processed'] == sum(len(e['hex']) // 2 for e in json.loads(dataset.read_text()).values())
+    assert metrics['throughput_mb_s'] > 0
+    assert 'crypto_processor_entries_processed 6' in prometheus_file.read_text()
+
+def test_save_stage_includes_writer_close(dataset, tmp_path, monkeypatch):
+    original_close = JsonResultWriter.close
+
+    def slow_close(writer):
+        time.sleep(0.05)
+        original_close(writer)
+
+    monkeypatch.setattr(JsonResultWriter, 'close', slow_close)
+    output_dir = tmp_path / "out"
+    CryptoProcessor(str(dataset), str(output_dir)).process_all_data()
+    detailed, summary = read_outputs(output_dir)
+    assert len(detailed) == 6
+    assert summary['metrics']['stage_seconds']['save'] >= 0.05
+
+def test_progress_is_logged_per_threshold(dataset, tmp_path, caplog):
+    processor = CryptoProcessor(str(dataset), str(tmp_path / "out"), progress_every=4,
+                                progress_interval=0)
+    with caplog.at_level(logging.INFO, logger="src.main"):
+        processor.process_all_data()
+    progress = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Processed ")]
+    assert len(progress) == 2
+    assert progress[0].startswith("Processed 6 datasets (100.0%")
+    assert progress[1].startswith("Processed 6 datasets in ")
+
+def test_compact_output_expands_to_full_results(dataset, tmp_path):
+    full_dir = tmp_path / "full"
+    compact_dir = tmp_path / "compact"
+    CryptoProcessor(str(dataset), str(full_dir)).process_all_data()
+    CryptoProcessor(str(dataset), str(compact_dir), compact_output=True).process_all_data()
+
+    full, full_summary = read_outputs(full_dir)
+    compact, compact_summary = read_outputs(compact_dir)
+    entries = json.loads(dataset.read_text())
+    assert all('original' not in result for result in compact.values())
+    assert {key: EntryResult.from_dict(entries[key], result).to_dict()
+            for key, result in compact.items()} == full
+    assert compact_summary['validation_stats'] == full_summary['validation_stats']
+    assert (next(compact_dir.glob("detailed_results_*.json")).stat().st_size * 2
+            < next(full_dir.glob("detailed_results_*.json")).stat().st_size)
+
+def test_binary_output_random_access(dataset, tmp_path, capsys):
+    json_dir = tmp_path / "json"
+    binary_dir = tmp_path / "binary"
+    CryptoProcessor(str(dataset), str(json_dir)).process_all_data()
+    CryptoProcessor(str(dataset), str(binary_dir), output_format='binary').process_all_data()
+
+    detailed, _ = read_outputs(json_dir)
+    path = next(binary_dir.glob("detailed_results_*.rbin"))
+    with BinaryResultReader(path) as reader:
+        assert len(reader) == len(detailed)
+        assert dict(reader.items()) == detailed
+        assert list(reader.keys()) == list(detailed)
+        assert reader.get("entry_3") == detailed["entry_3"]
+        assert reader.get("missing") is None
+
+    assert main(["lookup", str(path), "entry_bad"]) == 0
+    assert json.loads(capsys.readouterr().out) == {"entry_bad": detailed["entry_bad"]}
+    assert main(["lookup", str(path), "missing"]) == 1
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_field_index_queries(dataset, tmp_path, capsys, workers):
+    index_path = tmp_path / "fields.sqlite"
+    CryptoProcessor(str(dataset), str(tmp_path / "out"), index_path=str(index_path),
+                    workers=workers, chunk_size=2).process_all_data()
+
+    index = FieldIndex(str(index_path))
+    assert index.query([("expireTime", "<", 1735637240853)]) == ["entry_0", "entry_1"]
+    assert index.query([("expireTime", ">=", 1735637240852),
+                        ("hash", "!=", f"{3:032x}")]) == ["entry_1", "entry_2", "entry_4"]
+    assert index.query([("hash", "=", f"{4:032x}")]) == ["entry_4"]
+    index.close()
+
+    assert main(["query", str(index_path), "expireTime<=1735637240851"]) == 0
+    assert capsys.readouterr().out.split() == ["entry_0"]
+    assert main(["query", str(index_path), "--count", "hash>" + f"{1:032x}"]) == 0
+    assert capsys.readouterr().out.strip() == "3"
+
+def test_log_file_option_replaces_default_log_file(dataset, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    log_file = tmp_path / "logs" / "run.log"
+    log_file.parent.mkdir()
+    assert main([str(dataset), '--output-dir', str(tmp_path / "out"), '--log-file', str(log_file)]) == 0
+    assert "Success rate" in log_file.read_text()
+    assert main([str(dataset), '--output-dir', str(tmp_path / "out"), '--no-log-file']) == 0
+    assert not (tmp_path / "crypto_processor.log").exists()
+
+def test_run_without_index_does_not_extract_fields(dataset, tmp_path, monkeypatch):
+    payloads = {entry["hex"] for entry in json.loads(dataset.read_text()).values()}
+    parsed = []
+    def spy(loads):
+        def spied(self, data):
+            text = data.decode() if isinstance(data, bytes) else data
+            if text.encode().hex() in payloads:
+                parsed.append(text)
+            return loads(self, data)
+        return spied
+    # main() selects a fresh backend instance, so patch every backend class
+    for backend_class in json_backend.BACKENDS.values():
+        monkeypatch.setattr(backend_class, "loads", spy(backend_class.loads))
+    extracted = []
+    monkeypatch.setattr("src.main.extract_fields", lambda *args: extracted.append(args) or {})
+    output_dir = tmp_path / "out"
+    assert main([str(dataset), '--output-dir', str(output_dir), '--no-log-file']) == 0
+    assert not extracted
+    # Only hex_to_ascii's validating parse, once per payload
+    assert len(parsed) == len(set(parsed)) == 5
+    assert read_outputs(output_dir)[1]['successful_conversions'] == 5
+
+def test_field_index_covers_reused_entries(dataset, tmp_path):
+    index_path = tmp_path / "fields.sqlite"
+    output_dir = tmp_path / "out"
+    for _ in range(2):
+        CryptoProcessor(str(dataset), str(output_dir), resume=True,
+                        index_path=str(index_path)).process_all_data()
+    index = FieldIndex(str(index_path))
+    assert index.query([("expireTime", ">", 0)]) == [f"entry_{i}" for i in range(5)]
+    index.close()
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_profiles_route_mixed_input(tmp_path, workers):
+    alt = CodecProfile('alt', '0123456789abcdef0123456789abcdef', 0x5A)
+    profiles_file = tmp_path / "profiles.json"
+    ProfileRegistry([alt]).save(str(profiles_file))
+    converters = [CryptoConverter(), CryptoConverter(profile=alt)]
+    data = {f"entry_{i}": make_entry(converters[i % 2], {"hash": f"{i:032x}"}) for i in range(6)}
+    data["entry_other"] = {"hex": "00", "unknown": "ff" * 17, "ascii_text": {}}
+    input_file = tmp_path / "crypto.json"
+    input_file.write_text(json.dumps(data))
+
+    output_dir = tmp_path / "out"
+    CryptoProcessor(
+        str(input_file), str(output_dir), batch_size=4, workers=workers, chunk_size=3,
+        profiles_path=str(profiles_file)
+    ).process_all_data()
+    detailed, summary = read_outputs(output_dir)
+    assert [detailed[f"entry_{i}"]['profile'] for i in range(6)] == ['default', 'alt'] * 3
+    assert 'profile' not in detailed["entry_other"]
+    assert all(detailed[f"entry_{i}"]['validations']['conversion_pair_valid'] for i in range(6))
+    assert summary['profile_stats'] == {
+        'default': {'total_entries': 3, 'successful_conversions': 3, 'conversion_pair_valid': 3},
+        'alt': {'total_entries': 3, 'successful_conversions': 3, 'conversion_pair_valid': 3},
+    }
+    assert summary['unmatched_profile_entries'] == 1
+
+def test_json_backends_produce_same_results(dataset, tmp_path):
+    previous = json_backend.backend.name
+    outputs = []
+    try:
+        for name in json_backend.available_backends():
+            output_dir = tmp_path / name
+            json_backend.select_backend(name)
+            processor = CryptoProcessor(str(dataset), str(output_dir))
+            assert processor.load_data() == json.loads(dataset.read_text())
+            processor.process_all_data()
+            outputs.append(read_outputs(output_dir)[0])
+    finally:
+        json_backend.select_backend(previous)
+    assert all(output == outputs[0] for output in outputs)
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson", "binary"])
+def test_sharded_runs_merge_to_full_run(dataset, tmp_path, output_format):
+    full_dir = tmp_path / "full"
+    CryptoProcessor(str(dataset), str(full_dir)).process_all_data()
+    full, full_summary = read_outputs(full_dir)
+
+    shard_dir = tmp_path / "shards"
+    for index in range(3):
+        assert main([str(dataset), '--output-dir', str(shard_dir), '--shard', f"{index}/3",
+                     '--output-format', output_format, '--resume', '--no-log-file']) == 0
+    assert len(list(shard_dir.glob("summary_*_shard-*-of-3.json"))) == 3
+
+    merged_dir = tmp_path / "merged"
+    assert main(['merge', str(shard_dir), '--output-dir', str(merged_dir), '--no-log-file']) == 0
+    merged, merged_summary = read_outputs(merged_dir)
+    assert merged == full
+    for key in ('total_entries', 'successful_conversions', 'failed_conversions',
+                'validation_stats', 'success_rate'):
+        assert merged_summary[key] == full_summary[key]
+    assert merged_summary['shards'] == {'count': 3, 'merged': [0, 1, 2], 'missing': []}
+
+def test_merge_requires_all_shards(dataset, tmp_path):
+    shard_dir = tmp_path / "shards"
+    assert main([str(dataset), '--output-dir', str(shard_dir), '--shard', "0/2", '--no-log-file']) == 0
+    assert main(['merge', str(shard_dir), '--output-dir', str(tmp_path / "merged"), '--no-log-file']) == 1
+    assert main(['merge', str(shard_dir), '--output-dir', str(tmp_path / "merged"), '--allow-missing',
+                 '--no-log-file']) == 0
+
+def test_sharded_indexes_merge_to_full_index(dataset, tmp_path):
+    shard_dir = tmp_path / "shards"
+    index_path = tmp_path / "fields.sqlite"
+    for index in range(3):
+        assert main([str(dataset), '--output-dir', str(shard_dir), '--shard', f"{index}/3",
+                     '--index', str(index_path), '--no-log-file']) == 0
+    shard_indexes = sorted(tmp_path.glob("fields_shard-*-of-3.sqlite"))
+    assert len(shard_indexes) == 3 and not index_path.exists()
+
+    merged_index = tmp_path / "merged.sqlite"
+    assert main(['merge', str(shard_dir), '--output-dir', str(tmp_path / "merged"),
+                 '--index', str(merged_index), '--no-log-file']) == 0
+    index = FieldIndex(str(merged_index))
+    assert index.query([("expireTime", ">", 0)]) == [f"entry_{i}" for i in range(5)]
+    index.close()
+
+    # Every shard must have been indexed
+    unindexed = tmp_path / "unindexed"
+    assert main([str(dataset), '--output-dir', str(unindexed), '--no-log-file']) == 0
+    assert main(['merge', str(unindexed), '--output-dir', str(tmp_path / "merged2"),
+                 '--index', str(tmp_path / "merged2.sqlite"), '--no-log-file']) == 1
+
+def test_directory_input_with_shards(dataset, tmp_path):
+    data = json.loads(dataset.read_text())
+    input_dir = tmp_path / "inputs"
+    input_dir.mkdir()
+    keys = list(data)
+    (input_dir / "part1.json").write_text(json.dumps({key: data[key] for key in keys[:3]}))
+    (input_dir / "part2.json").write_text(json.dumps({key: data[key] for key in keys[3:]}))
+
+    seen = []
+    for index in range(2):
+        processor = CryptoProcessor(str(input_dir), str(tmp_path / "out"), shard=Shard(index, 2))
+        seen += [key for key, _ in processor.iter_entries()]
+        assert set(processor.load_data()) == {key for key in keys if Shard(index, 2).contains(key)}
+    assert sorted(seen) == sorted(keys)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_prevalidation_rejects_malformed_entries(dataset, tmp_path, workers):
+    data = json.loads(dataset.read_text())
+    good = data["entry_0"]
+    data["entry_short"] = {**good, "unknown": good["unknown"][:-2]}
+    data["entry_header"] = {**good, "unknown": "00" * 16 + good["unknown"][32:]}
+    dataset.write_text(json.dumps(data))
+
+    output_dir = tmp_path / "out"
+    CryptoProcessor(str(dataset), str(output_dir), batch_size=2, workers=workers,
+                    chunk_size=3).process_all_data()
+    detailed, summary = read_outputs(output_dir)
+    assert detailed["entry_bad"]['rejected'] == 'hex_not_hex'
+    assert detailed["entry_bad"]['validations'] == {}
+    assert detailed["entry_short"]['rejected'] == 'length_ratio'
+    assert detailed["entry_header"]['rejected'] == 'unknown_bad_header'
+    assert all('rejected' not in detailed[f"entry_{i}"] for i in range(5))
+    assert summary['rejected_entries'] == 3
+    assert summary['rejection_reasons'] == {'hex_not_hex': 1, 'length_ratio': 1, 'unknown_bad_header': 1}
+    assert summary['validation_stats']['conversion_pair_valid'] == 5
+
+    # Without the pre-pass the same entries still fail, through the conversions
+    unchecked_dir = tmp_path / "unchecked"
+    CryptoProcessor(str(dataset), str(unchecked_dir), prevalidate=False).process_all_data()
+    unchecked, unchecked_summary = read_outputs(unchecked_dir)
+    assert unchecked_summary['rejected_entries'] == 0
+    assert unchecked_summary['validation_stats']['conversion_pair_valid'] == 5
+    assert not unchecked["entry_bad"]['validations']['hex_to_unknown_valid']
+
+def test_scan_command_reports_rejections(dataset, capsys):
+    assert main(['scan', str(dataset)]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report == {
+        'total_entries': 6, 'rejected_entries': 1,
+        'rejection_reasons': {'hex_not_hex': 1}, 'rejected': {'entry_bad': 'hex_not_hex'}
+    }
+
+def test_profiled_run_writes_stage_profiles(dataset, tmp_path):
+    output_dir = tmp_path / "out"
+    assert main([str(dataset), '--output-dir', str(output_dir), '--batch-size', '2', '--chunk-size', '2',
+                 '--profile', '--profile-sample-rate', '0.5', '--profile-top', '2', '--no-log-file']) == 0
+    detailed, summary = read_outputs(output_dir)
+    profile = summary['profile']
+    assert profile['sample_rate'] == 0.5
+    for stage in ('load', 'process', 'save'):
+        stats = profile['stages'][stage]
+        assert stats['sampled'] == (stats['calls'] + 1) // 2
+        assert (output_dir / stats['pstats']).exists()
+        assert (output_dir / stats['memory']).exists()
+    slowest = profile['slowest_entries']
+    assert len(slowest) == 2
+    assert slowest[0]['seconds'] >= slowest[1]['seconds']
+    # Rejected entries are never converted, so they are not timed
+    assert all(entry['entry_id'] in detailed and entry['entry_id'] != "entry_bad" for entry in slowest)
+
+def test_profiled_run_accepts_non_string_hex(tmp_path):
+    input_file = tmp_path / "crypto.json"
+    input_file.write_text(json.dumps({"a": {"hex": 5, "unknown": "zz", "ascii_text": {}}}))
+    output_dir = tmp_path / "out"
+    assert main([str(input_file), '--output-dir', str(output_dir), '--profile', '--no-prevalidate',
+                 '--no-log-file']) == 0
+    detailed, summary = read_outputs(output_dir)
+    assert detailed["a"]['errors']
+    # The JSON writer's dump at close and the summary write are part of the save stage
+    save_stats = pstats.Stats(str(output_dir / summary['profile']['stages']['save']['pstats'])).stats
+    assert {'close', '_write_summary'} <= {name for path, _, name in save_stats}
+    assert summary['profile']['slowest_entries'][0] == {
+        'entry_id': "a", 'bytes': 0, 'seconds': summary['profile']['slowest_entries'][0]['seconds']
+    }
+
+def test_profiling_needs_in_process_run(dataset, tmp_path):
+    with pytest.raises(ValueError):
+        CryptoProcessor(str(dataset), str(tmp_path / "out"), workers=2, profiling=True)
+    with pytest.raises(ValueError):
+        CryptoProcessor(str(dataset), str(tmp_path / "out"), profiling=True).process_all_data_pipelined()
+    with pytest.raises(SystemExit):
+        main([str(dataset), '--output-dir', str(tmp_path / "out"), '--profile', '--pipeline'])
@@ -0,0 +1,68 @@
+# tests/test_profiles.py
+
+import json
+import pytest
+from src.conversions import CodecProfile, CryptoConverter
+from src.profiles import DEFAULT_PROFILE, ProfileRegistry
+
+ALT = CodecProfile('alt', '0123456789abcdef0123456789abcdef', 0x5A)
+
+def test_detect_routes_by_header():
+    registry = ProfileRegistry([DEFAULT_PROFILE, ALT])
+    hex_str = b'{"a": 1}'.hex()
+    alt_unknown = CryptoConverter(profile=ALT).hex_to_unknown(hex_str)
+    default_unknown = CryptoConverter().hex_to_unknown(hex_str)
+
+    assert registry.detect(alt_unknown) == ALT
+    assert registry.detect(default_unknown) == DEFAULT_PROFILE
+    assert registry.detect(alt_unknown.upper()) == ALT
+    assert registry.detect('ff' * 20) is None
+    assert registry.detect(None) is None
+    assert registry.unknown_to_hex(alt_unknown) == hex_str
+    assert registry.unknown_to_hex(default_unknown) == hex_str
+    with pytest.raises(ValueError):
+        registry.unknown_to_hex('ff' * 20)
+
+def test_profile_changes_encoding():
+    hex_str = b'{"a": 1}'.hex()
+    alt = CryptoConverter(profile=ALT)
+    unknown_str = alt.hex_to_unknown(hex_str)
+    assert unknown_str.startswith(ALT.header)
+    assert unknown_str[32:] != CryptoConverter().hex_to_unknown(hex_str)[32:]
+    assert alt.unknown_to_hex(unknown_str) == hex_str
+
+@pytest.mark.parametrize("profile", [
+    CodecProfile('short', 'abc', 0x10),
+    CodecProfile('nothex', 'z' * 32, 0x10),
+    CodecProfile('bigkey', '1' * 32, 0x100),
+    CodecProfile('nomod', '2' * 32, 0x10, 0),
+    CodecProfile('bigmod', '2' * 32, 0x10, 257),
+    CodecProfile('default', '1' * 32, 0x10),
+    CodecProfile('samehdr', DEFAULT_PROFILE.header.upper(), 0x10),
+])
+def test_register_rejects_invalid_profiles(profile):
+    registry = ProfileRegistry()
+    with pytest.raises(ValueError):
+        registry.register(profile)
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"profiles": [
+        {"name": "alt", "header": ALT.header.upper(), "xor_key": "0x5a"}
+    ]}))
+    registry = ProfileRegistry.load(str(path))
+    assert [profile.name for profile in registry] == ['default', 'alt']
+    assert registry.default == DEFAULT_PROFILE
+    assert registry['alt'] == ALT
+
+    registry.save(str(tmp_path / "saved.json"))
+    reloaded = ProfileRegistry.load(str(tmp_path / "saved.json"), include_default=False)
+    assert list(reloaded) == list(registry)
+    assert reloaded.signature() == registry.signature()
+    assert ProfileRegistry.load(str(path), include_default=False).signature() != registry.signature()
+
+def test_load_rejects_malformed_file(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"profiles": [{"name": "alt"}]}))
+    with pytest.raises(ValueError):
+        ProfileRegistry.load(str(path))
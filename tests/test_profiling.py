@@ -0,0 +1,65 @@
+# tests/test_profiling.py
+
+import pstats
+import pytest
+from src.profiling import STAGES, RunProfiler
+
+def run_stage(profiler, stage, calls):
+    for _ in range(calls):
+        with profiler.stage(stage):
+            [bytes(64) for _ in range(100)]
+
+def test_sampling_spreads_profiled_calls():
+    profiler = RunProfiler(sample_rate=0.25, memory=False)
+    run_stage(profiler, 'process', 10)
+    assert profiler.calls['process'] == 10
+    # The first call, then one in four
+    assert profiler.sampled['process'] == 3
+
+    everything = RunProfiler(sample_rate=1.0, memory=False)
+    run_stage(everything, 'save', 5)
+    assert everything.sampled['save'] == 5
+
+def test_nested_stages_are_not_profiled_twice():
+    profiler = RunProfiler(memory=False)
+    with profiler.stage('load'):
+        with profiler.stage('process'):
+            pass
+    assert profiler.sampled == {'load': 1, 'process': 0, 'save': 0}
+
+def test_slowest_entries_are_bounded_and_ordered():
+    profiler = RunProfiler(top_entries=3)
+    for i, seconds in enumerate([0.5, 0.1, 0.9, 0.3, 0.7, 0.7]):
+        profiler.observe_entry(f"e{i}", 10 * i, seconds)
+    assert [entry['entry_id'] for entry in profiler.slowest_entries()] == ['e2', 'e4', 'e5']
+    assert profiler.slowest_entries()[0] == {'entry_id': 'e2', 'bytes': 20, 'seconds': 0.9}
+
+def test_iter_stage_profiles_each_item():
+    profiler = RunProfiler()
+    assert list(profiler.iter_stage('load', iter(range(3)))) == [0, 1, 2]
+    # The exhausted fetch counts as a call too
+    assert profiler.calls['load'] == 4
+
+def test_write_outputs_pstats_and_memory_reports(tmp_path):
+    profiler = RunProfiler(sample_rate=0.5)
+    run_stage(profiler, 'process', 4)
+    section = profiler.write(tmp_path, "run")
+    stats = section['stages']['process']
+    assert stats == {
+        'calls': 4, 'sampled': 2, 'pstats': "profile_run_process.pstats",
+        'memory': "profile_run_process_memory.txt", 'retained_bytes': stats['retained_bytes']
+    }
+    assert section['stages']['load'] == {'calls': 0, 'sampled': 0}
+    assert pstats.Stats(str(tmp_path / stats['pstats'])).total_calls > 0
+    report = (tmp_path / stats['memory']).read_text()
+    assert report.startswith("# process: allocations alive at the end of 2 sampled of 4 calls")
+    assert 'test_profiling.py' in report
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "profile_run_process.pstats", "profile_run_process_memory.txt"
+    ]
+    assert set(section['stages']) == set(STAGES)
+
+@pytest.mark.parametrize("kwargs", [{'sample_rate': 0}, {'sample_rate': 1.5}, {'top_entries': -1}])
+def test_invalid_settings_raise(kwargs):
+    with pytest.raises(ValueError):
+        RunProfiler(**kwargs)
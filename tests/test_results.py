@@ -0,0 +1,53 @@
+# tests/test_results.py
+
+import pickle
+from src.conversions import CryptoConverter
+from src.main import CryptoProcessor
+from src.results import HEX_TO_UNKNOWN, EntryResult
+
+def make_result(tmp_path, entry):
+    return CryptoProcessor("-", str(tmp_path / "out")).process_entry(entry)
+
+def test_round_trip_strings_share_the_input(tmp_path):
+    hex_str = b'{"hash": "abc"}'.hex()
+    entry = {"hex": hex_str, "unknown": CryptoConverter().hex_to_unknown(hex_str), "ascii_text": {}}
+    result = make_result(tmp_path, entry)
+    assert result.valid(HEX_TO_UNKNOWN)
+    assert result.unknown is entry["unknown"]
+    assert result.hex is entry["hex"]
+
+    full = result.to_dict()
+    compact = result.to_dict(compact=True)
+    assert 'original' not in compact
+    assert compact['conversions'] == {'hex_to_ascii': '{"hash": "abc"}'}
+    assert EntryResult.from_dict(entry, compact).to_dict() == full
+
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored.unknown is restored.entry["unknown"]
+    assert restored.to_dict() == full
+
+def test_compact_form_keeps_differing_conversions(tmp_path):
+    converter = CryptoConverter()
+    entry = {"hex": "00", "unknown": converter.HEADER + "0000", "ascii_text": {}}
+    result = make_result(tmp_path, entry)
+    compact = result.to_dict(compact=True)
+    assert compact['conversions'] == {
+        'hex_to_unknown': converter.hex_to_unknown("00"),
+        'unknown_to_hex': converter.unknown_to_hex(entry["unknown"])
+    }
+    assert compact['pair_mismatch']['reason']
+    assert EntryResult.from_dict(entry, compact).to_dict() == result.to_dict()
+
+def test_detached_result_leaves_out_the_entry(tmp_path):
+    hex_str = b'{"hash": "abc"}'.hex()
+    entry = {"hex": hex_str, "unknown": CryptoConverter().hex_to_unknown(hex_str), "ascii_text": {}}
+    result = make_result(tmp_path, entry)
+    shipped = pickle.dumps(result.detach())
+    assert entry["unknown"].encode() not in shipped
+    assert hex_str.encode() not in shipped
+
+    restored = EntryResult.attach(entry, pickle.loads(shipped))
+    assert restored.entry is entry
+    assert restored.unknown is entry["unknown"]
+    assert restored.hex is entry["hex"]
+    assert restored.to_dict() == result.to_dict()
@@ -0,0 +1,67 @@
+# tests/test_server.py
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.client import ConversionClient, ServerError
+from src.conversions import CryptoConverter
+from src.main import CryptoProcessor
+from src.server import make_server
+
+@pytest.fixture(params=["tcp", "unix"])
+def client_factory(request, tmp_path):
+    processor = CryptoProcessor(None, str(tmp_path / "out"))
+    socket_path = str(tmp_path / "server.sock") if request.param == "unix" else None
+    server = make_server(processor, port=0, socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1] if socket_path is None else None
+    yield lambda: ConversionClient(port=port, socket_path=socket_path)
+    server.shutdown()
+    server.server_close()
+
+def test_process_matches_batch_run(client_factory, tmp_path):
+    converter = CryptoConverter()
+    entries = {}
+    for i in range(4):
+        hex_str = json.dumps({"hash": f"{i:032x}"}).encode('utf-8').hex()
+        entries[f"entry_{i}"] = {"hex": hex_str, "unknown": converter.hex_to_unknown(hex_str),
+                                 "ascii_text": {}}
+    input_file = tmp_path / "crypto.json"
+    input_file.write_text(json.dumps(entries))
+    output_dir = tmp_path / "batch"
+    CryptoProcessor(str(input_file), str(output_dir)).process_all_data()
+    expected = json.loads(next(output_dir.glob("detailed_results_*.json")).read_text())
+
+    with client_factory() as client:
+        response = client.process(entries)
+        # The connection is reused for further requests
+        assert client.health()['status'] == 'ok'
+    assert response['results'] == expected
+    assert response['summary']['total_entries'] == 4
+    assert response['summary']['validation_stats']['conversion_pair_valid'] == 4
+
+def test_encode_decode_concurrent_clients(client_factory):
+    converter = CryptoConverter()
+    hex_strings = [bytes(i % 256 for i in range(n)).hex() for n in range(0, 300, 7)]
+
+    def round_trip(_):
+        with client_factory() as client:
+            unknown = client.encode(hex_strings)
+            return unknown, client.decode(unknown)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for unknown, decoded in pool.map(round_trip, range(8)):
+            assert unknown == [converter.hex_to_unknown(h) for h in hex_strings]
+            assert decoded == hex_strings
+
+def test_invalid_requests_are_rejected(client_factory):
+    with client_factory() as client:
+        with pytest.raises(ServerError) as excinfo:
+            client.process({"a": {"hex": "00"}})
+        assert excinfo.value.status == 400
+        with pytest.raises(ServerError) as excinfo:
+            client.encode([1, 2])
+        assert excinfo.value.status == 400
+        assert client.decode(["zz"]) == [None]
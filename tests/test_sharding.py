@@ -0,0 +1,71 @@
+# tests/test_sharding.py
+
+import hashlib
+import pytest
+from src.sharding import Shard, merge_summaries, resolve_input_files, shard_of
+
+def test_shard_of_is_stable_and_balanced():
+    # Fixed by the hash, so every host agrees on the partition
+    assert [shard_of(f"entry_{i}", 4) for i in range(8)] == [shard_of(f"entry_{i}", 4) for i in range(8)]
+    assert shard_of("entry_0", 4) == int.from_bytes(
+        hashlib.blake2b(b"entry_0", digest_size=8).digest(), 'little') % 4
+    sizes = [0] * 4
+    for i in range(4000):
+        sizes[shard_of(f"entry_{i}", 4)] += 1
+    assert min(sizes) > 900
+
+@pytest.mark.parametrize("text", ["4/4", "-1/4", "1", "a/b", "0/0"])
+def test_shard_parse_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        Shard.parse(text)
+
+def test_shard_parse():
+    shard = Shard.parse(" 1/3 ")
+    assert shard == Shard(1, 3)
+    assert shard.label == "shard-1-of-3"
+
+def test_resolve_input_files(tmp_path):
+    for name in ("b.json", "a.json", "c.txt"):
+        (tmp_path / name).write_text("{}")
+    assert resolve_input_files(str(tmp_path)) == [tmp_path / "a.json", tmp_path / "b.json"]
+    assert resolve_input_files(str(tmp_path / "*.txt")) == [tmp_path / "c.txt"]
+    assert resolve_input_files(str(tmp_path / "a.json")) == [tmp_path / "a.json"]
+    with pytest.raises(FileNotFoundError):
+        resolve_input_files(str(tmp_path / "*.csv"))
+
+def make_summary(index, total, successful, pair_valid, hits=0):
+    return {
+        'total_entries': total,
+        'successful_conversions': successful,
+        'failed_conversions': total - successful,
+        'validation_stats': {'hex_to_ascii_valid': successful, 'conversion_pair_valid': pair_valid},
+        'cache': {'hits': hits, 'misses': 1, 'hit_rate': 'ignored', 'evicted': 0},
+        'metrics': {'throughput': 123.0},
+        'success_rate': 'ignored',
+        'input_file': 'data/in.json',
+        'shard': {'index': index, 'count': 3},
+    }
+
+def test_merge_summaries_recomputes_rates():
+    merged = merge_summaries([make_summary(0, 4, 3, 2, hits=1), make_summary(2, 6, 6, 6, hits=2)])
+    assert merged['total_entries'] == 10
+    assert merged['failed_conversions'] == 1
+    assert merged['success_rate'] == "90.00%"
+    assert merged['validation_stats']['conversion_pair_valid'] == 8
+    assert merged['validation_stats']['unknown_to_hex_valid'] == 0
+    assert merged['cache'] == {'hits': 3, 'misses': 2, 'evicted': 0, 'hit_rate': "60.00%"}
+    assert merged['shards'] == {'count': 3, 'merged': [0, 2], 'missing': [1]}
+    assert merged['input_file'] == 'data/in.json'
+    assert 'metrics' not in merged
+
+def test_merge_summaries_rejects_inconsistent_shards():
+    with pytest.raises(ValueError):
+        merge_summaries([make_summary(0, 1, 1, 1), make_summary(0, 1, 1, 1)])
+    other = make_summary(1, 1, 1, 1)
+    other['shard']['count'] = 4
+    with pytest.raises(ValueError):
+        merge_summaries([make_summary(0, 1, 1, 1), other])
+    unsharded = make_summary(1, 1, 1, 1)
+    del unsharded['shard']
+    with pytest.raises(ValueError):
+        merge_summaries([make_summary(0, 1, 1, 1), unsharded])
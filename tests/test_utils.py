@@ -0,0 +1,64 @@
+# tests/test_utils.py
+
+import io
+import json
+import pytest
+from src.utils import ValidationError, iter_json_object
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_iter_json_object_matches_json_load(chunk_size):
+    data = {
+        "a": {"hex": "ab" * 300, "ascii_text": {"url": "https://x/é\""}},
+        "b": [1, 2.5, None, True],
+        "c": 1234567
+    }
+    text = json.dumps(data, indent=2)
+    assert list(iter_json_object(io.StringIO(text), chunk_size)) == list(data.items())
+
+def test_iter_json_object_rejects_non_object():
+    with pytest.raises(ValidationError):
+        list(iter_json_object(io.StringIO("[1, 2]")))
+
+def test_iter_json_object_truncated():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_object(io.StringIO('{"a": {"hex": "00"'), 4))
+
+@pytest.mark.parametrize("document, trailing", [
+    ('{"a": {"hex": "00"}}', ' garbage'),
+    ('{"a": 1}', '{"b": 2}'),
+    ('{}', ' x'),
+])
+def test_iter_json_object_rejects_trailing_data(document, trailing):
+    with pytest.raises(json.JSONDecodeError, match="Extra data"):
+        list(iter_json_object(io.StringIO(document + trailing), 4))
+    members = list(iter_json_object(io.StringIO(document + " \n"), 4))
+    assert members == list(json.loads(document).items())
+
+class ReadCounter(io.StringIO):
+    reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+@pytest.mark.parametrize("bad_value", ['[1, 2 3]', '{"k" 1}', 'tru e', '"\\x"', '-'])
+def test_iter_json_object_fails_fast_on_malformed_value(bad_value):
+    text = '{"a": ' + bad_value + ' ' * 64 + ', "b": "' + 'ab' * 10000 + '"}'
+    fp = ReadCounter(text)
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_object(fp, 32))
+    assert fp.reads <= 3  # Not refilled up to the end of the file
+
+@pytest.mark.parametrize("text", [
+    '{"0": 1e+300}', '{"0": -0.0}', '{"0": 12.5E-7, "1": 3}', '{"0": -1, "1": 2.0e1}'
+])
+def test_iter_json_object_numbers_cut_at_every_chunk_size(text):
+    for chunk_size in range(1, len(text) + 1):
+        items = list(iter_json_object(io.StringIO(text), chunk_size))
+        assert items == list(json.loads(text).items()), chunk_size
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+def test_iter_json_object_values_cut_at_chunk_edges(chunk_size):
+    data = {"a": [True, False, None, -1.5e-3, "x\"y\ud83d\ude00\u00e9"], "b": "cd" * 20}
+    text = json.dumps(data)
+    assert list(iter_json_object(io.StringIO(text), chunk_size)) == list(json.loads(text).items())